@@ -0,0 +1,76 @@
+"""
+Measures evaluation cost per frame of controls driving joints, with constraint nodes against the matrix connection
+mode. Controls are keyed, then every frame of the range is evaluated by pulling world matrices of the joints.
+Run with mayapy from the repository root:
+
+mayapy benchmarks/bench_evaluation.py
+"""
+import os
+import sys
+import time
+
+import maya.standalone
+maya.standalone.initialize()
+
+from maya import cmds
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from easyctrls import core
+from easyctrls.mayabackend import MayaBackend
+
+COUNTS = (100, 1000)
+FRAMES = 100
+# connectors turned on for each case, None is the cost of the keyed controls alone
+CASES = (('none', ()),
+         ('constraints', ('parent', 'scale')),
+         ('matrix', ('matrix',)))
+
+
+def _makeJoints(count):
+    cmds.file(new=True, force=True)
+    joints = []
+    for i in range(count):
+        joint = cmds.createNode('joint', name='bench%d_jnt' % i)
+        cmds.setAttr(joint + '.translate', i % 50, i // 50, 0)
+        cmds.setAttr(joint + '.jointOrient', 0, 0, 15)
+        joints.append(cmds.ls(joint, long=True)[0])
+    return joints
+
+
+def _keyCtrls(paths):
+    for path in paths:
+        cmds.setKeyframe(path, attribute='rotateZ', time=1, value=0)
+        cmds.setKeyframe(path, attribute='rotateZ', time=FRAMES, value=90)
+        cmds.setKeyframe(path, attribute='translateY', time=1, value=0)
+        cmds.setKeyframe(path, attribute='translateY', time=FRAMES, value=2)
+
+
+def _timeFrames(joints):
+    start = time.perf_counter()
+    for frame in range(1, FRAMES + 1):
+        cmds.currentTime(frame, update=False)
+        for joint in joints:
+            cmds.getAttr(joint + '.worldMatrix[0]')
+    return (time.perf_counter() - start) / FRAMES
+
+
+def main():
+    for count in COUNTS:
+        results = []
+        for name, connectors in CASES:
+            joints = _makeJoints(count)
+            cmds.select(joints)
+            backend = MayaBackend()
+            batch = core.CtrlsBatch(backend)
+            batch.create(backend.selection(), 'circle')
+            for connector in connectors:
+                batch.setMaintainOffset(connector, True)
+                batch.setConnector(connector, True)
+            _keyCtrls(cmds.ls(batch.ctrls, long=True))
+            # matrix pulls of the joints are the same in every case, so differences come from the drive network
+            results.append('%s %.2f ms' % (name, _timeFrames(joints) * 1000))
+        print('%6d joints, per frame: %s' % (count, ', '.join(results)))
+
+
+if __name__ == '__main__':
+    main()
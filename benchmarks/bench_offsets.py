@@ -0,0 +1,64 @@
+"""
+Measures cost of one offset spin box tick, old per cv setAttr path against
+MayaBackend.setCvOffsets().
+Run with mayapy from the repository root:
+
+mayapy benchmarks/bench_offsets.py
+"""
+import os
+import sys
+import time
+
+import maya.standalone
+maya.standalone.initialize()
+
+from maya import cmds
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from easyctrls import core
+from easyctrls.mayabackend import MayaBackend
+
+COUNTS = (100, 1000, 10000)
+# per cv path makes count * cvs setAttr calls, so it is only timed for smaller batches.
+LEGACYLIMIT = 1000
+
+
+def _legacyTick(ctrls, value):
+    # what _changeOffsetX did for one tick, one setAttr per cv. Only one axis, the fused path writes all three.
+    for ctrl in ctrls:
+        for i in range(cmds.getAttr(ctrl + '.controlPoints', size=True)):
+            cmds.setAttr('%s.controlPoints[%d].xValue' % (ctrl, i), value)
+
+
+def _makeItems(count):
+    cmds.file(new=True, force=True)
+    items = []
+    for i in range(count):
+        item = cmds.createNode('transform', name='bench%d' % i)
+        cmds.setAttr(item + '.translate', i % 50, i // 50, 0)
+        items.append(item)
+    return items
+
+
+def main():
+    for count in COUNTS:
+        cmds.select(_makeItems(count))
+        backend = MayaBackend()
+        batch = core.CtrlsBatch(backend)
+        batch.create(backend.selection(), 'circle')
+
+        start = time.perf_counter()
+        backend.setCvOffsets(batch.shapes, batch.cvCounts, (0.5, 1.0, -0.5))
+        fused = time.perf_counter() - start
+
+        if count <= LEGACYLIMIT:
+            start = time.perf_counter()
+            _legacyTick(cmds.ls(batch.ctrls, long=True), 0.5)
+            legacy = '%.4f s' % (time.perf_counter() - start)
+        else:
+            legacy = 'skipped'
+        print('%6d controls: fused %.4f s per tick, per cv %s' % (count, fused, legacy))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""
+Measures startup of the tool: importing EasyCtrls_4, then loading the window module through it. Each run is a fresh
+interpreter, so nothing is cached, and lists which heavy modules (HEAVYMODULES) each step pulled in. Run with mayapy
+from the repository root:
+
+mayapy benchmarks/bench_startup.py --maya --output startup.json
+
+Plain Python times the import of EasyCtrls_4 alone. Opening the window needs Mayas main window, so time it in the
+script editor of a running Maya, with benchmarks on the path:
+
+import bench_startup; bench_startup.timeWindow()
+
+bench_startup.windowCycles() opens and closes the window 100 times there and checks memory stays flat.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# modules that are slow to import and only needed once a window is built, pymel not at all
+HEAVYMODULES = ('pymel.core', 'PySide2.QtWidgets', 'shiboken2', 'maya.OpenMayaUI')
+# import of EasyCtrls_4 plus opening the window should stay well under this many seconds
+BUDGET = 1.0
+
+# run in a fresh interpreter, prints one JSON line of seconds and loaded heavy modules per step
+_PROBE = '''
+import json, sys, time
+sys.path.insert(0, %(root)r)
+if %(maya)r:
+    import maya.standalone
+    maya.standalone.initialize()
+heavy = %(heavy)r
+result = {}
+start = time.perf_counter()
+import EasyCtrls_4
+result['import'] = time.perf_counter() - start
+result['importLoaded'] = [name for name in heavy if name in sys.modules]
+if %(maya)r:
+    start = time.perf_counter()
+    EasyCtrls_4.CtrlsUI
+    result['ui'] = time.perf_counter() - start
+    result['uiLoaded'] = [name for name in heavy if name in sys.modules]
+print(json.dumps(result))
+'''
+
+
+def probe(useMaya=False, executable=None):
+    """
+    Times the startup steps once in a fresh interpreter.
+    Returns:
+        Dictionary. 'import': seconds to import EasyCtrls_4, 'importLoaded': heavy modules loaded by it. With Maya
+        also 'ui' and 'uiLoaded' for loading the window module.
+    """
+    code = _PROBE % {'root': ROOT, 'maya': useMaya, 'heavy': HEAVYMODULES}
+    output = subprocess.check_output([executable or sys.executable, '-c', code], universal_newlines=True)
+    # Maya prints its own startup messages, the result is the last line
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def timeWindow():
+    """
+    Times importing EasyCtrls_4 and opening the window in a running Maya. Modules of the tool are dropped first, so
+    they are imported again. Qt is loaded by Maya itself, so this is what every session pays.
+    Returns:
+        Float. Seconds.
+    """
+    for name in list(sys.modules):
+        if name == 'EasyCtrls_4' or name.split('.')[0] == 'easyctrls':
+            del sys.modules[name]
+    start = time.perf_counter()
+    import EasyCtrls_4
+    EasyCtrls_4.CtrlsUI()
+    seconds = time.perf_counter() - start
+    print('EasyCtrls_4 import and window: %.3f s (budget %.1f s)' % (seconds, BUDGET))
+    return seconds
+
+
+def windowCycles(cycles=100):
+    """
+    Opens and closes the window cycles times in a running Maya. Python memory (tracemalloc), live Python objects and Qt
+    widgets are sampled every tenth cycle and should stay flat, as the window is kept and every batch released on close.
+    Returns:
+        List of (cycle, bytes, objects, widgets) tuples.
+    """
+    import gc
+    import tracemalloc
+    import EasyCtrls_4
+    from PySide2 import QtWidgets
+    app = QtWidgets.QApplication.instance()
+    # first open builds the window and reads the icons, which is kept on purpose
+    EasyCtrls_4.CtrlsUI().parent().close()
+    tracemalloc.start()
+    samples = []
+    start = time.perf_counter()
+    for cycle in range(1, cycles + 1):
+        EasyCtrls_4.CtrlsUI().parent().close()
+        app.processEvents()
+        if cycle % 10 == 0:
+            gc.collect()
+            samples.append((cycle, tracemalloc.get_traced_memory()[0], len(gc.get_objects()), len(app.allWidgets())))
+    seconds = time.perf_counter() - start
+    tracemalloc.stop()
+    for sample in samples:
+        print('%4d cycles %10d bytes %8d objects %6d widgets' % sample)
+    print('%.2f ms per open and close, growth %d bytes' % (seconds / cycles * 1000, samples[-1][1] - samples[0][1]))
+    return samples
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--maya', action='store_true', help='Also load the window module, needs mayapy.')
+    parser.add_argument('--repeat', type=int, default=5, help='Fresh interpreters to time, the median is reported.')
+    parser.add_argument('--output', help='JSON file to write results to.')
+    args = parser.parse_args(args)
+
+    runs = [probe(args.maya) for _ in range(args.repeat)]
+    steps = ['import', 'ui'] if args.maya else ['import']
+    results = {}
+    for step in steps:
+        results[step] = statistics.median(run[step] for run in runs)
+        results[step + 'Loaded'] = runs[-1][step + 'Loaded']
+        loaded = ', '.join(results[step + 'Loaded']) or 'nothing heavy'
+        print('%-7s %8.4f s  loaded: %s' % (step, results[step], loaded))
+
+    report = {'maya': args.maya, 'repeat': args.repeat, 'budget': BUDGET, 'python': platform.python_version(),
+              'platform': platform.platform(), 'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'results': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=1)
+    if results['importLoaded'] or sum(results[step] for step in steps) > BUDGET:
+        print('Startup over budget or importing heavy modules')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
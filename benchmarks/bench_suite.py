@@ -0,0 +1,192 @@
+"""
+Times every control operation on synthetic hierarchies and counts backend calls per operation. Results are written as
+JSON, so runs of different versions can be compared.
+Runs headless on the in-memory FakeScene by default, from the repository root:
+
+python benchmarks/bench_suite.py --sizes 50 500 5000 --output bench.json
+
+Or on a real scene with mayapy:
+
+mayapy benchmarks/bench_suite.py --maya
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from easyctrls import core, shapelib
+
+LAYOUTS = ('face', 'fk', 'mirrored')
+SIZES = (50, 500, 5000)
+# joints per FK chain, face joints per cluster
+CHAINLENGTH = 20
+CLUSTERSIZE = 25
+# items added to the batch after it is made, to time incremental creation
+ADDCOUNT = 10
+
+
+def faceLayout(count, rng):
+    """
+    Flat face clusters. Joints are scattered around cluster centres on left, middle and right, none parented.
+    Returns:
+        List of (name, parent index or None, translate, rotate) tuples.
+    """
+    nodes = []
+    for i in range(count):
+        cluster = i // CLUSTERSIZE
+        # every third cluster sits on the middle line, the others alternate left and right
+        side = (0, 1, -1)[cluster % 3]
+        centre = (side * (2 + cluster % 5), 10 + cluster % 7, 5 + cluster % 3)
+        jitter = [rng.uniform(-0.5, 0.5) for _ in range(3)]
+        x = 0.0 if side == 0 else centre[0] + jitter[0]
+        nodes.append(('face%d_jnt' % i, None, (x, centre[1] + jitter[1], centre[2] + jitter[2]), (0, 0, 0)))
+    return nodes
+
+
+def fkLayout(count, rng):
+    """
+    Long FK chains of CHAINLENGTH joints, each parented to the previous one and offset in its local space.
+    """
+    nodes = []
+    for i in range(count):
+        link = i % CHAINLENGTH
+        if link == 0:
+            chain = i // CHAINLENGTH
+            nodes.append(('chain%d_jnt0' % chain, None, (chain * 2.0, 0, 0), (0, 0, rng.uniform(-45, 45))))
+        else:
+            nodes.append(('chain%d_jnt%d' % (i // CHAINLENGTH, link), i - 1, (0, 1, 0), (0, 0, rng.uniform(-10, 10))))
+    return nodes
+
+
+def mirroredLayout(count, rng):
+    """
+    Mirrored left and right sets. Every left joint has a right twin at -x with mirrored rotation.
+    """
+    nodes = []
+    for i in range(count // 2):
+        translate = (rng.uniform(0.5, 10), rng.uniform(0, 20), rng.uniform(-5, 5))
+        rotate = (rng.uniform(-90, 90), rng.uniform(-90, 90), rng.uniform(-90, 90))
+        nodes.append(('L_jnt%d' % i, None, translate, rotate))
+        nodes.append(('R_jnt%d' % i, None, (-translate[0], translate[1], translate[2]),
+                      (rotate[0], -rotate[1], -rotate[2])))
+    if count % 2:
+        nodes.append(('M_jnt', None, (0, 10, 0), (0, 0, 0)))
+    return nodes
+
+
+def _buildFake(nodes):
+    from easyctrls.fakescene import FakeScene
+    scene = FakeScene()
+    handles = []
+    for name, parent, translate, rotate in nodes:
+        parent = handles[parent] if parent is not None else None
+        handles.append(scene.addTransform(name, parent, translate, rotate, nodeType='joint'))
+    return scene, handles
+
+
+def _buildMaya(nodes):
+    from maya import cmds
+    from easyctrls.mayabackend import MayaBackend
+    cmds.file(new=True, force=True)
+    paths = []
+    for name, parent, translate, rotate in nodes:
+        if parent is None:
+            path = cmds.createNode('joint', name=name)
+        else:
+            path = cmds.createNode('joint', name=name, parent=paths[parent])
+        path = cmds.ls(path, long=True)[0]
+        cmds.setAttr(path + '.translate', *translate)
+        cmds.setAttr(path + '.rotate', *rotate)
+        paths.append(path)
+    backend = MayaBackend()
+    cmds.select(paths)
+    return backend, backend.selection()
+
+
+def _operations(batch, handles, extra, ctrltype):
+    # (name, function) in the order the UI would run them. Each constraint is made and removed, like a toggle.
+    operations = [('create', lambda: batch.create(handles, ctrltype)),
+                  ('add', lambda: batch.add(handles + extra, ctrltype)),
+                  ('radius', lambda: batch.setRadius(2.5)),
+                  ('offsetX', lambda: batch.setOffset(x=0.5)),
+                  ('normalX', lambda: batch.setNormal(x=1)),
+                  ('update', lambda: batch.update(radius=1.5, normal=(0, 1, 0), offset=(0, 0.5, 0))),
+                  ('sameUpdate', lambda: batch.update(radius=1.5, normal=(0, 1, 0), offset=(0, 0.5, 0))),
+                  ('defaultColor', batch.applyColors),
+                  ('sideColor', lambda: batch.setSideColor('L', (0.2, 0.4, 0.6))),
+                  ('mirror', lambda: batch.mirror('L'))]
+    for key in core.CONNECTORS:
+        operations.append((key + 'On', lambda key=key: batch.setConnector(key, True)))
+        operations.append((key + 'Off', lambda key=key: batch.setConnector(key, False)))
+    operations += [('reset', batch.reset),
+                   ('delete', batch.delete)]
+    return operations
+
+
+def runLayout(layout, count, useMaya=False, ctrltype='circle', seed=0, colorDrivers=False, history=True, chain=False):
+    """
+    Builds a scene of given layout and size, then runs every operation once on it. ADDCOUNT more items are in the
+    scene for the add operation, count is the size of the batch it adds to.
+    Returns:
+        List of dictionaries. One per operation, with time, read and write counts and calls per backend method.
+    """
+    nodes = globals()[layout + 'Layout'](count + ADDCOUNT, random.Random(seed))
+    backend, handles = (_buildMaya if useMaya else _buildFake)(nodes)
+    handles, extra = handles[:count], handles[count:]
+    batch = core.CtrlsBatch(backend, colorDrivers=colorDrivers, history=history)
+    batch.chain = chain
+    results = []
+    for name, func in _operations(batch, handles, extra, ctrltype):
+        backend.resetCounters()
+        start = time.perf_counter()
+        func()
+        seconds = time.perf_counter() - start
+        results.append({'layout': layout, 'count': len(handles), 'operation': name, 'seconds': seconds,
+                        'reads': backend.reads, 'writes': backend.writes, 'calls': dict(backend.calls)})
+    return results
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--layouts', nargs='+', choices=LAYOUTS, default=LAYOUTS)
+    parser.add_argument('--sizes', nargs='+', type=int, default=SIZES)
+    parser.add_argument('--ctrltype', default='circle', choices=shapelib.library().names())
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--colordrivers', action='store_true', help='Drive colors with one node per side.')
+    parser.add_argument('--nohistory', action='store_true', help='Make controls without construction history.')
+    parser.add_argument('--chain', action='store_true', help='Build FK chains, groups under their parents control.')
+    parser.add_argument('--maya', action='store_true', help='Run on a Maya scene, needs mayapy.')
+    parser.add_argument('--output', help='JSON file to write results to. Prints them if not given.')
+    args = parser.parse_args(args)
+
+    if args.maya:
+        import maya.standalone
+        maya.standalone.initialize()
+
+    results = []
+    for layout in args.layouts:
+        for count in args.sizes:
+            for result in runLayout(layout, count, args.maya, args.ctrltype, args.seed, args.colordrivers,
+                                    not args.nohistory, args.chain):
+                results.append(result)
+                print('%-9s %6d  %-12s %8.4f s  %6d reads  %6d writes' %
+                      (layout, result['count'], result['operation'], result['seconds'], result['reads'],
+                       result['writes']))
+
+    report = {'backend': 'maya' if args.maya else 'fake', 'colorDrivers': args.colordrivers,
+              'history': not args.nohistory, 'chain': args.chain,
+              'python': platform.python_version(), 'platform': platform.platform(),
+              'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'results': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=1)
+    else:
+        print(json.dumps(report, indent=1))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,6 @@
+"""
+Maya independent core of Easy Ctrls.
+
+core.CtrlsBatch holds the control building pipeline. It talks to the scene only through a backend.SceneBackend:
+mayabackend.MayaBackend inside Maya, fakescene.FakeScene for running headless in plain Python.
+"""
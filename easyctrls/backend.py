@@ -0,0 +1,363 @@
+"""
+Scene backend interface. Every scene read and write of the control pipeline goes through one of these methods.
+Nodes are referred to with handles, which are UUID strings. Methods work on lists of handles, so a backend can do a
+whole batch in one go.
+"""
+import collections
+import functools
+from array import array
+
+# attribute writeBatchData() tags the nodes it makes with, so listBatchData() tells them from other nodes of the prefix
+BATCHTAG = 'easyCtrlsBatch'
+
+
+def read(func):
+    """
+    Decorator for backend methods that only query the scene. Counts calls on the backend.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        self.calls[func.__name__] += 1
+        self.reads += 1
+        return func(self, *args, **kwargs)
+    return wrapper
+
+
+def write(func):
+    """
+    Decorator for backend methods that edit the scene. Counts calls and edited nodes on the backend.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        self.calls[func.__name__] += 1
+        self.writes += 1
+        self.edits += _editCount(args)
+        return func(self, *args, **kwargs)
+    return wrapper
+
+
+def _editCount(args):
+    # write methods take the nodes they edit as their first list argument, single node methods edit one node
+    for arg in args:
+        if isinstance(arg, (list, tuple, array)):
+            return len(arg)
+    return 1
+
+
+class SceneBackend(object):
+    """
+    Base class for scene backends. Subclasses implement every method below and decorate them with read or write.
+    ---
+    calls: Counter of calls per method name.
+    reads, writes: Integers. Total amount of read and write calls.
+    edits: Integer. Total amount of nodes edited by write calls.
+    transaction: Outermost open transaction.Transaction or None.
+    refreshSuspended: Boolean. A transaction suspended refresh, see suspendRefresh().
+    """
+
+    def __init__(self):
+        self.calls = collections.Counter()
+        self.reads = 0
+        self.writes = 0
+        self.edits = 0
+        self.transaction = None
+        self.refreshSuspended = False
+
+    def resetCounters(self):
+        self.calls.clear()
+        self.reads = 0
+        self.writes = 0
+        self.edits = 0
+
+    # --- scene files, used by batchrun for headless runs
+
+    def openScene(self, path):
+        """
+        Replaces the scene with the one in file path. Handles of the previous scene are forgotten.
+        """
+        raise NotImplementedError
+
+    def saveScene(self, path):
+        """
+        Writes the scene to file path.
+        """
+        raise NotImplementedError
+
+    # --- undo chunks, used by transaction.Transaction
+
+    def openChunk(self, name):
+        """
+        Starts recording edits into one undoable chunk.
+        """
+        raise NotImplementedError
+
+    def closeChunk(self):
+        raise NotImplementedError
+
+    def rollbackChunk(self):
+        """
+        Undoes everything recorded in the chunk that was just closed. Backends that can't undo all of it undo what
+        they can and log a warning, they don't fail silently.
+        """
+        raise NotImplementedError
+
+    def suspendRefresh(self, on):
+        """
+        Suspends viewport refresh if on, else resumes it. Called by transactions around their edits.
+        Dependency graph evaluation is not suspended: reads inside transactions (validate(), world matrices of
+        constraints and mirroring) need values evaluated after the edits before them. With refresh suspended nothing
+        else pulls the graph, so only what those reads ask for is evaluated.
+        """
+        raise NotImplementedError
+
+    # --- reads
+
+    def selection(self):
+        """
+        Returns list of handles of selected nodes.
+        """
+        raise NotImplementedError
+
+    def findNodes(self, pattern):
+        """
+        Returns list of handles of transforms (joints included) whose names match pattern, in scene order. Patterns
+        use Mayas wildcards, * and ?, and match short names with namespace.
+        """
+        raise NotImplementedError
+
+    def nearestAncestors(self, handles, among):
+        """
+        Finds the nearest ancestor of each node that is in among. Every DAG node above handles is visited at most once
+        per call, so the cost stays linear in the size of the hierarchy however deep or branching it is.
+        Args:
+            handles: List of handles of DAG nodes.
+            among: Container of handles, anything supporting in.
+        Returns:
+            List of handles, None for nodes without an ancestor in among.
+        """
+        raise NotImplementedError
+
+    def existingNames(self):
+        """
+        Returns set of short names (with namespace) of every node in the scene, DAG and DG, to check new names against.
+        """
+        raise NotImplementedError
+
+    def nodeNames(self, handles):
+        """
+        Returns list of short names (with namespace) of given nodes.
+        """
+        raise NotImplementedError
+
+    def getAttr(self, handles, attr):
+        """
+        Returns list of values of attribute on given nodes. Compound attributes give tuples.
+        """
+        raise NotImplementedError
+
+    def getAttrArray(self, handles, attrs):
+        """
+        Reads three-float attributes (translate, rotate, scale...) of many nodes in one go. Angles are in degrees.
+        Args:
+            handles: List of handles.
+            attrs: List of attribute names.
+        Returns:
+            array('d') of len(handles) * len(attrs) * 3 values. Values of handle i start at i * len(attrs) * 3, in
+            order of attrs.
+        """
+        raise NotImplementedError
+
+    def worldPositions(self, handles):
+        """
+        Returns list of world space positions (tuples of three floats) of given transforms.
+        """
+        raise NotImplementedError
+
+    def worldMatrices(self, handles):
+        """
+        Returns list of world matrices (4x4 nested tuples, see mathutils) of given transforms.
+        """
+        raise NotImplementedError
+
+    def cvCounts(self, shapes):
+        """
+        Returns list of amount of control vertices of given curve shapes.
+        """
+        raise NotImplementedError
+
+    def getCvs(self, shapes):
+        """
+        Returns list of controlPoints of each of given curve shapes, lists of (x, y, z) tuples. Shapes with history
+        give their tweaks on the constructors curve, others their cv positions.
+        """
+        raise NotImplementedError
+
+    def findBatchData(self, name):
+        """
+        Looks up data stored with writeBatchData() by node name, without traversing the scene.
+        Returns:
+            Tuple of node handle and dictionary of part name: string. (None, {}) if there is no such node.
+        """
+        raise NotImplementedError
+
+    def listBatchData(self, prefix):
+        """
+        Reads data of every node made by writeBatchData() whose name starts with prefix, in one go. Nodes are told by
+        their BATCHTAG attribute, an untagged node named prefix exactly is read too, older versions didn't tag it.
+        Returns:
+            List of (node name, handle, dictionary of part name: string) tuples, in creation order.
+        """
+        raise NotImplementedError
+
+    # --- writes
+
+    def createControls(self, items, names, degree, sections, engine='api', shape=None, parents=None, parentCtrls=()):
+        """
+        Creates a zeroed control for each item: group matched to the items world transformation, control transform
+        under it with a curve shape named after it, and a makeNurbsCircle constructor driving the shape. If shape is
+        given, curves are made from it without construction history, one curve creation call each. With parents,
+        groups are made under other controls, keeping their world transformation, which builds FK chains.
+        Args:
+            items: List of handles.
+            names: List of (group name, control name) tuples, one per item. Names are used as they are, so they
+                must be free in the scene, see naming.NameReserver. Shapes get the control name with 'Shape' appended.
+            degree: Integer. 1 or 3.
+            sections: Integer.
+            engine: String. How a Maya backend builds them. 'api' or 'commands'.
+            shape: shapelib.Shape, or None for a makeNurbsCircle of degree and sections.
+            parents: List of integers, one per item, or None to leave every group in world. The group of items[i] goes
+                under control parents[i] of parentCtrls followed by the controls made by this call, -1 leaves it in
+                world. Controls made by this call can only be parents of later items.
+            parentCtrls: List of handles of existing controls parents can refer to.
+        Returns:
+            Tuple of four lists of handles (ctrls, shapes, constructors, groups) in the order of items. Constructors
+            is empty without history.
+        """
+        raise NotImplementedError
+
+    def createColorDrivers(self, names):
+        """
+        Creates a node with a 'color' attribute (three floats) for each name, to drive overrideColorRGB of many
+        controls at once.
+        Returns:
+            List of handles.
+        """
+        raise NotImplementedError
+
+    def setAttr(self, handles, attr, values):
+        """
+        Sets attribute on given nodes.
+        Args:
+            handles: List of handles.
+            attr: String. Attribute name.
+            values: List of values, one per handle. Tuples for compound attributes.
+        """
+        raise NotImplementedError
+
+    def setAttrs(self, handles, attrs, values):
+        """
+        Sets several numeric attributes of each of given nodes in one pass over them.
+        Args:
+            handles: List of handles.
+            attrs: List of attribute names.
+            values: List with a tuple of values per handle, in order of attrs. Tuples for compound attributes.
+        """
+        raise NotImplementedError
+
+    def setAttrArray(self, handles, attrs, values):
+        """
+        Sets three-float attributes of many nodes in one go, the write counterpart of getAttrArray().
+        Args:
+            handles: List of handles.
+            attrs: List of attribute names.
+            values: array('d') (or any sequence of floats) laid out like getAttrArray() returns them.
+        """
+        raise NotImplementedError
+
+    def setCvOffsets(self, shapes, cvCounts, offset):
+        """
+        Offsets every control vertex of given curve shapes by offset (tuple of three floats).
+        """
+        raise NotImplementedError
+
+    def setCvPositions(self, shapes, cvs):
+        """
+        Sets every control vertex of given curve shapes (without history) to cvs, list of (x, y, z) tuples.
+        """
+        raise NotImplementedError
+
+    def setCvLists(self, shapes, cvLists):
+        """
+        Sets controlPoints of each of given curve shapes to its own list of (x, y, z) tuples, the write counterpart of
+        getCvs().
+        """
+        raise NotImplementedError
+
+    def connectAttrs(self, sources, targets, attr, targetAttr=None):
+        """
+        Connects attr of every source to targetAttr (same attr if None) of matching target, replacing existing
+        connections.
+        """
+        raise NotImplementedError
+
+    def disconnectAttrs(self, sources, targets, attr, targetAttr=None):
+        """
+        Removes connections made by connectAttrs(). Pairs that are not connected are skipped.
+        """
+        raise NotImplementedError
+
+    def constrain(self, kind, drivers, targets, maintainOffsets):
+        """
+        Constrains each target to matching driver.
+        Args:
+            kind: String. 'point', 'orient', 'scale' or 'parent'.
+            drivers: List of handles.
+            targets: List of handles.
+            maintainOffsets: List of booleans, one per target.
+        Returns:
+            List of constraint handles.
+        """
+        raise NotImplementedError
+
+    def matrixConstrain(self, drivers, targets, maintainOffsets):
+        """
+        Drives world transformation of each target with world matrix of matching driver through a matrix network,
+        instead of constraint nodes: a multMatrix of (offset, driver world matrix, target parent inverse matrix)
+        connected into offsetParentMatrix of the target, whose own transform values are zeroed. Nodes without
+        offsetParentMatrix get a decomposeMatrix into translate, rotate and scale instead.
+        Args:
+            drivers: List of handles.
+            targets: List of handles.
+            maintainOffsets: List of booleans, one per target. Without offset targets snap to their driver.
+        Returns:
+            List of handles of made nodes.
+        """
+        raise NotImplementedError
+
+    def matrixRelease(self, targets, nodes):
+        """
+        Deletes nodes made by matrixConstrain() and resets offsetParentMatrix of targets to identity. Transform values
+        are left for the caller to restore.
+        """
+        raise NotImplementedError
+
+    def writeBatchData(self, node, name, parts):
+        """
+        Stores strings as string attributes of a network node, one attribute per part.
+        Args:
+            node: Handle of the node, or None to make one, tagged with BATCHTAG.
+            name: String. Name of a made node.
+            parts: Dictionary. Part name: string. Other parts on the node are kept.
+        Returns:
+            Handle of the node.
+        """
+        raise NotImplementedError
+
+    def delete(self, handles):
+        raise NotImplementedError
+
+    def deleteHistory(self, handles):
+        raise NotImplementedError
+
+    def clearSelection(self):
+        raise NotImplementedError
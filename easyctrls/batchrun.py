@@ -0,0 +1,303 @@
+"""
+Headless rigging of many scene files. Every file is opened, nodes matching a name pattern get controls made with the
+settings of a profile, and the file is saved. Files are shared out over a pool of worker processes, each of which
+opens its own scene, and per file timing and status are written to a JSON report.
+
+Maya files (.ma, .mb) need Maya, so run with mayapy from the repository root:
+
+mayapy -m easyctrls.batchrun scenes/*.ma --pattern "*_jnt" --profile profile.json --output-dir rigged --report run.json
+
+JSON files are FakeScene scenes (see FakeScene.saveScene()), which any Python can rig. Passing a plain Python as
+--mayapy checks a run without Maya:
+
+python -m easyctrls.batchrun tests/*.json --pattern "*_jnt" --output-dir /tmp/rigged --mayapy python
+
+A profile is a JSON object with any keys of DEFAULTPROFILE, the others keep their defaults.
+"""
+import argparse
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import sys
+import time
+import traceback
+from concurrent.futures.process import BrokenProcessPool
+
+from easyctrls import core, naming, shapelib
+
+# settings controls are made with. shape is a shape library name, colors maps sides ('L', 'M', 'R') to rgb,
+# connectors are CONNECTORS keys switched on in this order, maintainOffset the constraint keys that keep their offset
+# and resolve one of RESOLUTIONS (None for the setConnector() default). chain builds FK chains, see CtrlsBatch.chain.
+# finish bakes colors and deletes history, without it the batch is stored in the file for the UI to pick up.
+# groupTemplate and ctrlTemplate name the made nodes, see naming.TOKENS.
+DEFAULTPROFILE = {'shape': 'circle', 'radius': core.DEFAULTRADIUS, 'normal': (0, 0, 0), 'offset': (0, 0, 0),
+                  'colors': {}, 'connectors': (), 'maintainOffset': (), 'resolve': None, 'engine': 'api',
+                  'history': True, 'colorDrivers': False, 'chain': False, 'finish': True,
+                  'groupTemplate': naming.DEFAULTGROUPTEMPLATE, 'ctrlTemplate': naming.DEFAULTCTRLTEMPLATE}
+# scene files rigged with FakeScene instead of Maya
+FAKEEXTENSIONS = ('.json',)
+
+# backend of a worker process running Maya, made on its first Maya file
+_MAYABACKEND = None
+
+
+def makeProfile(settings=None):
+    """
+    Fills settings up with DEFAULTPROFILE and checks them.
+    Args:
+        settings: Dictionary with keys of DEFAULTPROFILE, or None for the defaults.
+    Returns:
+        Dictionary with every key of DEFAULTPROFILE.
+    """
+    settings = settings or {}
+    unknown = sorted(set(settings) - set(DEFAULTPROFILE))
+    if unknown:
+        raise ValueError('Unknown profile keys: %s' % ', '.join(unknown))
+    profile = dict(DEFAULTPROFILE, **settings)
+    if profile['shape'] not in shapelib.library():
+        raise ValueError('Unknown shape %r' % profile['shape'])
+    for key in profile['connectors']:
+        if key not in core.CONNECTORS:
+            raise ValueError('Unknown connector %r, expected one of %s' % (key, ', '.join(core.CONNECTORS)))
+    for key in profile['maintainOffset']:
+        if not core.isConstraint(key):
+            raise ValueError('%r is not a constraint, only constraints keep an offset' % key)
+    if profile['resolve'] is not None and profile['resolve'] not in core.RESOLUTIONS:
+        raise ValueError('Unknown resolve %r, expected one of %s' % (profile['resolve'], ', '.join(core.RESOLUTIONS)))
+    naming.templateTokens(profile['groupTemplate'])
+    naming.templateTokens(profile['ctrlTemplate'])
+    if profile['groupTemplate'] == profile['ctrlTemplate']:
+        raise ValueError('Groups and controls need different name templates')
+    unknown = sorted(set(profile['colors']) - set(core.SIDECODES))
+    if unknown:
+        raise ValueError('Unknown sides in colors: %s' % ', '.join(unknown))
+    return profile
+
+
+def loadProfile(path):
+    """
+    Reads a profile from a JSON file and checks it with makeProfile().
+    """
+    with open(path) as f:
+        return makeProfile(json.load(f))
+
+
+def applyProfile(backend, items, profile):
+    """
+    Makes controls for items with the settings of profile, then switches its connectors on. Settings are set before
+    creation, so controls are made with them instead of edited afterwards.
+    Args:
+        backend: backend.SceneBackend of the open scene.
+        items: List of handles.
+        profile: Dictionary made by makeProfile().
+    Returns:
+        Tuple of the core.CtrlsBatch (forgotten if profile finishes) and dictionary of connector key: list of
+        Mismatch tuples.
+    """
+    batch = core.CtrlsBatch(backend, engine=profile['engine'], colorDrivers=profile['colorDrivers'],
+                            history=profile['history'])
+    batch.radius = float(profile['radius'])
+    batch.normal = list(profile['normal'])
+    batch.offset = list(profile['offset'])
+    batch.chain = bool(profile['chain'])
+    batch.groupTemplate = profile['groupTemplate']
+    batch.ctrlTemplate = profile['ctrlTemplate']
+    batch.colors.update((side, tuple(color)) for side, color in profile['colors'].items())
+    for key in profile['maintainOffset']:
+        batch.maintainOffset[key] = True
+    reports = {}
+    with batch.transaction('easyCtrlsProfile'):
+        batch.create(items, profile['shape'], connect=False)
+        for key in profile['connectors']:
+            mismatches = batch.setConnector(key, True, profile['resolve'])
+            if mismatches:
+                reports[key] = mismatches
+        if profile['finish']:
+            batch.finish()
+    return batch, reports
+
+
+def _mayaBackend():
+    # Maya starts once per worker process and is used for every Maya file it gets
+    global _MAYABACKEND
+    if _MAYABACKEND is None:
+        import maya.standalone
+        maya.standalone.initialize()
+        from easyctrls.mayabackend import MayaBackend
+        _MAYABACKEND = MayaBackend()
+    return _MAYABACKEND
+
+
+def sceneBackend(path):
+    """
+    Returns a backend.SceneBackend for scene file path: a new FakeScene for FAKEEXTENSIONS, else the Maya backend of
+    this process.
+    """
+    if os.path.splitext(path)[1].lower() in FAKEEXTENSIONS:
+        from easyctrls.fakescene import FakeScene
+        return FakeScene()
+    return _mayaBackend()
+
+
+def _failedResult(path, output, pid, error=None):
+    return {'file': path, 'output': output, 'status': 'failed', 'controls': 0, 'mismatches': {}, 'seconds': 0.0,
+            'open': 0.0, 'rig': 0.0, 'save': 0.0, 'error': error, 'pid': pid}
+
+
+def rigFile(path, pattern, profile, output):
+    """
+    Opens scene file path, makes controls for transforms matching pattern with profile and saves the scene to
+    output. Errors are caught and reported, so one broken file doesn't stop a run.
+    Args:
+        path: String. Scene file to open.
+        pattern: String. Node name pattern, see backend.findNodes().
+        profile: Dictionary made by makeProfile().
+        output: String. File to save to, path itself to save in place.
+    Returns:
+        Dictionary with file, output, status ('ok', 'nomatch' or 'failed'), controls, mismatches (connector key:
+        count), seconds (in all and for open, rig and save), error and pid of the worker.
+    """
+    result = _failedResult(path, output, os.getpid())
+    start = time.perf_counter()
+    try:
+        backend = sceneBackend(path)
+        backend.openScene(path)
+        result['open'] = time.perf_counter() - start
+        items = backend.findNodes(pattern)
+        if not items:
+            result['status'] = 'nomatch'
+        else:
+            lap = time.perf_counter()
+            batch, reports = applyProfile(backend, items, profile)
+            result['rig'] = time.perf_counter() - lap
+            result['controls'] = len(items)
+            result['mismatches'] = {key: len(mismatches) for key, mismatches in reports.items()}
+            lap = time.perf_counter()
+            backend.saveScene(output)
+            result['save'] = time.perf_counter() - lap
+            result['status'] = 'ok'
+    except Exception:
+        result['error'] = traceback.format_exc()
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def outputPaths(paths, outputDir=None):
+    """
+    Returns list of files each of paths is saved to: same name in outputDir, or the file itself if outputDir is None.
+    """
+    if outputDir is None:
+        return list(paths)
+    outputs = [os.path.join(outputDir, os.path.basename(path)) for path in paths]
+    if len(set(outputs)) < len(outputs):
+        raise ValueError('Files of the same name would overwrite each other in %s' % outputDir)
+    return outputs
+
+
+def rigFiles(paths, pattern, profile, outputDir=None, processes=None, executable=None, callback=None):
+    """
+    Rigs scene files with rigFile() in a pool of worker processes.
+    Args:
+        paths: List of scene files.
+        pattern: String. Node name pattern.
+        profile: Dictionary made by makeProfile().
+        outputDir: String. Directory to save rigged files to, None to save them in place.
+        processes: Integer. Size of the pool, None for one per cpu (at most one per file).
+        executable: String. Python interpreter of the workers, e.g. mayapy, a path or a name looked up on PATH. None
+            for the running one.
+        callback: Function called with the result of each file as it finishes.
+    Returns:
+        List of rigFile() results in the order of paths. Files the pool couldn't rig, because it broke, are 'failed'.
+        Raises ValueError if executable isn't found or files would be saved over each other, before anything runs.
+    """
+    if executable:
+        # workers are started without a PATH lookup
+        found = shutil.which(executable)
+        if found is None:
+            raise ValueError('Worker interpreter %r not found' % executable)
+        executable = found
+    outputs = outputPaths(paths, outputDir)
+    if outputDir is not None and not os.path.isdir(outputDir):
+        os.makedirs(outputDir)
+    processes = min(processes or os.cpu_count() or 1, len(paths)) or 1
+    # spawned workers start clean in the given interpreter, forked ones would inherit the state of this process
+    context = multiprocessing.get_context('spawn')
+    if executable:
+        context.set_executable(executable)
+    results = [None] * len(paths)
+    broken = None
+    with concurrent.futures.ProcessPoolExecutor(processes, mp_context=context) as executor:
+        futures = {}
+        for i, (path, output) in enumerate(zip(paths, outputs)):
+            try:
+                futures[executor.submit(rigFile, path, pattern, profile, output)] = i
+            except BrokenProcessPool:
+                broken = traceback.format_exc()
+                break
+        for future in concurrent.futures.as_completed(futures):
+            i = futures[future]
+            try:
+                result = future.result()
+            except Exception:
+                # worker died (a crash inside Maya, or the pool broke), rigFile() catches everything else
+                result = _failedResult(paths[i], outputs[i], None, traceback.format_exc())
+            results[i] = result
+            if callback is not None:
+                callback(result)
+    # files never handed to the broken pool
+    for i, result in enumerate(results):
+        if result is None:
+            results[i] = _failedResult(paths[i], outputs[i], None, broken)
+            if callback is not None:
+                callback(results[i])
+    return results
+
+
+def _printResult(result):
+    print('%-8s %6d ctrls %8.2f s  %s' % (result['status'], result['controls'], result['seconds'], result['file']))
+    if result['error']:
+        print(result['error'])
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('files', nargs='+', help='Scene files to rig.')
+    parser.add_argument('--pattern', required=True, help='Name pattern of the nodes to make controls for.')
+    parser.add_argument('--profile', help='JSON file with settings, see DEFAULTPROFILE. Defaults if not given.')
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument('--output-dir', help='Directory to save rigged files to.')
+    output.add_argument('--in-place', action='store_true', help='Overwrite the given files.')
+    parser.add_argument('--processes', type=int, help='Worker processes. One per cpu if not given.')
+    parser.add_argument('--mayapy', help='Python interpreter of the workers. The running one if not given.')
+    parser.add_argument('--report', help='JSON file to write per file results to.')
+    args = parser.parse_args(args)
+
+    try:
+        profile = loadProfile(args.profile) if args.profile else makeProfile()
+    except ValueError as error:
+        parser.error(str(error))
+    start = time.perf_counter()
+    try:
+        results = rigFiles(args.files, args.pattern, profile, args.output_dir, args.processes, args.mayapy,
+                           callback=_printResult)
+    except ValueError as error:
+        parser.error(str(error))
+    seconds = time.perf_counter() - start
+    failed = sum(result['status'] == 'failed' for result in results)
+    print('%d files in %.2f s, %d failed' % (len(results), seconds, failed))
+
+    if args.report:
+        report = {'pattern': args.pattern, 'profile': profile, 'processes': args.processes,
+                  'executable': args.mayapy or sys.executable, 'python': platform.python_version(),
+                  'platform': platform.platform(), 'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'seconds': seconds,
+                  'results': results}
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=1)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
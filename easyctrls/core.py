@@ -0,0 +1,1341 @@
+"""
+Control building pipeline. CtrlsBatch keeps the controls made in one go together with the settings applied to them,
+and does every scene edit through a backend.SceneBackend, so it runs the same inside Maya and headless.
+"""
+import collections
+import contextlib
+import copy
+import json
+import logging
+import math
+import re
+import time
+from array import array
+
+from easyctrls import mathutils, naming, shapelib
+from easyctrls.transaction import Transaction
+
+log = logging.getLogger(__name__)
+
+DEFAULTLCOL = (0.31, 1, 1)
+DEFAULTMCOL = (1, 0.935, 0.117)
+DEFAULTRCOL = (1, 0, 0.5)
+DEFAULTRADIUS = 1.0
+# degree and sections of makeNurbsCircle for control types that can be made with construction history. Other types
+# come from the shape library, without history. Unknown types get a square.
+CTRLTYPES = {'circle': (3, 8), 'square': (1, 4)}
+# key: [label, kind, attributes]. 'connect' connects attributes directly, 'matrix' drives items with a matrix network
+# (see backend.matrixConstrain()), other kinds are constraint types.
+CONNECTORS = {'conT': ['Connect translate', 'connect', ('translate',)],
+              'conR': ['Connect rotation', 'connect', ('rotate',)],
+              'conS': ['Connect scale', 'connect', ('scale',)],
+              'point': ['Point constraint', 'point', ('translate',)],
+              'orient': ['Orient constraint', 'orient', ('rotate',)],
+              'scale': ['Scale constraint', 'scale', ('scale',)],
+              'parent': ['Parent constraint', 'parent', ('translate', 'rotate')],
+              'matrix': ['Matrix connection', 'matrix', ('translate', 'rotate', 'scale')]}
+# connectors switched off when key is switched on
+EXCLUSIVE = {'conT': ('point', 'parent', 'matrix'),
+             'conR': ('orient', 'parent', 'matrix'),
+             'conS': ('scale', 'matrix'),
+             'point': ('conT', 'parent', 'matrix'),
+             'orient': ('conR', 'parent', 'matrix'),
+             'scale': ('conS', 'matrix'),
+             'parent': ('conT', 'conR', 'point', 'orient', 'matrix'),
+             'matrix': ('conT', 'conR', 'conS', 'point', 'orient', 'scale', 'parent')}
+# side of a control is taken from its world position on mirror axis (0 = x, 1 = y, 2 = z). Positions closer to the
+# mirror plane than tolerance count as middle.
+MIRRORAXIS = 0
+SIDETOLERANCE = 0.001
+# side index codes
+SIDECODES = {'L': 1, 'M': 0, 'R': -1}
+# largest distance of a mirrored control position from its twin on the other side
+MIRRORTOLERANCE = 0.01
+# name tokens of each side, swapped to find the twin of an item whose position has none (L_eye_jnt, R_eye_jnt)
+SIDETOKENS = (('L', 'R'), ('l', 'r'), ('Left', 'Right'), ('left', 'right'), ('Lf', 'Rt'), ('lf', 'rt'))
+# name of the color driver node of each side of a batch, when colors are driven
+COLORDRIVERNAME = 'easyCtrls_%s_%sColor_driver'
+# values controls get back when a connector is removed
+ZEROVALUES = {'translate': (0, 0, 0), 'rotate': (0, 0, 0), 'scale': (1, 1, 1)}
+# original values of each item are kept in this order, STRIDE floats per item
+TRANSFORMATTRS = ('translate', 'rotate', 'scale')
+STRIDE = len(TRANSFORMATTRS) * 3
+# largest difference of an item value from its control value (units, degrees) that still counts as matching
+MATCHTOLERANCE = 0.0001
+# what setConnector() does with items that don't match: leave them out, keep their offset, or connect nothing
+RESOLUTIONS = ('skip', 'offset', 'abort')
+
+# batch is stored on a network node named BATCHNODE_<batch name>, so a later session can load() it. A node named
+# BATCHNODE alone is a batch of a version that had only one, loaded as LEGACYBATCHNAME.
+BATCHNODE = 'easyCtrls_batch'
+DEFAULTBATCHNAME = 'batch1'
+LEGACYBATCHNAME = 'batch'
+# batch names end up in node names
+BATCHNAMEPATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+DATAVERSION = 1
+# attributes stored per part of the batch data. Each part is written only when an operation changed it, so tweaking
+# settings doesn't rewrite the member lists.
+DATAPARTS = {'members': ('engine', 'history', 'colorDrivers', 'items', 'ctrls', 'shapes', 'constructors', 'groups',
+                         'cvCounts', 'shapeTypes', 'origTransforms'),
+             'sides': ('sideIndex', 'drivenIndex', 'mirrorAxis', 'sideTolerance'),
+             'settings': ('radius', 'normal', 'offset', 'colors', 'maintainOffset', 'drivers', 'chain', 'groupTemplate',
+                          'ctrlTemplate'),
+             'connectors': ('connectors', 'connected', 'constraints')}
+
+# settings update() compares with what was last written to the controls, and the ones of them that shape controls
+STATEKEYS = ('radius', 'normal', 'offset', 'colors')
+SHAPEKEYS = frozenset(('radius', 'normal', 'offset'))
+# settings a new batch of a BatchSet takes over from the active one
+INHERITED = ('radius', 'normal', 'offset', 'colors', 'connectors', 'maintainOffset', 'chain', 'groupTemplate',
+             'ctrlTemplate', 'mirrorAxis', 'sideTolerance')
+
+# items per slice of ChunkedCreation
+CHUNKSIZE = 200
+
+# item of index didn't match its control. attr is the attribute that differed most, difference the largest
+# absolute difference of its values.
+Mismatch = collections.namedtuple('Mismatch', 'index name attr difference')
+# result of CtrlsBatch.mirror(). pairs: (source index, target index) tuples of twins, unmatched: indices of controls on
+# either side without a twin, skipped: pairs whose shapes couldn't be copied (cv count or history differ).
+MirrorReport = collections.namedtuple('MirrorReport', 'pairs unmatched skipped')
+
+
+def isConstraint(key):
+    # constraints and matrix connections make nodes and can keep offset
+    return CONNECTORS[key][1] != 'connect'
+
+
+def sideCode(position, axis, tolerance):
+    """
+    Returns side code (SIDECODES) of world position: middle within tolerance of the mirror plane of axis, else left
+    on the positive side.
+    """
+    value = position[axis]
+    return 0 if abs(value) <= tolerance else (1 if value > 0 else -1)
+
+
+def batchNodeName(name):
+    """
+    Returns name of the node batch name is stored on.
+    """
+    return '%s_%s' % (BATCHNODE, name)
+
+
+def pairPositions(sources, targets, tolerance):
+    """
+    Pairs each source position with the nearest free target position closer than tolerance. Targets are put in a hash
+    grid of tolerance sized cells, so each source only looks at the 27 cells around its own and pairing takes linear
+    time instead of comparing every pair.
+    Args:
+        sources, targets: Lists of (x, y, z) tuples.
+        tolerance: Float.
+    Returns:
+        List of target indices, one per source. -1 for sources without a twin.
+    """
+    grid = {}
+    for i, position in enumerate(targets):
+        grid.setdefault(tuple(int(math.floor(v / tolerance)) for v in position), []).append(i)
+    paired = set()
+    twins = []
+    for x, y, z in sources:
+        cx, cy, cz = int(math.floor(x / tolerance)), int(math.floor(y / tolerance)), int(math.floor(z / tolerance))
+        twin = -1
+        nearest = tolerance * tolerance
+        for cell in [(cx + dx, cy + dy, cz + dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)]:
+            for i in grid.get(cell, ()):
+                tx, ty, tz = targets[i]
+                distance = (tx - x) ** 2 + (ty - y) ** 2 + (tz - z) ** 2
+                if distance <= nearest and i not in paired:
+                    twin = i
+                    nearest = distance
+        if twin >= 0:
+            paired.add(twin)
+        twins.append(twin)
+    return twins
+
+
+_SWAPTOKENS = dict(SIDETOKENS)
+_SWAPTOKENS.update((right, left) for left, right in SIDETOKENS)
+
+
+def mirrorName(name):
+    """
+    Returns name with its side tokens (SIDETOKENS) swapped, None if it has none. Tokens are parts of the name
+    separated by underscores, the namespace is kept.
+    """
+    namespace, colon, name = name.rpartition(':')
+    tokens = name.split('_')
+    swapped = [_SWAPTOKENS.get(token, token) for token in tokens]
+    if swapped == tokens:
+        return None
+    return namespace + colon + '_'.join(swapped)
+
+
+def _reportCreationTime(count, seconds, engine):
+    # log creation time scaled to 1000 controls at debug level, so engines and batch sizes can be compared.
+    perThousand = seconds / count * 1000 if count else 0
+    log.debug('Created %d controls with %s engine in %.3f s (%.3f s per 1k controls)', count, engine, seconds,
+              perThousand)
+
+
+class CtrlsBatch(object):
+    """
+    One batch of controls and the settings applied to them.
+    ---
+    items, ctrls, shapes, constructors, groups: Lists of handles, paired by index.
+    cvCounts: List of integers. Amount of cvs per shape.
+    shapeTypes: List of strings. Library shape name of each control, a batch can mix shapes.
+    cvs: Dictionary. Library shape name: canonical cvs, for shapes made without history.
+    itemIndex: Dictionary. Item handle (UUID): its index, so adding items skips the ones that have a control.
+    sideIndex: Array of side codes (SIDECODES), paired with ctrls. Built once on create.
+    drivers: Dictionary. Side: handle of its color driver node, when colorDrivers is on.
+    drivenIndex: Array. Side index the controls were connected to drivers with.
+    origTransforms: array('d') of items original values, STRIDE floats per item in TRANSFORMATTRS order.
+    constraints: Dictionary. Connector key: list of constraint handles.
+    connected: Dictionary. Connector key: list of indices of items it connected, all of them unless some were skipped.
+    radius, normal, offset, colors, connectors, maintainOffset, mirrorAxis, sideTolerance: Current settings.
+    chain: Boolean. FK chain mode, groups of new controls go under the control of their nearest ancestor item.
+    groupTemplate, ctrlTemplate: Strings. Names of new groups and controls, with tokens of naming.TOKENS.
+    applied: Dictionary. Setting (STATEKEYS): value last written to every control, colors per side. Settings and
+        sides missing are unknown, as something else wrote them (mirror()), and are written by the next update() that
+        gives them.
+    name: String. Name of the batch, also in the name of its node.
+    dataNode: Handle of the node the batch is stored on, None until first stored.
+    dirty: Set of DATAPARTS changed since last stored.
+    """
+
+    def __init__(self, backend, engine='api', colorDrivers=False, history=True, name=DEFAULTBATCHNAME):
+        """
+        Args:
+            backend: backend.SceneBackend doing the scene edits.
+            engine: String. Creation engine passed to backend.createControls(). 'api' or 'commands'.
+            colorDrivers: Boolean. Connect controls to one color driver node per side, so changing a sides color is
+                one write. bakeColors() removes the drivers.
+            history: Boolean. Drive circle and square shapes with makeNurbsCircle constructors. Without history (and
+                for other library shapes), radius, normal and offset are applied to the shapes library cvs and written
+                to the shapes directly.
+            name: String. Batch name, letters, digits and underscores. Batches of one scene need different names.
+        """
+        if not BATCHNAMEPATTERN.match(name):
+            raise ValueError('Batch name %r can only have letters, digits and underscores' % name)
+        self.backend = backend
+        self.name = name
+        self.engine = engine
+        self.colorDrivers = colorDrivers
+        self.history = history
+        self.items = []
+        self.ctrls = []
+        self.shapes = []
+        self.constructors = []
+        self.groups = []
+        self.cvCounts = []
+        self.shapeTypes = []
+        self.cvs = {}
+        self.itemIndex = {}
+        self.sideIndex = array('b')
+        self.drivers = {}
+        self.drivenIndex = array('b')
+        self.origTransforms = array('d')
+        self.constraints = {key: [] for key in CONNECTORS if isConstraint(key)}
+        self.connected = {key: [] for key in CONNECTORS}
+
+        self.radius = DEFAULTRADIUS
+        self.normal = [0, 0, 0]
+        self.offset = [0, 0, 0]
+        self.colors = {'L': DEFAULTLCOL, 'M': DEFAULTMCOL, 'R': DEFAULTRCOL}
+        self.connectors = dict.fromkeys(CONNECTORS, False)
+        self.maintainOffset = {key: False for key in CONNECTORS if isConstraint(key)}
+        self.mirrorAxis = MIRRORAXIS
+        self.sideTolerance = SIDETOLERANCE
+        self.chain = False
+        self.groupTemplate = naming.DEFAULTGROUPTEMPLATE
+        self.ctrlTemplate = naming.DEFAULTCTRLTEMPLATE
+        self.applied = {}
+        self.dataNode = None
+        self.dirty = set()
+
+    def transaction(self, name, *changed, suspend=True):
+        """
+        Returns a transaction.Transaction for an operation of this batch.
+        Args:
+            name: String. Undo chunk name.
+            changed: Names of DATAPARTS the operation changes. They are stored once the outermost transaction closes.
+            suspend: Boolean. Suspend refresh while the transaction is open.
+        """
+        transaction = Transaction(self.backend, name, suspend)
+        if changed:
+            self.dirty.update(changed)
+            transaction.atClose(self.save)
+        return transaction
+
+    def save(self):
+        """
+        Stores changed parts of the batch on its network node (see batchNodeName()), made on first save, so load() can
+        re-attach to it in a later session. The node is deleted when the batch has no controls left.
+        """
+        if not self.items:
+            if self.dataNode is not None:
+                self.backend.delete([self.dataNode])
+                self.dataNode = None
+        else:
+            parts = DATAPARTS if self.dataNode is None else self.dirty
+            data = {part: self._encode(part) for part in parts}
+            self.dataNode = self.backend.writeBatchData(self.dataNode, batchNodeName(self.name), data)
+        self.dirty.clear()
+
+    def _encode(self, part):
+        # json of attributes of part, arrays as lists
+        data = {attr: getattr(self, attr) for attr in DATAPARTS[part]}
+        data['version'] = DATAVERSION
+        return json.dumps(data, separators=(',', ':'), default=list)
+
+    def load(self):
+        """
+        Re-attaches to the batch of this name stored in the scene by save(), with one scene read. Engine, history and
+        color driver settings given to __init__() are replaced by the stored ones.
+        Returns:
+            Boolean. False if the scene has no stored batch.
+        """
+        return self.restore(*self.backend.findBatchData(batchNodeName(self.name)))
+
+    def restore(self, node, parts):
+        """
+        Re-attaches to a batch stored on node, from parts read from it.
+        Args:
+            node: Handle of the node.
+            parts: Dictionary. Part name: string, as backend.findBatchData() gives them.
+        Returns:
+            Boolean. False if parts don't hold a batch.
+        """
+        if 'members' not in parts:
+            return False
+        self.forget()
+        for part, text in parts.items():
+            if part not in DATAPARTS:
+                continue
+            data = json.loads(text)
+            version = data.pop('version', 0)
+            if version > DATAVERSION:
+                raise ValueError('Stored batch is version %d, newest supported is %d' % (version, DATAVERSION))
+            for attr, value in data.items():
+                setattr(self, attr, value)
+        self.origTransforms = array('d', self.origTransforms)
+        self.colors = {side: tuple(color) for side, color in self.colors.items()}
+        self.sideIndex = array('b', self.sideIndex)
+        self.drivenIndex = array('b', self.drivenIndex)
+        self.itemIndex = {item: i for i, item in enumerate(self.items)}
+        library = shapelib.library()
+        self.cvs = {shapeType: library.shape(shapeType).cvs for shapeType in set(self.shapeTypes)
+                    if not (self.history and shapeType in CTRLTYPES)}
+        self.dataNode = node
+        self.dirty.clear()
+        self.applied = self._state()
+        return True
+
+    def forget(self):
+        """
+        Flushes lists, so this batch doesn't control values of its controls anymore. Scene is left as it is.
+        """
+        for handles in (self.items, self.ctrls, self.shapes, self.constructors, self.groups, self.cvCounts,
+                        self.shapeTypes):
+            handles.clear()
+        self.cvs = {}
+        self.itemIndex = {}
+        self.sideIndex = array('b')
+        self.drivers = {}
+        self.drivenIndex = array('b')
+        self.origTransforms = array('d')
+        self.applied = {}
+        for constraints in self.constraints.values():
+            constraints.clear()
+        for indices in self.connected.values():
+            indices.clear()
+        self.connectors = dict.fromkeys(CONNECTORS, False)
+
+    def create(self, items, ctrltype=None, connect=True, names=None):
+        """
+        Creates control objects of given type for items. Previously made controls are forgotten, with their colors
+        baked if they were driven, so their drivers don't stay behind.
+        Saves original transform values of items, then applies current settings and connectors to new controls.
+        Args:
+            items: List of handles.
+            ctrltype: String. Name of a shape in the shape library.
+            connect: Boolean. Apply connectors. If False they are left off, for the caller to switch on later.
+            names: Dictionary made by controlNames() for these items, or None to make it here.
+        Returns:
+            Dictionary. Connector key: list of Mismatch tuples, see setConnector().
+        """
+        connectors = [key for key in CONNECTORS if self.connectors[key]]
+        reports = {}
+        try:
+            with self.transaction('easyCtrlsCreate', *DATAPARTS):
+                # drivers are made again for the new controls
+                self.bakeColors()
+                self.forget()
+                constructors = self._build(items, ctrltype, names)
+                self.buildSideIndex()
+                self.applyColors()
+                self._applySettings(0, constructors)
+                self.applied = self._state()
+                self.backend.clearSelection()
+                for key in connectors if connect else ():
+                    mismatches = self.setConnector(key, True)
+                    if mismatches:
+                        reports[key] = mismatches
+        except Exception:
+            # scene edits were rolled back, so forget the half made controls as well. Connectors stay as wanted.
+            self.forget()
+            for key in connectors:
+                self.connectors[key] = True
+            raise
+        return reports
+
+    def add(self, items, ctrltype=None, connect=True, names=None):
+        """
+        Creates controls for items that don't have one in this batch yet, instead of rebuilding the batch. Items are
+        keyed by handle (UUID). Current settings, colors and connectors are applied to the new controls only.
+        Without controls in the batch this is create().
+        Args:
+            items: List of handles. Items with a control are skipped.
+            ctrltype: String. Name of a shape in the shape library, can differ from shapes already in the batch.
+            connect: Boolean. Connect new items with connectors that are on. If False, extendConnectors() does it.
+            names: Dictionary made by controlNames() for these items, or None to make it here.
+        Returns:
+            Dictionary. Connector key: list of Mismatch tuples of new items. Connectors that are on stay on, so
+            mismatched new items are constrained with offset, or left unconnected by connections.
+        """
+        if not self.items:
+            return self.create(items, ctrltype, connect, names)
+        new = [item for item in dict.fromkeys(items) if item not in self.itemIndex]
+        if not new:
+            return {}
+        start = len(self.items)
+        constructorStart = len(self.constructors)
+        constraintCounts = {key: len(constraints) for key, constraints in self.constraints.items()}
+        reports = {}
+        try:
+            with self.transaction('easyCtrlsAdd', *DATAPARTS):
+                constructors = self._build(new, ctrltype, names)
+                self.buildSideIndex(start)
+                self.applyColors(start)
+                self._applySettings(start, constructors)
+                self.backend.clearSelection()
+                if connect:
+                    reports = self.extendConnectors(start)
+        except Exception:
+            # scene edits were rolled back, drop the new controls from the batch and keep the old ones
+            self._drop(start, constructorStart, constraintCounts)
+            raise
+        return reports
+
+    def extendConnectors(self, start):
+        """
+        Connects items from index start on with every connector that is on, like add() does.
+        Returns:
+            Dictionary. Connector key: list of Mismatch tuples of those items.
+        """
+        reports = {}
+        with self.transaction('easyCtrlsConnect', 'connectors'):
+            for key in CONNECTORS:
+                if self.connectors[key]:
+                    mismatches = self._extendConnector(key, start)
+                    if mismatches:
+                        reports[key] = mismatches
+        return reports
+
+    def truncate(self, start):
+        """
+        Deletes controls from index start on and drops them from the batch. They must not be connected yet, like
+        controls of a cancelled ChunkedCreation. Start 0 deletes the batch.
+        """
+        if start == 0:
+            self.delete()
+            return
+        constructorStart = len(self.constructors) - len(self._historyShapes(start)[0])
+        with self.transaction('easyCtrlsTruncate', *DATAPARTS):
+            self.backend.delete(self.groups[start:])
+            self._drop(start, constructorStart)
+
+    def _drop(self, start, constructorStart, constraintCounts=None):
+        # forget controls from index start on and their constructors from constructorStart on, scene is left as it is
+        for item in self.items[start:]:
+            self.itemIndex.pop(item, None)
+        for values in (self.items, self.ctrls, self.shapes, self.groups, self.cvCounts, self.shapeTypes):
+            del values[start:]
+        del self.constructors[constructorStart:]
+        del self.origTransforms[start * STRIDE:]
+        for key, count in (constraintCounts or {}).items():
+            del self.constraints[key][count:]
+        for indices in self.connected.values():
+            indices[:] = [i for i in indices if i < start]
+        self.sideIndex = self.sideIndex[:start]
+        self.drivenIndex = self.drivenIndex[:start]
+
+    def _build(self, items, ctrltype, names=None):
+        # create controls for items and append them to the batch. Returns their constructors.
+        backend = self.backend
+        start = len(self.items)
+        items = list(dict.fromkeys(items))
+        parents = None
+        if self.chain:
+            items, parents = self.chainOrder(items)
+        if names is None:
+            names = self.controlNames(items, ctrltype)
+        self.items.extend(items)
+        self.itemIndex.update((item, start + i) for i, item in enumerate(items))
+        self.origTransforms.extend(backend.getAttrArray(items, TRANSFORMATTRS))
+
+        library = shapelib.library()
+        if ctrltype not in library:
+            ctrltype = 'square'
+        degree, sections = CTRLTYPES.get(ctrltype, CTRLTYPES['square'])
+        shape = None if self.history and ctrltype in CTRLTYPES else library.shape(ctrltype)
+        startTime = time.perf_counter()
+        ctrls, shapes, constructors, groups = backend.createControls(items, [names[item] for item in items], degree,
+                                                                     sections, engine=self.engine, shape=shape,
+                                                                     parents=parents,
+                                                                     parentCtrls=self.ctrls if parents else ())
+        _reportCreationTime(len(items), time.perf_counter() - startTime, self.engine)
+        self.ctrls.extend(ctrls)
+        self.shapes.extend(shapes)
+        self.constructors.extend(constructors)
+        self.groups.extend(groups)
+        self.cvCounts.extend(backend.cvCounts(shapes))
+        self.shapeTypes.extend([ctrltype] * len(shapes))
+        if shape is not None:
+            self.cvs[ctrltype] = shape.cvs
+        return constructors
+
+    def controlNames(self, items, ctrltype=None, start=None):
+        """
+        Names the groups and controls of items from groupTemplate and ctrlTemplate. Names are checked against one
+        snapshot of the scene names and each other (see naming.NameReserver), so creation never renames a node and
+        the same items in the same scene always get the same names. Item names and, if the templates use side,
+        positions are read once for all items.
+        Args:
+            items: List of handles, in the order they are created.
+            ctrltype: String. Shape name for the shape token, unknown shapes are made as squares.
+            start: Integer. Batch index of the first item, for the index token. None for after the current controls.
+        Returns:
+            Dictionary. Item handle: tuple of group and control name.
+        """
+        backend = self.backend
+        templates = (self.groupTemplate, self.ctrlTemplate)
+        tokens = naming.templateTokens(templates[0]) | naming.templateTokens(templates[1])
+        if start is None:
+            start = len(self.items)
+        if ctrltype not in shapelib.library():
+            ctrltype = 'square'
+        sides = [None] * len(items)
+        if 'side' in tokens:
+            letters = {code: side for side, code in SIDECODES.items()}
+            sides = [letters[sideCode(position, self.mirrorAxis, self.sideTolerance)]
+                     for position in backend.worldPositions(items)]
+        reserver = naming.NameReserver(backend.existingNames())
+        names = {}
+        for i, (item, name, side) in enumerate(zip(items, backend.nodeNames(items), sides)):
+            namespace, short = naming.splitNamespace(name)
+            values = {'name': short, 'namespace': namespace, 'side': side, 'index': start + i, 'shape': ctrltype}
+            names[item] = reserver.reserve(*[template.format(**values) for template in templates])
+        return names
+
+    def setNameTemplates(self, groupTemplate=None, ctrlTemplate=None):
+        """
+        Sets templates new groups and controls are named with. Controls made earlier keep their names.
+        Args:
+            groupTemplate: String with tokens of naming.TOKENS, e.g. '{side}_{name}_grp'. None keeps the current one.
+            ctrlTemplate: String. None keeps the current one.
+        """
+        groupTemplate = self.groupTemplate if groupTemplate is None else groupTemplate
+        ctrlTemplate = self.ctrlTemplate if ctrlTemplate is None else ctrlTemplate
+        naming.templateTokens(groupTemplate)
+        naming.templateTokens(ctrlTemplate)
+        if groupTemplate == ctrlTemplate:
+            raise ValueError('Groups and controls need different name templates')
+        with self.transaction('easyCtrlsNaming', 'settings'):
+            self.groupTemplate = groupTemplate
+            self.ctrlTemplate = ctrlTemplate
+
+    def chainOrder(self, items):
+        """
+        Sorts items for chain mode, parents first. Nearest ancestors among items and the batch come from one backend
+        call, depths from one pass over them and the sort puts items in one bucket per depth, so the cost is linear in
+        the amount of items however deep or branching the hierarchy is.
+        Args:
+            items: List of handles without controls in this batch.
+        Returns:
+            Tuple of sorted items and list of parent indices for backend.createControls(), one per sorted item: batch
+            index of the control the items group goes under when sorted items are appended to the batch, -1 for none.
+        """
+        start = len(self.items)
+        newIndex = {item: i for i, item in enumerate(items)}
+        ancestors = self.backend.nearestAncestors(items, collections.ChainMap(newIndex, self.itemIndex))
+        # parent among items, -1 for items in world or under a control of the batch, which are roots of the sort
+        parents = [newIndex.get(ancestor, -1) for ancestor in ancestors]
+        depths = [-1] * len(items)
+        for i in range(len(items)):
+            walked = []
+            j = i
+            while j >= 0 and depths[j] < 0:
+                walked.append(j)
+                j = parents[j]
+            depth = depths[j] if j >= 0 else -1
+            for k in reversed(walked):
+                depth += 1
+                depths[k] = depth
+        buckets = [[] for _ in range(max(depths, default=-1) + 1)]
+        for i, depth in enumerate(depths):
+            buckets[depth].append(i)
+        order = [i for bucket in buckets for i in bucket]
+        positions = [0] * len(items)
+        for position, i in enumerate(order):
+            positions[i] = position
+        sortedParents = []
+        for i in order:
+            if parents[i] >= 0:
+                sortedParents.append(start + positions[parents[i]])
+            else:
+                sortedParents.append(-1 if ancestors[i] is None else self.itemIndex[ancestors[i]])
+        return [items[i] for i in order], sortedParents
+
+    def setChain(self, on):
+        # used next time controls are made, controls made already stay where they are
+        with self.transaction('easyCtrlsChain', 'settings'):
+            self.chain = on
+
+    def _applySettings(self, start, constructors):
+        # apply radius, normal and offset to controls from index start on, constructors are theirs.
+        self._writeShapes(constructors, start, SHAPEKEYS)
+
+    def _writeShapes(self, constructors, start, changed):
+        # write shape settings in changed to controls from index start on. Constructors get all their changed
+        # attributes in one write and cvs of shapes without history are written once, whatever changed.
+        attrs = [attr for attr in ('radius', 'normal') if attr in changed]
+        if constructors and attrs:
+            values = tuple(self.radius if attr == 'radius' else tuple(self.normal) for attr in attrs)
+            self.backend.setAttrs(constructors, attrs, [values] * len(constructors))
+        if 'offset' in changed:
+            shapes, cvCounts = self._historyShapes(start)
+            if shapes:
+                self.backend.setCvOffsets(shapes, cvCounts, tuple(self.offset))
+        if changed & SHAPEKEYS:
+            self._applyCvs(start)
+
+    def _state(self):
+        # current settings of STATEKEYS, as stored in applied
+        return {'radius': self.radius, 'normal': tuple(self.normal), 'offset': tuple(self.offset),
+                'colors': dict(self.colors)}
+
+    def update(self, radius=None, normal=None, offset=None, colors=None):
+        """
+        Brings controls to the given settings with the fewest writes. The settings wanted are compared with the ones
+        last written (applied), and only what differs is written: constructors get every changed attribute in one
+        write, cvs of shapes without history are written once however many settings changed, and only controls of
+        sides whose color changed are recolored. Settings and sides applied doesn't know are written only when given.
+        None keeps a setting, or an axis inside normal and offset.
+        Args:
+            radius: Float.
+            normal: Sequence of three numbers or None.
+            offset: Sequence of three floats or None.
+            colors: Dictionary. Side ('L', 'M' or 'R'): tuple of three floats (0-1). Sides left out keep theirs.
+        Returns:
+            Set of STATEKEYS that were written.
+        """
+        wanted = self._state()
+        if radius is not None:
+            wanted['radius'] = radius
+        for key, values in (('normal', normal), ('offset', offset)):
+            if values is not None:
+                wanted[key] = tuple(old if value is None else value for old, value in zip(wanted[key], values))
+        colors = colors or {}
+        wanted['colors'].update((side, tuple(color)) for side, color in colors.items())
+        given = set(key for key, value in (('radius', radius), ('normal', normal), ('offset', offset))
+                    if value is not None)
+        applied = self.applied
+        changed = set(key for key in SHAPEKEYS if (applied[key] != wanted[key] if key in applied else key in given))
+        old = applied.get('colors', {})
+        sides = [side for side in SIDECODES
+                 if (old[side] != wanted['colors'][side] if side in old else side in colors)]
+        if sides:
+            changed.add('colors')
+        if not changed:
+            return changed
+        # writes and the stored settings take the settings from the batch, so they are set here and put back if the
+        # transaction fails, which rolls the scene back
+        previous = (self.radius, self.normal, self.offset, self.colors)
+        self.radius = wanted['radius']
+        self.normal = list(wanted['normal'])
+        self.offset = list(wanted['offset'])
+        self.colors = wanted['colors']
+        try:
+            with self.transaction('easyCtrlsUpdate', 'settings'):
+                self._writeShapes(self.constructors, 0, changed)
+                self._writeColors(sides)
+        except Exception:
+            self.radius, self.normal, self.offset, self.colors = previous
+            raise
+        # what is still unknown stays so
+        self.applied = {key: wanted[key] for key in SHAPEKEYS if key in applied or key in changed}
+        self.applied['colors'] = {side: color for side, color in wanted['colors'].items()
+                                  if side in old or side in sides}
+        return changed
+
+    def setRadius(self, radius):
+        """
+        Sets radius for each control, using its constructor node.
+        """
+        self.update(radius=radius)
+
+    def setNormal(self, x=None, y=None, z=None):
+        """
+        Sets normal for each control, using its constructor node. None keeps current value of that axis.
+        """
+        self.update(normal=(x, y, z))
+
+    def setOffset(self, x=None, y=None, z=None):
+        """
+        Offsets every control vertex of each control. Given axes are updated to self.offset and all three are written
+        at once. None keeps current value of that axis.
+        """
+        self.update(offset=(x, y, z))
+
+    def _historyShapes(self, start=0):
+        # shapes driven by constructors from index start on, and their cv counts
+        if not self.cvs:
+            return self.shapes[start:], self.cvCounts[start:]
+        shapes = []
+        cvCounts = []
+        for shape, cvCount, shapeType in zip(self.shapes[start:], self.cvCounts[start:], self.shapeTypes[start:]):
+            if shapeType not in self.cvs:
+                shapes.append(shape)
+                cvCounts.append(cvCount)
+        return shapes, cvCounts
+
+    def _applyCvs(self, start=0):
+        # without history: transform library cvs of each shape type once and write them to its shapes in one call
+        for shapeType, cvs in self.cvs.items():
+            shapes = [shape for shape, t in zip(self.shapes[start:], self.shapeTypes[start:]) if t == shapeType]
+            if shapes:
+                cvs = mathutils.transformCvs(cvs, self.radius, self.normal, self.offset)
+                self.backend.setCvPositions(shapes, cvs)
+
+    def buildSideIndex(self, start=0):
+        """
+        Classifies each control as left, middle or right from world position of its group, with one scene query.
+        Args:
+            start: Integer. Classify controls from this index on, earlier ones keep their side.
+        """
+        axis = self.mirrorAxis
+        tolerance = self.sideTolerance
+        codes = self.sideIndex[:start]
+        for position in self.backend.worldPositions(self.groups[start:]):
+            codes.append(sideCode(position, axis, tolerance))
+        self.sideIndex = codes
+
+    def setMirrorAxis(self, axis=MIRRORAXIS, tolerance=SIDETOLERANCE):
+        """
+        Changes how sides are classified, rebuilds the side index and recolors controls.
+        Args:
+            axis: Integer. 0, 1 or 2 for x, y or z.
+            tolerance: Float. Distance from mirror plane still counted as middle.
+        """
+        self.mirrorAxis = axis
+        self.sideTolerance = tolerance
+        with self.transaction('easyCtrlsMirrorAxis', 'sides'):
+            self.buildSideIndex()
+            self.applyColors()
+
+    def sides(self):
+        """
+        Returns list of 'L', 'M' or 'R' for each control, from the side index.
+        """
+        names = {code: side for side, code in SIDECODES.items()}
+        return [names[code] for code in self.sideIndex]
+
+    def sideCtrls(self, side):
+        """
+        Returns list of control handles on given side ('L', 'M' or 'R').
+        """
+        code = SIDECODES[side]
+        return [ctrl for ctrl, c in zip(self.ctrls, self.sideIndex) if c == code]
+
+    def setSideColor(self, side, color):
+        """
+        Sets override color of controls on given side.
+        Args:
+            side: String. 'L', 'M' or 'R'.
+            color: Tuple of three floats (0-1).
+        """
+        self.update(colors={side: color})
+
+    def _writeColors(self, sides):
+        # recolor controls of sides with one write, or their color drivers
+        if not sides:
+            return
+        if self.drivers:
+            self.backend.setAttr([self.drivers[side] for side in sides], 'color', [self.colors[side] for side in sides])
+            return
+        codes = {SIDECODES[side]: self.colors[side] for side in sides}
+        indices = [i for i, code in enumerate(self.sideIndex) if code in codes]
+        self.backend.setAttr([self.ctrls[i] for i in indices], 'overrideColorRGB',
+                             [codes[self.sideIndex[i]] for i in indices])
+
+    def applyColors(self, start=0):
+        # set every control from index start on to the color of its side
+        with self.transaction('easyCtrlsColor', 'settings', 'sides'):
+            if self.colorDrivers and self.ctrls:
+                self._applyColorDrivers()
+            else:
+                colors = [self.colors[side] for side in self.sides()[start:]]
+                self.backend.setAttr(self.ctrls[start:], 'overrideColorRGB', colors)
+        if not start:
+            self.applied['colors'] = dict(self.colors)
+
+    def _applyColorDrivers(self):
+        # make missing drivers, set their colors and connect controls that aren't connected by their current side.
+        missing = [side for side in SIDECODES if side not in self.drivers]
+        if missing:
+            names = [COLORDRIVERNAME % (self.name, side) for side in missing]
+            self.drivers.update(zip(missing, self.backend.createColorDrivers(names)))
+        sides = list(SIDECODES)
+        self.backend.setAttr([self.drivers[side] for side in sides], 'color', [self.colors[side] for side in sides])
+        if self.drivenIndex != self.sideIndex:
+            driven = len(self.drivenIndex)
+            changed = [i for i, code in enumerate(self.sideIndex) if i >= driven or self.drivenIndex[i] != code]
+            names = {code: side for side, code in SIDECODES.items()}
+            drivers = [self.drivers[names[self.sideIndex[i]]] for i in changed]
+            self.backend.connectAttrs(drivers, [self.ctrls[i] for i in changed], 'color', 'overrideColorRGB')
+            self.drivenIndex = array('b', self.sideIndex)
+
+    def bakeColors(self):
+        """
+        Disconnects controls from color drivers, sets the colors on the controls and deletes the drivers.
+        """
+        if not self.drivers:
+            return
+        with self.transaction('easyCtrlsBakeColors', 'settings', 'sides'):
+            sides = self.sides()
+            self.backend.disconnectAttrs([self.drivers[side] for side in sides], self.ctrls, 'color',
+                                         'overrideColorRGB')
+            self.backend.setAttr(self.ctrls, 'overrideColorRGB', [self.colors[side] for side in sides])
+            self.backend.delete(list(self.drivers.values()))
+            self.drivers = {}
+            self.drivenIndex = array('b')
+
+    def mirror(self, source='L', tolerance=MIRRORTOLERANCE):
+        """
+        Copies shapes and colors of controls on one side to their twins on the other. Twins are paired by mirrored
+        world position of their groups with pairPositions(), and controls left over by item names with swapped side
+        tokens (mirrorName()). Shapes are mirrored across the mirror plane in world space, so cv tweaks and offsets
+        carry over to their mirrored place. Controls colored by hand get the same color, the others keep the color of
+        their side (color drivers keep the side colors). Each kind of value is read with one query and written with
+        one call.
+        Args:
+            source: String. 'L' or 'R', the side to copy from.
+            tolerance: Float. Largest distance of a mirrored position from its twin.
+        Returns:
+            MirrorReport.
+        """
+        if source not in ('L', 'R'):
+            raise ValueError("Mirror source must be 'L' or 'R', not %r" % source)
+        target = 'R' if source == 'L' else 'L'
+        sources = [i for i, code in enumerate(self.sideIndex) if code == SIDECODES[source]]
+        targets = [i for i, code in enumerate(self.sideIndex) if code == SIDECODES[target]]
+        positions = self.backend.worldPositions([self.groups[i] for i in sources + targets])
+        axis = self.mirrorAxis
+        mirrored = [tuple(-v if a == axis else v for a, v in enumerate(position))
+                    for position in positions[:len(sources)]]
+        twins = pairPositions(mirrored, positions[len(sources):], tolerance)
+        pairs = [(i, targets[twin]) for i, twin in zip(sources, twins) if twin >= 0]
+        lonely = [i for i, twin in zip(sources, twins) if twin < 0]
+        if lonely:
+            paired = set(j for _, j in pairs)
+            free = [j for j in targets if j not in paired]
+            names = self.backend.nodeNames([self.items[i] for i in lonely + free])
+            freeNames = dict(zip(names[len(lonely):], free))
+            for i, name in zip(lonely, names):
+                twin = freeNames.pop(mirrorName(name), None)
+                if twin is not None:
+                    pairs.append((i, twin))
+        paired = set(i for pair in pairs for i in pair)
+        unmatched = [i for i in sorted(sources + targets) if i not in paired]
+        # cvs only carry over between shapes of the same cv count that both have history (tweaks) or not (positions)
+        copied = []
+        skipped = []
+        for i, j in pairs:
+            same = self.cvCounts[i] == self.cvCounts[j] and (self.shapeTypes[i] in self.cvs) == (
+                self.shapeTypes[j] in self.cvs)
+            (copied if same else skipped).append((i, j))
+        if not pairs:
+            return MirrorReport(pairs, unmatched, skipped)
+
+        # shape types are stored with the members, which are only rewritten if a twin takes a new type
+        retyped = [(i, j) for i, j in copied if self.shapeTypes[i] != self.shapeTypes[j]]
+        # twins get shapes and colors the settings don't describe, so the next update() that gives them writes them.
+        # Cvs of history shapes are offset tweaks, other shapes get all their cvs from the shape settings.
+        written = ()
+        if copied:
+            written = SHAPEKEYS if any(self.shapeTypes[i] in self.cvs for i, _ in copied) else ('offset',)
+        shapeTypes = list(self.shapeTypes)
+        try:
+            self._mirrorPairs(pairs, copied, retyped, source, target)
+        except Exception:
+            # scene edits were rolled back, and the shape types stored with them
+            self.shapeTypes = shapeTypes
+            raise
+        for key in written:
+            self.applied.pop(key, None)
+        if not self.drivers and 'colors' in self.applied:
+            self.applied['colors'].pop(target, None)
+        return MirrorReport(pairs, unmatched, skipped)
+
+    def _mirrorPairs(self, pairs, copied, retyped, source, target):
+        # copy cvs of copied and colors of pairs (source index, target index) in one transaction, see mirror()
+        axis = self.mirrorAxis
+        with self.transaction('easyCtrlsMirror', *(('members',) if retyped else ())):
+            if copied:
+                cvLists = self.backend.getCvs([self.shapes[i] for i, _ in copied])
+                matrices = self.backend.worldMatrices([self.ctrls[i] for i, _ in copied] +
+                                                      [self.ctrls[j] for _, j in copied])
+                reflection = mathutils.reflection(axis)
+                mirroredCvs = []
+                for n, (i, j) in enumerate(copied):
+                    # source control space to world, across the plane and into target control space
+                    matrix = mathutils.multiply(mathutils.multiply(matrices[n], reflection),
+                                                mathutils.inverse(matrices[len(copied) + n]))
+                    # tweaks of history shapes are offsets, not positions
+                    mirroredCvs.append(mathutils.transformPoints(cvLists[n], matrix,
+                                                                 vectors=self.shapeTypes[i] not in self.cvs))
+                for i, j in retyped:
+                    self.shapeTypes[j] = self.shapeTypes[i]
+                self.backend.setCvLists([self.shapes[j] for _, j in copied], mirroredCvs)
+            if not self.drivers:
+                colors = self.backend.getAttr([self.ctrls[i] for i, _ in pairs], 'overrideColorRGB')
+                sideColor = self.colors[source]
+                colors = [self.colors[target] if max(abs(a - b) for a, b in zip(color, sideColor)) < 0.001
+                          else tuple(color) for color in colors]
+                self.backend.setAttr([self.ctrls[j] for _, j in pairs], 'overrideColorRGB', colors)
+
+    def setMaintainOffset(self, key, on):
+        # used next time constraint of key is made
+        if key not in self.maintainOffset:
+            raise ValueError('%r is not a constraint, only constraints keep an offset' % key)
+        with self.transaction('easyCtrlsMaintainOffset', 'settings'):
+            self.maintainOffset[key] = on
+
+    def setConnector(self, key, on, resolve=None):
+        """
+        Switches connector on or off. Switching on turns conflicting connectors (EXCLUSIVE) off first, switching off
+        severs connections or deletes constraints and puts items and controls back to original values.
+        Items are checked with validate() before any edit, and every mismatch is handled the same way.
+        Args:
+            key: String. Key of CONNECTORS.
+            on: Boolean.
+            resolve: String. One of RESOLUTIONS. 'skip' connects only matching items, 'offset' constrains
+                mismatched items with offset and 'abort' leaves the scene and connector as they were if anything
+                mismatches. None is 'abort' for connections and 'offset' for constraints. Connections can't keep an
+                offset, 'offset' aborts them.
+        Returns:
+            List of Mismatch tuples, empty when switching off or keeping offset. If the connector is still off after
+            switching it on, nothing was done.
+        """
+        if resolve is not None and resolve not in RESOLUTIONS:
+            raise ValueError('Unknown resolve %r, expected one of %s' % (resolve, ', '.join(RESOLUTIONS)))
+        if not on:
+            if self.connectors[key]:
+                with self._connectorTransaction(key):
+                    self._disconnect(key)
+            return []
+        if resolve is None or (resolve == 'offset' and not isConstraint(key)):
+            resolve = 'offset' if isConstraint(key) else 'abort'
+        # with maintain offset on every item keeps its offset, so there is nothing to check
+        mismatches = [] if isConstraint(key) and self.maintainOffset[key] else self.validate(key)
+        if mismatches and (resolve == 'abort' or len(mismatches) == len(self.items) and resolve == 'skip'):
+            return mismatches
+        with self._connectorTransaction(key):
+            for other in EXCLUSIVE[key]:
+                self.setConnector(other, False)
+            if self.connectors[key]:
+                self._disconnect(key)
+            self._connect(key, mismatches, resolve)
+        return mismatches
+
+    @contextlib.contextmanager
+    def _connectorTransaction(self, key):
+        # transaction of setConnector(). Scene edits are rolled back on failure, so connector bookkeeping is put back
+        # as well, like create() and add() do with their controls.
+        connectors = dict(self.connectors)
+        constraints = {other: list(nodes) for other, nodes in self.constraints.items()}
+        connected = {other: list(indices) for other, indices in self.connected.items()}
+        try:
+            with self.transaction('easyCtrls%s' % key, 'connectors'):
+                yield
+        except Exception:
+            self.connectors = connectors
+            self.constraints = constraints
+            self.connected = connected
+            raise
+
+    def validate(self, key, tolerance=MATCHTOLERANCE, indices=None):
+        """
+        Compares transform values of all items with their controls for the attributes of connector key, before any
+        edit. Values are read in one bulk query per batch. Attributes driven by connectors that are on are compared as
+        they will be once switching key on turns those off, original values against zeroed controls.
+        Args:
+            key: String. Key of CONNECTORS.
+            tolerance: Float. Largest difference that still counts as matching.
+            indices: List of item indices to check, all items if None.
+        Returns:
+            List of Mismatch tuples, in order of items.
+        """
+        attrs = CONNECTORS[key][2]
+        if indices is None:
+            indices = range(len(self.items))
+        count = len(indices)
+        width = len(attrs) * 3
+        values = self.backend.getAttrArray([self.items[i] for i in indices] + [self.ctrls[i] for i in indices], attrs)
+        for a, attr in enumerate(attrs):
+            driven = set()
+            for other in CONNECTORS:
+                if self.connectors[other] and attr in CONNECTORS[other][2]:
+                    driven.update(self.connected[other])
+            orig = TRANSFORMATTRS.index(attr) * 3
+            zero = array('d', ZEROVALUES[attr])
+            for n, i in enumerate(indices):
+                if i in driven:
+                    values[n * width + a * 3:n * width + a * 3 + 3] = self.origTransforms[i * STRIDE + orig:
+                                                                                         i * STRIDE + orig + 3]
+                    values[(count + n) * width + a * 3:(count + n) * width + a * 3 + 3] = zero
+        found = []
+        for n, i in enumerate(indices):
+            itemStart = n * width
+            ctrlStart = (count + n) * width
+            differences = [abs(values[itemStart + j] - values[ctrlStart + j]) for j in range(width)]
+            difference = max(differences)
+            if difference > tolerance:
+                worst = differences.index(difference) // 3
+                found.append((i, attrs[worst], difference))
+        if not found:
+            return []
+        names = self.backend.nodeNames([self.items[i] for i, attr, difference in found])
+        return [Mismatch(i, name, attr, difference) for (i, attr, difference), name in zip(found, names)]
+
+    def _extendConnector(self, key, start):
+        # connect items from index start on with connector key, which is on. Returns their Mismatch tuples.
+        indices = list(range(start, len(self.items)))
+        mismatches = [] if isConstraint(key) and self.maintainOffset[key] else self.validate(key, indices=indices)
+        # new items can't switch a connector off, mismatched ones get offset or are left out
+        self._connect(key, mismatches, 'offset' if isConstraint(key) else 'skip', indices)
+        return mismatches
+
+    def _connect(self, key, mismatches, resolve, indices=None):
+        # make connections or constraints of key for items of indices (all if None) that aren't skipped.
+        label, kind, attrs = CONNECTORS[key]
+        mismatched = set(mismatch.index for mismatch in mismatches)
+        if indices is None:
+            indices = range(len(self.items))
+        if resolve == 'skip':
+            indices = [i for i in indices if i not in mismatched]
+        else:
+            indices = list(indices)
+        items = [self.items[i] for i in indices]
+        ctrls = [self.ctrls[i] for i in indices]
+        if kind == 'connect':
+            for attr in attrs:
+                self.backend.connectAttrs(ctrls, items, attr)
+        else:
+            maintainOffsets = [self.maintainOffset[key] or i in mismatched for i in indices]
+            if kind == 'matrix':
+                constraints = self.backend.matrixConstrain(ctrls, items, maintainOffsets)
+            else:
+                constraints = self.backend.constrain(kind, ctrls, items, maintainOffsets)
+            self.constraints[key].extend(constraints)
+        self.connected[key].extend(indices)
+        self.connectors[key] = True
+
+    def _disconnect(self, key):
+        # remove connections or constraints of key and put original values back on the items it connected.
+        label, kind, attrs = CONNECTORS[key]
+        indices = self.connected[key]
+        items = [self.items[i] for i in indices]
+        ctrls = [self.ctrls[i] for i in indices]
+        if kind == 'connect':
+            for attr in attrs:
+                self.backend.disconnectAttrs(ctrls, items, attr)
+        elif kind == 'matrix':
+            self.backend.matrixRelease(items, self.constraints[key])
+            self.constraints[key] = []
+        else:
+            self.backend.delete(self.constraints[key])
+            self.constraints[key] = []
+        self.backend.setAttrArray(items, attrs, self._origValues(indices, attrs))
+        zeros = array('d', [value for attr in attrs for value in ZEROVALUES[attr]])
+        self.backend.setAttrArray(ctrls, attrs, zeros * len(ctrls))
+        self.connected[key] = []
+        self.connectors[key] = False
+
+    def _origValues(self, indices, attrs):
+        # original values of attrs of items of indices, laid out like backend.getAttrArray() returns them
+        if tuple(attrs) == TRANSFORMATTRS and list(indices) == list(range(len(self.items))):
+            return self.origTransforms
+        offsets = [TRANSFORMATTRS.index(attr) * 3 for attr in attrs]
+        values = array('d')
+        for i in indices:
+            for offset in offsets:
+                values.extend(self.origTransforms[i * STRIDE + offset:i * STRIDE + offset + 3])
+        return values
+
+    def reset(self):
+        """
+        Resets settings to defaults, which resets the controls to original settings as well.
+        Severs all connections and deletes all constraints.
+        """
+        with self.transaction('easyCtrlsReset', 'settings'):
+            # one consolidated update, settings already at their defaults aren't written again
+            self.update(DEFAULTRADIUS, (0, 0, 0), (0, 0, 0), {'L': DEFAULTLCOL, 'M': DEFAULTMCOL, 'R': DEFAULTRCOL})
+            for key in CONNECTORS:
+                self.setConnector(key, False)
+            for key in self.maintainOffset:
+                self.maintainOffset[key] = False
+
+    def delete(self):
+        """
+        Switches connectors off, which severs connections and deletes constraints. Then deletes control groups (and the
+        controls with them) and forgets them.
+        """
+        with self.transaction('easyCtrlsDelete', 'members'):
+            for key in CONNECTORS:
+                self.setConnector(key, False)
+            for key in self.maintainOffset:
+                self.maintainOffset[key] = False
+            self.backend.delete(self.groups + list(self.drivers.values()))
+            self.forget()
+
+    def finish(self):
+        """
+        Bakes colors, deletes construction history of controls and forgets them.
+        """
+        with self.transaction('easyCtrlsFinish', 'members'):
+            self.bakeColors()
+            # controls made without history have nothing to delete
+            if self.constructors:
+                self.backend.deleteHistory(self.ctrls)
+            self.forget()
+
+
+class BatchSet(object):
+    """
+    Named batches of one scene, each with its own controls and settings, stored on its own node. All of them are
+    loaded with one scene read and kept, so switching the active batch touches nothing in the scene, and as every
+    batch only edits its own controls, operations on one never reach the others.
+    ---
+    batches: Dictionary. Batch name: CtrlsBatch, in creation order.
+    active: String. Name of the batch being edited.
+    """
+
+    def __init__(self, backend, engine='api', colorDrivers=False, history=True):
+        """
+        Args:
+            backend: backend.SceneBackend of the scene.
+            engine, colorDrivers, history: Made with for new batches, see CtrlsBatch. Loaded batches keep their own.
+        """
+        self.backend = backend
+        self.engine = engine
+        self.colorDrivers = colorDrivers
+        self.history = history
+        self.batches = {}
+        self.active = None
+
+    @property
+    def current(self):
+        return self.batches[self.active]
+
+    def load(self):
+        """
+        Re-attaches to every batch stored in the scene, with one scene read, and makes the last one active. Without
+        stored batches there is one empty batch.
+        Returns:
+            Integer. Amount of batches loaded.
+        """
+        self.batches = {}
+        for nodeName, node, parts in self.backend.listBatchData(BATCHNODE):
+            name = nodeName[len(BATCHNODE) + 1:] or LEGACYBATCHNAME
+            if not BATCHNAMEPATTERN.match(name) or name in self.batches:
+                continue
+            batch = CtrlsBatch(self.backend, self.engine, self.colorDrivers, self.history, name=name)
+            if batch.restore(node, parts):
+                self.batches[name] = batch
+                self.active = name
+        count = len(self.batches)
+        if not count:
+            self.new()
+        return count
+
+    def _freeName(self):
+        i = 1
+        while 'batch%d' % i in self.batches:
+            i += 1
+        return 'batch%d' % i
+
+    def new(self, name=None):
+        """
+        Adds an empty batch and makes it active. It takes over settings (INHERITED) of the batch that was active, so
+        its controls are made like the ones before, which stay in their own batch.
+        Args:
+            name: String. Batch name, None for the first free 'batch<n>'.
+        Returns:
+            The new CtrlsBatch.
+        """
+        name = name or self._freeName()
+        if name in self.batches:
+            raise ValueError('There is a batch named %r already' % name)
+        batch = CtrlsBatch(self.backend, self.engine, self.colorDrivers, self.history, name=name)
+        if self.active is not None:
+            for attr in INHERITED:
+                setattr(batch, attr, copy.deepcopy(getattr(self.current, attr)))
+        self.batches[name] = batch
+        self.active = name
+        return batch
+
+    def switch(self, name):
+        """
+        Makes batch name active, without reading the scene.
+        Returns:
+            The CtrlsBatch.
+        """
+        if name not in self.batches:
+            raise ValueError('No batch named %r' % name)
+        self.active = name
+        return self.batches[name]
+
+    def remove(self, name=None):
+        """
+        Drops batch name (the active one if None) and makes the last one left active, or a new empty batch if there
+        is none. Its controls are left in the scene and stored, delete() or finish() the batch first to remove them.
+        Returns:
+            The active CtrlsBatch.
+        """
+        name = self.active if name is None else name
+        del self.batches[name]
+        if not self.batches:
+            self.active = None
+            return self.new()
+        if name == self.active:
+            self.active = list(self.batches)[-1]
+        return self.current
+
+    def finish(self):
+        """
+        Finishes every batch (see CtrlsBatch.finish()) in one undo chunk, then starts over with one empty batch.
+        """
+        with Transaction(self.backend, 'easyCtrlsFinishAll'):
+            for batch in self.batches.values():
+                batch.finish()
+        self.batches = {}
+        self.active = None
+        self.new()
+
+
+class ChunkedCreation(object):
+    """
+    Creates controls for a big selection in slices of chunkSize items, each slice in its own transaction, so a UI can
+    keep Maya responsive between them, show progress and cancel. Connectors are applied once, after the last slice,
+    so a cancelled run can be removed again without releasing anything.
+    Call step() until it returns True, then finish(). Or cancel() at any point.
+    ---
+    done, total: Integers. Items handled so far and in all.
+    reports: Dictionary of Mismatch lists, like create() returns, filled by finish().
+    """
+
+    def __init__(self, batch, items, ctrltype=None, add=False, chunkSize=CHUNKSIZE):
+        """
+        Args:
+            batch: CtrlsBatch to create in.
+            items: List of handles.
+            ctrltype: String. Name of a shape in the shape library.
+            add: Boolean. Add to the controls of batch like CtrlsBatch.add(), instead of replacing them.
+            chunkSize: Integer. Items per slice.
+        """
+        self.batch = batch
+        self.ctrltype = ctrltype
+        self.add = add and bool(batch.items)
+        self.chunkSize = chunkSize
+        if self.add:
+            self.items = [item for item in dict.fromkeys(items) if item not in batch.itemIndex]
+            self.start = len(batch.items)
+        else:
+            self.items = list(dict.fromkeys(items))
+            self.start = 0
+        if batch.chain:
+            # slices are made parents first, so every parent has its control before its children are made
+            self.items = batch.chainOrder(self.items)[0]
+        # names of the whole run are reserved up front, so the scene names are read once instead of once per slice
+        self.names = batch.controlNames(self.items, ctrltype, self.start)
+        # connectors to switch on for a new batch, create() would turn them off for slices
+        self.connectors = [key for key in CONNECTORS if batch.connectors[key]]
+        self.done = 0
+        self.total = len(self.items)
+        self.reports = {}
+        self.startTime = None
+
+    def step(self):
+        """
+        Creates the next slice.
+        Returns:
+            Boolean. True when every item is done.
+        """
+        if self.startTime is None:
+            self.startTime = time.perf_counter()
+        chunk = self.items[self.done:self.done + self.chunkSize]
+        if chunk:
+            if self.done == 0 and not self.add:
+                self.batch.create(chunk, self.ctrltype, connect=False, names=self.names)
+            else:
+                self.batch.add(chunk, self.ctrltype, connect=False, names=self.names)
+            self.done += len(chunk)
+        return self.done >= self.total
+
+    def eta(self):
+        """
+        Returns estimated seconds left, from the average time per item so far. None before the first slice.
+        """
+        if not self.done:
+            return None
+        elapsed = time.perf_counter() - self.startTime
+        return elapsed / self.done * (self.total - self.done)
+
+    def finish(self):
+        """
+        Applies connectors to the created controls.
+        Returns:
+            Dictionary. Connector key: list of Mismatch tuples, see CtrlsBatch.create().
+        """
+        batch = self.batch
+        if self.add:
+            self.reports = batch.extendConnectors(self.start)
+        elif batch.items:
+            with batch.transaction('easyCtrlsConnect', 'connectors'):
+                for key in self.connectors:
+                    mismatches = batch.setConnector(key, True)
+                    if mismatches:
+                        self.reports[key] = mismatches
+        return self.reports
+
+    def cancel(self, keep=True):
+        """
+        Stops creating. Kept controls are finished like a complete run, otherwise they are deleted and the batch is
+        left as it was before the run (forgotten controls of a replaced batch are not brought back).
+        Args:
+            keep: Boolean. Keep controls created so far.
+        Returns:
+            Dictionary of Mismatch lists of kept controls, see finish().
+        """
+        self.total = self.done
+        if keep:
+            return self.finish()
+        if self.done:
+            self.batch.truncate(self.start)
+        if not self.add:
+            for key in self.connectors:
+                self.batch.connectors[key] = True
+        return {}
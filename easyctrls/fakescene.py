@@ -0,0 +1,521 @@
+"""
+In-memory stand-in for a Maya scene. Implements backend.SceneBackend in plain Python, so the control pipeline can be
+run, profiled and checked without Maya.
+"""
+import contextlib
+import fnmatch
+import json
+import re
+import uuid
+from array import array
+
+from easyctrls import backend
+from easyctrls import mathutils
+
+# attributes every fake node of given type starts with
+DEFAULTATTRS = {'transform': {'translate': (0.0, 0.0, 0.0), 'rotate': (0.0, 0.0, 0.0), 'scale': (1.0, 1.0, 1.0),
+                              'overrideEnabled': False, 'overrideRGBColors': False,
+                              'overrideColorRGB': (0.0, 0.0, 0.0)},
+                'nurbsCurve': {'controlPoints': ()},
+                'network': {'color': (0.0, 0.0, 0.0)},
+                'makeNurbsCircle': {'radius': 1.0, 'normal': (0.0, 0.0, 1.0), 'degree': 3, 'sections': 8}}
+# node types that get transform attributes
+TRANSFORMTYPES = ('transform', 'joint')
+# single axis names of compound attributes, e.g. translateX
+AXES = {'X': 0, 'Y': 1, 'Z': 2}
+
+
+def _tuples(value):
+    # JSON gives lists where the scene keeps tuples, matrices are tuples of tuples
+    return tuple(_tuples(v) for v in value) if isinstance(value, list) else value
+
+
+def _parentInverseMatrix(scene, handle):
+    parent = scene.nodes[handle].parent
+    return mathutils.inverse(scene.worldMatrix(parent)) if parent is not None else mathutils.IDENTITY
+
+
+def _matrixSum(scene, handle):
+    # multMatrix output, product of its matrixIn[i] in index order. Inputs are used from 0 up to the first gap.
+    matrix = mathutils.IDENTITY
+    attrs = scene.nodes[handle].attrs
+    i = 0
+    while 'matrixIn[%d]' % i in attrs or (handle, 'matrixIn[%d]' % i) in scene.connections:
+        matrix = mathutils.multiply(matrix, scene._getValue(handle, 'matrixIn[%d]' % i))
+        i += 1
+    return matrix
+
+
+# output attributes evaluated on read, attr: function(scene, handle)
+COMPUTED = {'worldMatrix': lambda scene, handle: scene.worldMatrix(handle),
+            'worldInverseMatrix': lambda scene, handle: mathutils.inverse(scene.worldMatrix(handle)),
+            'parentInverseMatrix': _parentInverseMatrix,
+            'matrixSum': _matrixSum}
+
+
+class FakeNode(object):
+    __slots__ = ('name', 'type', 'parent', 'attrs')
+
+    def __init__(self, name, nodeType, parent=None):
+        self.name = name
+        self.type = nodeType
+        self.parent = parent
+        if nodeType in TRANSFORMTYPES:
+            nodeType = 'transform'
+        self.attrs = dict(DEFAULTATTRS.get(nodeType, {}))
+
+
+class FakeScene(backend.SceneBackend):
+    """
+    Scene of FakeNodes keyed by generated UUIDs. Connections are stored as target (handle, attr): source
+    (handle, attr). Constraints are nodes under their target, holding 'driver' and 'maintainOffset'.
+    Undo chunks keep a journal of undo functions, so rollbackChunk() restores the scene like Mayas undo would.
+    """
+
+    def __init__(self):
+        super(FakeScene, self).__init__()
+        self.nodes = {}
+        self.connections = {}
+        self.selected = []
+        self.names = set()
+        self.nameCounters = {}
+        self.journal = None
+        self.lastJournal = []
+        # world matrices computed during one read, None outside reads
+        self.evalCache = None
+
+    # --- building scenes for benchmarks and checks
+
+    def addTransform(self, name, parent=None, translate=(0, 0, 0), rotate=(0, 0, 0), scale=(1, 1, 1),
+                     nodeType='transform'):
+        """
+        Adds a transform (or joint) node and returns its handle.
+        """
+        handle = self._createNode(name, nodeType, parent)
+        node = self.nodes[handle]
+        node.attrs['translate'] = tuple(float(v) for v in translate)
+        node.attrs['rotate'] = tuple(float(v) for v in rotate)
+        node.attrs['scale'] = tuple(float(v) for v in scale)
+        return handle
+
+    def select(self, handles):
+        self.selected = list(handles)
+
+    # --- scene files, JSON stand-ins for Maya scene files in headless runs
+
+    def openScene(self, path):
+        with open(path) as f:
+            data = json.load(f)
+        self.nodes = {}
+        for handle, name, nodeType, parent, attrs in data['nodes']:
+            node = FakeNode(name, nodeType, parent)
+            node.attrs.update((attr, _tuples(value)) for attr, value in attrs.items())
+            self.nodes[handle] = node
+        self.connections = {(target, targetAttr): (source, sourceAttr)
+                            for target, targetAttr, source, sourceAttr in data['connections']}
+        self.names = set(node.name for node in self.nodes.values())
+        self.nameCounters = {}
+        self.selected = []
+        self.lastJournal = []
+
+    def saveScene(self, path):
+        data = {'nodes': [(handle, node.name, node.type, node.parent, node.attrs)
+                          for handle, node in self.nodes.items()],
+                'connections': [target + source for target, source in self.connections.items()]}
+        with open(path, 'w') as f:
+            json.dump(data, f)
+
+    def worldMatrix(self, handle):
+        with self._evaluation():
+            return self._worldMatrix(handle)
+
+    def _worldMatrix(self, handle):
+        # matrix networks read the same parents many times, so every world matrix is computed once per read. Parents
+        # are collected up to the first computed one and done top down, so deep FK chains don't recurse.
+        chain = []
+        while handle is not None and handle not in self.evalCache:
+            chain.append(handle)
+            handle = self.nodes[handle].parent
+        parentMatrix = self.evalCache[handle] if handle is not None else None
+        for handle in reversed(chain):
+            attrs = self.nodes[handle].attrs
+            matrix = mathutils.composeTRS(self._getValue(handle, 'translate'), self._getValue(handle, 'rotate'),
+                                          self._getValue(handle, 'scale'))
+            if 'offsetParentMatrix' in attrs or (handle, 'offsetParentMatrix') in self.connections:
+                matrix = mathutils.multiply(matrix, self._getValue(handle, 'offsetParentMatrix'))
+            if parentMatrix is not None:
+                matrix = mathutils.multiply(matrix, parentMatrix)
+            self.evalCache[handle] = matrix
+            parentMatrix = matrix
+        return parentMatrix
+
+    def childrenMap(self):
+        """
+        Returns dictionary of parent handle: list of child handles, built in one pass over the scene.
+        """
+        children = {}
+        for handle, node in self.nodes.items():
+            children.setdefault(node.parent, []).append(handle)
+        return children
+
+    # --- internals
+
+    @contextlib.contextmanager
+    def _evaluation(self):
+        # scene doesn't change while it is read, so computed world matrices are kept until the outermost read returns
+        if self.evalCache is not None:
+            yield
+            return
+        self.evalCache = {}
+        try:
+            yield
+        finally:
+            self.evalCache = None
+
+    def _uniqueName(self, name):
+        # clashing names get a number, like Maya does
+        if name not in self.names:
+            return name
+        base = re.sub(r'\d+$', '', name)
+        # continue from last number given to base, so thousands of clashes don't rescan from 1
+        i = self.nameCounters.get(base, 1)
+        while '%s%d' % (base, i) in self.names:
+            i += 1
+        self.nameCounters[base] = i + 1
+        return '%s%d' % (base, i)
+
+    def _record(self, undo):
+        if self.journal is not None:
+            self.journal.append(undo)
+
+    def _createNode(self, name, nodeType, parent=None):
+        handle = str(uuid.uuid4()).upper()
+        name = self._uniqueName(name)
+        self.nodes[handle] = FakeNode(name, nodeType, parent)
+        self.names.add(name)
+        self._record(lambda: self._removeNode(handle))
+        return handle
+
+    def _removeNode(self, handle):
+        node = self.nodes.pop(handle)
+        self.names.discard(node.name)
+        return node
+
+    def _setValue(self, handle, attr, value):
+        attrs = self.nodes[handle].attrs
+        if attr[-1] in AXES and attr[:-1] in attrs and isinstance(attrs[attr[:-1]], tuple):
+            # single axis of a compound attribute
+            compound = attr[:-1]
+            old = attrs[compound]
+            values = list(old)
+            values[AXES[attr[-1]]] = value
+            attrs[compound] = tuple(values)
+        else:
+            compound = attr
+            old = attrs.get(attr)
+            attrs[attr] = tuple(value) if isinstance(value, list) else value
+        self._record(lambda: attrs.__setitem__(compound, old))
+
+    def _getValue(self, handle, attr):
+        # connected attributes give the value of their source
+        source = self.connections.get((handle, attr))
+        if source is not None:
+            return self._getValue(*source)
+        if attr in COMPUTED:
+            return COMPUTED[attr](self, handle)
+        attrs = self.nodes[handle].attrs
+        if attr not in attrs and attr[-1] in AXES and attr[:-1] in attrs:
+            return attrs[attr[:-1]][AXES[attr[-1]]]
+        return attrs[attr]
+
+    def _connect(self, source, target):
+        old = self.connections.get(target)
+        self.connections[target] = source
+        self._record(lambda: self._restoreConnection(target, old))
+
+    def _restoreConnection(self, target, source):
+        if source is None:
+            self.connections.pop(target, None)
+        else:
+            self.connections[target] = source
+
+    # --- undo chunks
+
+    def openChunk(self, name):
+        self.journal = []
+
+    def closeChunk(self):
+        self.lastJournal = self.journal
+        self.journal = None
+
+    def rollbackChunk(self):
+        for undo in reversed(self.lastJournal):
+            undo()
+        self.lastJournal = []
+
+    def suspendRefresh(self, on):
+        # nothing is drawn
+        pass
+
+    # --- reads
+
+    @backend.read
+    def selection(self):
+        return list(self.selected)
+
+    @backend.read
+    def findNodes(self, pattern):
+        return [handle for handle, node in self.nodes.items()
+                if node.type in TRANSFORMTYPES and fnmatch.fnmatchcase(node.name, pattern)]
+
+    @backend.read
+    def nearestAncestors(self, handles, among):
+        # nearest ancestor of every node walked through, so later walks stop where earlier ones passed
+        nearest = {}
+        result = []
+        for handle in handles:
+            walked = []
+            found = None
+            parent = self.nodes[handle].parent
+            while parent is not None:
+                if parent in among:
+                    found = parent
+                    break
+                if parent in nearest:
+                    found = nearest[parent]
+                    break
+                walked.append(parent)
+                parent = self.nodes[parent].parent
+            nearest.update(dict.fromkeys(walked, found))
+            result.append(found)
+        return result
+
+    @backend.read
+    def existingNames(self):
+        return set(self.names)
+
+    @backend.read
+    def nodeNames(self, handles):
+        return [self.nodes[handle].name for handle in handles]
+
+    @backend.read
+    def getAttr(self, handles, attr):
+        with self._evaluation():
+            return [self._getValue(handle, attr) for handle in handles]
+
+    @backend.read
+    def getAttrArray(self, handles, attrs):
+        values = array('d')
+        for handle in handles:
+            for attr in attrs:
+                values.extend(self._getValue(handle, attr))
+        return values
+
+    @backend.read
+    def worldPositions(self, handles):
+        with self._evaluation():
+            return [tuple(self.worldMatrix(handle)[3][:3]) for handle in handles]
+
+    @backend.read
+    def worldMatrices(self, handles):
+        with self._evaluation():
+            return [tuple(tuple(row) for row in self._worldMatrix(handle)) for handle in handles]
+
+    @backend.read
+    def cvCounts(self, shapes):
+        return [len(self.nodes[shape].attrs['controlPoints']) for shape in shapes]
+
+    @backend.read
+    def getCvs(self, shapes):
+        return [list(self.nodes[shape].attrs['controlPoints']) for shape in shapes]
+
+    @backend.read
+    def findBatchData(self, name):
+        for handle, node in self.nodes.items():
+            if node.name == name and node.type == 'network':
+                return handle, self._batchParts(node)
+        return None, {}
+
+    @backend.read
+    def listBatchData(self, prefix):
+        return [(node.name, handle, self._batchParts(node)) for handle, node in self.nodes.items()
+                if node.type == 'network' and node.name.startswith(prefix)
+                and (backend.BATCHTAG in node.attrs or node.name == prefix)]
+
+    def _batchParts(self, node):
+        # attributes added in an undone chunk are left as None
+        return {attr[5:]: value for attr, value in node.attrs.items() if attr.startswith('data_') and value is not None}
+
+    # --- writes
+
+    @backend.write
+    def createControls(self, items, names, degree, sections, engine='api', shape=None, parents=None, parentCtrls=()):
+        result = ([], [], [], [])
+        # periodic curve has spans + degree cvs
+        cvCount = sections + degree
+        allCtrls = list(parentCtrls)
+        # scene above new groups doesn't change while they are made, so world matrices are computed once
+        with self._evaluation():
+            for i, (item, (groupName, ctrlName)) in enumerate(zip(items, names)):
+                matrix = self._worldMatrix(item)
+                parent = None
+                if parents is not None and parents[i] >= 0:
+                    # group keeps its world transformation under the parent control
+                    parent = allCtrls[parents[i]]
+                    matrix = mathutils.multiply(matrix, mathutils.inverse(self._worldMatrix(parent)))
+                translate, rotate, scale = mathutils.decomposeTRS(matrix)
+                ctrlGrp = self.addTransform(groupName, parent, translate, rotate, scale)
+                ctrl = self._createNode(ctrlName, 'transform')
+                self.nodes[ctrl].parent = ctrlGrp
+                self.nodes[ctrl].attrs['overrideEnabled'] = True
+                self.nodes[ctrl].attrs['overrideRGBColors'] = True
+                curve = self._createNode(self.nodes[ctrl].name + 'Shape', 'nurbsCurve', ctrl)
+                constructor = None
+                if shape is None:
+                    self.nodes[curve].attrs['controlPoints'] = ((0.0, 0.0, 0.0),) * cvCount
+                    constructor = self._createNode('makeNurbsCircle1', 'makeNurbsCircle')
+                    self.nodes[constructor].attrs.update({'radius': 0.5, 'normal': (0.0, 0.0, 0.0), 'degree': degree,
+                                                          'sections': sections})
+                    self._connect((constructor, 'outputCurve'), (curve, 'create'))
+                else:
+                    self.nodes[curve].attrs['controlPoints'] = tuple(shape.cvs)
+                allCtrls.append(ctrl)
+                for handles, node in zip(result, (ctrl, curve, constructor, ctrlGrp)):
+                    if node is not None:
+                        handles.append(node)
+        return result
+
+    @backend.write
+    def createColorDrivers(self, names):
+        return [self._createNode(name, 'network') for name in names]
+
+    @backend.write
+    def setAttr(self, handles, attr, values):
+        for handle, value in zip(handles, values):
+            self._setValue(handle, attr, value)
+
+    @backend.write
+    def setAttrs(self, handles, attrs, values):
+        for handle, nodeValues in zip(handles, values):
+            for attr, value in zip(attrs, nodeValues):
+                self._setValue(handle, attr, value)
+
+    @backend.write
+    def setAttrArray(self, handles, attrs, values):
+        i = 0
+        for handle in handles:
+            for attr in attrs:
+                self._setValue(handle, attr, tuple(values[i:i + 3]))
+                i += 3
+
+    @backend.write
+    def setCvOffsets(self, shapes, cvCounts, offset):
+        offset = tuple(offset)
+        for shape, count in zip(shapes, cvCounts):
+            self._setValue(shape, 'controlPoints', (offset,) * count)
+
+    @backend.write
+    def setCvPositions(self, shapes, cvs):
+        cvs = tuple(tuple(cv) for cv in cvs)
+        for shape in shapes:
+            self._setValue(shape, 'controlPoints', cvs)
+
+    @backend.write
+    def setCvLists(self, shapes, cvLists):
+        for shape, cvs in zip(shapes, cvLists):
+            self._setValue(shape, 'controlPoints', tuple(tuple(cv) for cv in cvs))
+
+    @backend.write
+    def connectAttrs(self, sources, targets, attr, targetAttr=None):
+        targetAttr = targetAttr or attr
+        for source, target in zip(sources, targets):
+            self._connect((source, attr), (target, targetAttr))
+
+    @backend.write
+    def disconnectAttrs(self, sources, targets, attr, targetAttr=None):
+        targetAttr = targetAttr or attr
+        for source, target in zip(sources, targets):
+            if self.connections.get((target, targetAttr)) == (source, attr):
+                self.connections.pop((target, targetAttr))
+                self._record(lambda s=(source, attr), t=(target, targetAttr): self._connect(s, t))
+
+    @backend.write
+    def constrain(self, kind, drivers, targets, maintainOffsets):
+        constraints = []
+        for driver, target, maintainOffset in zip(drivers, targets, maintainOffsets):
+            constraint = self._createNode('%s_%sConstraint1' % (self.nodes[target].name, kind),
+                                          kind + 'Constraint', target)
+            self.nodes[constraint].attrs.update({'driver': driver, 'maintainOffset': maintainOffset})
+            constraints.append(constraint)
+        return constraints
+
+    @backend.write
+    def matrixConstrain(self, drivers, targets, maintainOffsets):
+        # offsets of the whole batch are read before the first edit, world matrices don't change on the way
+        with self._evaluation():
+            offsets = [mathutils.multiply(self.worldMatrix(target), mathutils.inverse(self.worldMatrix(driver)))
+                       if maintainOffset else mathutils.IDENTITY
+                       for driver, target, maintainOffset in zip(drivers, targets, maintainOffsets)]
+        nodes = []
+        for driver, target, offset in zip(drivers, targets, offsets):
+            for attr in ('translate', 'rotate', 'scale'):
+                self._setValue(target, attr, DEFAULTATTRS['transform'][attr])
+            mult = self._createNode('%s_multMatrix' % self.nodes[target].name, 'multMatrix')
+            self._setValue(mult, 'matrixIn[0]', offset)
+            self._connect((driver, 'worldMatrix'), (mult, 'matrixIn[1]'))
+            self._connect((target, 'parentInverseMatrix'), (mult, 'matrixIn[2]'))
+            self._connect((mult, 'matrixSum'), (target, 'offsetParentMatrix'))
+            nodes.append(mult)
+        return nodes
+
+    @backend.write
+    def matrixRelease(self, targets, nodes):
+        self._delete(nodes)
+        for target in targets:
+            self._setValue(target, 'offsetParentMatrix', mathutils.IDENTITY)
+
+    @backend.write
+    def writeBatchData(self, node, name, parts):
+        if node is None:
+            node = self._createNode(name, 'network')
+            self._setValue(node, backend.BATCHTAG, True)
+        for part, data in parts.items():
+            self._setValue(node, 'data_' + part, data)
+        return node
+
+    @backend.write
+    def delete(self, handles):
+        self._delete(handles)
+
+    def _delete(self, handles):
+        # children go with their parents, history nodes only go with history deletion
+        children = self.childrenMap()
+        doomed = set()
+        stack = [handle for handle in handles if handle in self.nodes]
+        while stack:
+            handle = stack.pop()
+            if handle not in doomed:
+                doomed.add(handle)
+                stack.extend(children.get(handle, ()))
+        # history node goes with the shape it creates, like Maya deletes nodes left without outputs
+        doomed.update([source[0] for target, source in self.connections.items()
+                       if target[0] in doomed and target[1] == 'create'])
+        for handle in doomed:
+            node = self._removeNode(handle)
+            self._record(lambda h=handle, n=node: (self.nodes.__setitem__(h, n), self.names.add(n.name)))
+        for target, source in list(self.connections.items()):
+            if target[0] in doomed or source[0] in doomed:
+                self.connections.pop(target)
+                self._record(lambda t=target, s=source: self.connections.__setitem__(t, s))
+
+    @backend.write
+    def deleteHistory(self, handles):
+        children = self.childrenMap()
+        shapes = set(child for handle in handles for child in children.get(handle, ()))
+        history = [source[0] for target, source in self.connections.items()
+                   if target[0] in shapes and target[1] == 'create']
+        self._delete(history)
+
+    @backend.write
+    def clearSelection(self):
+        self.selected = []
@@ -0,0 +1,141 @@
+"""
+Small pure Python matrix helpers for backends without Maya. Matrices are 4x4 nested lists in Mayas convention: row
+vectors, translation on the last row, rotation order xyz and angles in degrees.
+"""
+import math
+
+IDENTITY = ((1.0, 0.0, 0.0, 0.0), (0.0, 1.0, 0.0, 0.0), (0.0, 0.0, 1.0, 0.0), (0.0, 0.0, 0.0, 1.0))
+
+
+def multiply(a, b):
+    return [[a[i][0] * b[0][j] + a[i][1] * b[1][j] + a[i][2] * b[2][j] + a[i][3] * b[3][j] for j in range(4)]
+            for i in range(4)]
+
+
+def inverse(matrix):
+    """
+    Inverts an affine matrix (last column 0, 0, 0, 1).
+    """
+    (a, b, c), (d, e, f), (g, h, i) = [row[:3] for row in matrix[:3]]
+    det = a * (e * i - f * h) - b * (d * i - f * g) + c * (d * h - e * g)
+    rows = [[(e * i - f * h) / det, (c * h - b * i) / det, (b * f - c * e) / det],
+            [(f * g - d * i) / det, (a * i - c * g) / det, (c * d - a * f) / det],
+            [(d * h - e * g) / det, (b * g - a * h) / det, (a * e - b * d) / det]]
+    t = matrix[3][:3]
+    translate = [-(t[0] * rows[0][j] + t[1] * rows[1][j] + t[2] * rows[2][j]) for j in range(3)]
+    return [row + [0.0] for row in rows] + [translate + [1.0]]
+
+
+def reflection(axis):
+    """
+    Returns matrix mirroring across the plane through the origin perpendicular to axis (0, 1 or 2 for x, y or z).
+    """
+    return [[(-1.0 if i == j == axis else float(i == j)) for j in range(4)] for i in range(4)]
+
+
+def transformPoints(points, matrix, vectors=False):
+    """
+    Multiplies (x, y, z) points with matrix. Vectors skip the translation. Returns list of tuples.
+    """
+    (a, b, c, _), (d, e, f, _), (g, h, i, _), (x, y, z, _) = matrix
+    if vectors:
+        x = y = z = 0.0
+    return [(px * a + py * d + pz * g + x, px * b + py * e + pz * h + y, px * c + py * f + pz * i + z)
+            for px, py, pz in points]
+
+
+def composeTRS(translate, rotate, scale):
+    """
+    Builds a local matrix from translate, rotate (degrees, xyz) and scale, like a transform node does.
+    """
+    x, y, z = [math.radians(r) for r in rotate]
+    cx, sx = math.cos(x), math.sin(x)
+    cy, sy = math.cos(y), math.sin(y)
+    cz, sz = math.cos(z), math.sin(z)
+    # rows of Rx * Ry * Rz
+    rows = ((cy * cz, cy * sz, -sy),
+            (sx * sy * cz - cx * sz, sx * sy * sz + cx * cz, sx * cy),
+            (cx * sy * cz + sx * sz, cx * sy * sz - sx * cz, cx * cy))
+    matrix = [[rows[i][j] * scale[i] for j in range(3)] + [0.0] for i in range(3)]
+    matrix.append([translate[0], translate[1], translate[2], 1.0])
+    return matrix
+
+
+def decomposeTRS(matrix):
+    """
+    Splits a matrix into translate, rotate (degrees, xyz) and scale tuples. Shear is ignored.
+    """
+    translate = tuple(matrix[3][:3])
+    rows = [list(matrix[i][:3]) for i in range(3)]
+    scale = [math.sqrt(sum(v * v for v in row)) for row in rows]
+    rows = [[v / s for v in row] if s else row for row, s in zip(rows, scale)]
+    det = (rows[0][0] * (rows[1][1] * rows[2][2] - rows[1][2] * rows[2][1]) -
+           rows[0][1] * (rows[1][0] * rows[2][2] - rows[1][2] * rows[2][0]) +
+           rows[0][2] * (rows[1][0] * rows[2][1] - rows[1][1] * rows[2][0]))
+    if det < 0:
+        scale[0] = -scale[0]
+        rows[0] = [-v for v in rows[0]]
+
+    sy = max(-1.0, min(1.0, -rows[0][2]))
+    y = math.asin(sy)
+    if abs(math.cos(y)) > 1e-9:
+        x = math.atan2(rows[1][2], rows[2][2])
+        z = math.atan2(rows[0][1], rows[0][0])
+    else:
+        # gimbal lock, put all of it on x
+        x = math.atan2(-rows[2][1], rows[1][1])
+        z = 0.0
+    rotate = (math.degrees(x), math.degrees(y), math.degrees(z))
+    return translate, rotate, tuple(scale)
+
+
+def circleCvs(degree, sections):
+    """
+    Control vertices of a periodic unit circle around the z axis, like makeNurbsCircle makes with radius 1. Last degree
+    cvs repeat the first ones.
+    """
+    # cubic cvs sit further out, so the curve itself passes through radius 1
+    scale = 6.0 / (4.0 + 2.0 * math.cos(2.0 * math.pi / sections)) if degree == 3 else 1.0
+    cvs = []
+    for i in range(sections):
+        angle = 2.0 * math.pi * (i + 0.5) / sections
+        cvs.append((math.cos(angle) * scale, math.sin(angle) * scale, 0.0))
+    return cvs + cvs[:degree]
+
+
+def periodicKnots(cvCount, degree):
+    # uniform knot vector of a periodic curve
+    return [float(i) for i in range(-(degree - 1), cvCount)]
+
+
+def alignZ(normal):
+    """
+    Returns rows of a rotation matrix turning the z axis to normal. Zero normal keeps z.
+    """
+    length = math.sqrt(sum(v * v for v in normal))
+    if length < 1e-9:
+        return ((1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0))
+    x, y, z = [v / length for v in normal]
+    if z < -1.0 + 1e-9:
+        # opposite direction, half turn around x
+        return ((1.0, 0.0, 0.0), (0.0, -1.0, 0.0), (0.0, 0.0, -1.0))
+    # Rodrigues rotation from (0, 0, 1) to (x, y, z), written for row vectors
+    k = 1.0 / (1.0 + z)
+    return ((1.0 - x * x * k, -x * y * k, -x),
+            (-x * y * k, 1.0 - y * y * k, -y),
+            (x, y, z))
+
+
+def transformCvs(cvs, radius, normal, offset):
+    """
+    Scales cvs by radius, turns them from z to normal and moves them by offset. Returns list of tuples.
+    """
+    rows = alignZ(normal)
+    ox, oy, oz = offset
+    result = []
+    for px, py, pz in cvs:
+        px, py, pz = px * radius, py * radius, pz * radius
+        result.append((px * rows[0][0] + py * rows[1][0] + pz * rows[2][0] + ox,
+                       px * rows[0][1] + py * rows[1][1] + pz * rows[2][1] + oy,
+                       px * rows[0][2] + py * rows[1][2] + pz * rows[2][2] + oz))
+    return result
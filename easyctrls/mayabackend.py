@@ -0,0 +1,574 @@
+"""
+Maya implementation of backend.SceneBackend, using maya.cmds and OpenMaya 2.0.
+"""
+import logging
+import os
+from array import array
+
+from maya import cmds
+from maya.api import OpenMaya as om2
+
+from easyctrls import backend
+
+# plugin with the undoable command that executes OpenMaya modifiers, see undoplugin
+PLUGINPATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'undoplugin.py')
+# modifiers handed to the command by MayaBackend._execute()
+PENDINGMODIFIERS = []
+
+log = logging.getLogger(__name__)
+
+
+def _setPlugValues(modifier, node, attr, values, angle=False):
+    # queue values for compound attribute children (translate, rotate, normal...) on the modifier.
+    plug = om2.MFnDependencyNode(node).findPlug(attr, False)
+    for i, value in enumerate(values):
+        if angle:
+            modifier.newPlugValueMAngle(plug.child(i), om2.MAngle(value))
+        else:
+            modifier.newPlugValueDouble(plug.child(i), value)
+
+
+def _batchParts(obj):
+    # string attributes written by writeBatchData(), data_<part>
+    node = om2.MFnDependencyNode(obj)
+    parts = {}
+    for i in range(node.attributeCount()):
+        attr = om2.MFnAttribute(node.attribute(i))
+        if attr.name.startswith('data_'):
+            parts[attr.name[5:]] = node.findPlug(attr.name, False).asString()
+    return parts
+
+
+class MayaBackend(backend.SceneBackend):
+    """
+    Scene backend for a running Maya session. Handles are node UUIDs, resolved through cached MObjectHandles, so
+    renaming or reparenting nodes doesn't lose them.
+    """
+
+    def __init__(self):
+        super(MayaBackend, self).__init__()
+        self.handles = {}
+        self.chunkName = None
+        self.chunkUndo = False
+        self.chunkWrites = 0
+        self.chunkModifiers = []
+        if not cmds.pluginInfo(PLUGINPATH, query=True, loaded=True):
+            cmds.loadPlugin(PLUGINPATH, quiet=True)
+
+    def _register(self, obj):
+        # cache MObjectHandle of obj and return its UUID
+        uuid = om2.MFnDependencyNode(obj).uuid().asString()
+        self.handles[uuid] = om2.MObjectHandle(obj)
+        return uuid
+
+    def _object(self, handle):
+        cached = self.handles.get(handle)
+        if cached is None or not cached.isValid():
+            selList = om2.MSelectionList()
+            selList.add(cmds.ls(handle, long=True)[0])
+            cached = om2.MObjectHandle(selList.getDependNode(0))
+            self.handles[handle] = cached
+        return cached.object()
+
+    def _path(self, handle):
+        # full DAG path for DAG nodes, name for others
+        obj = self._object(handle)
+        if obj.hasFn(om2.MFn.kDagNode):
+            return om2.MDagPath.getAPathTo(obj).fullPathName()
+        return om2.MFnDependencyNode(obj).name()
+
+    def _paths(self, handles):
+        return [self._path(handle) for handle in handles]
+
+    def _execute(self, *modifiers):
+        # modifiers executed straight from here are not undoable, the plugin command executes them and keeps them
+        # on Mayas undo queue, inside the open chunk
+        PENDINGMODIFIERS[:] = modifiers
+        try:
+            cmds.easyCtrlsModifiers()
+        finally:
+            del PENDINGMODIFIERS[:]
+        if self.transaction is not None:
+            # kept for rollbackChunk(), in case the chunk can't be undone
+            self.chunkModifiers.extend(modifiers)
+
+    def openScene(self, path):
+        cmds.file(path, open=True, force=True)
+        self.handles = {}
+
+    def saveScene(self, path):
+        cmds.file(rename=path)
+        cmds.file(save=True, force=True, type='mayaAscii' if path.lower().endswith('.ma') else 'mayaBinary')
+
+    def openChunk(self, name):
+        self.chunkName = name
+        self.chunkUndo = cmds.undoInfo(q=True, state=True)
+        self.chunkWrites = self.writes
+        self.chunkModifiers = []
+        cmds.undoInfo(openChunk=True, chunkName=name)
+
+    def closeChunk(self):
+        cmds.undoInfo(closeChunk=True)
+
+    def rollbackChunk(self):
+        # commands and modifiers were recorded into our chunk, if undo was on and it is the last item in the queue.
+        # Empty chunks are dropped, nothing to roll back then.
+        modifiers, self.chunkModifiers = self.chunkModifiers, []
+        if self.writes == self.chunkWrites:
+            return
+        if self.chunkUndo and cmds.undoInfo(q=True, undoName=True) == self.chunkName:
+            cmds.undo()
+            return
+        # otherwise the modifiers are undone by themselves, edits made with commands can't be taken back
+        for modifier in reversed(modifiers):
+            modifier.undoIt()
+        log.warning('%s could not be undone, undo is off or its chunk is not the last undo item. %d modifiers were '
+                    'rolled back, edits made with Maya commands stay in the scene.', self.chunkName, len(modifiers))
+
+    def suspendRefresh(self, on):
+        # viewport only, the dependency graph keeps evaluating for reads inside transactions, see SceneBackend
+        cmds.refresh(suspend=on)
+
+    @backend.read
+    def selection(self):
+        selList = om2.MGlobal.getActiveSelectionList()
+        return [self._register(selList.getDependNode(i)) for i in range(selList.length())]
+
+    @backend.read
+    def findNodes(self, pattern):
+        # ls gives joints too, they are transforms
+        selList = om2.MSelectionList()
+        for path in cmds.ls(pattern, type='transform', long=True) or []:
+            selList.add(path)
+        return [self._register(selList.getDependNode(i)) for i in range(selList.length())]
+
+    @backend.read
+    def nearestAncestors(self, handles, among):
+        # nearest ancestor of every node walked through, keyed by MObjectHandle hash, so walks stop where others passed
+        nearest = {}
+        result = []
+        for handle in handles:
+            walked = []
+            found = None
+            parent = om2.MFnDagNode(self._object(handle)).parent(0)
+            while not parent.hasFn(om2.MFn.kWorld):
+                uuid = om2.MFnDependencyNode(parent).uuid().asString()
+                if uuid in among:
+                    found = uuid
+                    break
+                key = om2.MObjectHandle(parent).hashCode()
+                if key in nearest:
+                    found = nearest[key]
+                    break
+                walked.append(key)
+                parent = om2.MFnDagNode(parent).parent(0)
+            nearest.update(dict.fromkeys(walked, found))
+            result.append(found)
+        return result
+
+    @backend.read
+    def existingNames(self):
+        # ls gives partial paths for DAG names that aren't unique, the short name is the last part
+        return set(path.rpartition('|')[2] for path in cmds.ls())
+
+    @backend.read
+    def nodeNames(self, handles):
+        return [om2.MFnDependencyNode(self._object(handle)).name() for handle in handles]
+
+    @backend.read
+    def getAttr(self, handles, attr):
+        values = []
+        for path in self._paths(handles):
+            value = cmds.getAttr('%s.%s' % (path, attr))
+            # compound attributes come as [(x, y, z)]
+            values.append(value[0] if isinstance(value, list) else value)
+        return values
+
+    @backend.read
+    def getAttrArray(self, handles, attrs):
+        values = array('d')
+        for handle in handles:
+            node = om2.MFnDependencyNode(self._object(handle))
+            for attr in attrs:
+                plug = node.findPlug(attr, False)
+                for i in range(plug.numChildren()):
+                    child = plug.child(i)
+                    # angles are stored in radians, getAttr gives degrees
+                    if child.attribute().apiType() == om2.MFn.kDoubleAngleAttribute:
+                        values.append(child.asMAngle().asDegrees())
+                    else:
+                        values.append(child.asDouble())
+        return values
+
+    @backend.read
+    def worldPositions(self, handles):
+        positions = []
+        for handle in handles:
+            matrix = om2.MDagPath.getAPathTo(self._object(handle)).inclusiveMatrix()
+            positions.append((matrix[12], matrix[13], matrix[14]))
+        return positions
+
+    @backend.read
+    def worldMatrices(self, handles):
+        matrices = []
+        for handle in handles:
+            matrix = om2.MDagPath.getAPathTo(self._object(handle)).inclusiveMatrix()
+            matrices.append(tuple(tuple(matrix.getElement(row, column) for column in range(4)) for row in range(4)))
+        return matrices
+
+    @backend.read
+    def cvCounts(self, shapes):
+        return [om2.MFnNurbsCurve(om2.MDagPath.getAPathTo(self._object(shape))).numCVs for shape in shapes]
+
+    @backend.read
+    def getCvs(self, shapes):
+        # one ranged getAttr per shape, tweaks that were never set come as zeros
+        cvLists = []
+        for shape in shapes:
+            dagPath = om2.MDagPath.getAPathTo(self._object(shape))
+            count = om2.MFnNurbsCurve(dagPath).numCVs
+            cvLists.append(cmds.getAttr('%s.controlPoints[0:%d]' % (dagPath.fullPathName(), count - 1)))
+        return cvLists
+
+    @backend.read
+    def findBatchData(self, name):
+        selList = om2.MSelectionList()
+        try:
+            selList.add(name)
+        except RuntimeError:
+            return None, {}
+        obj = selList.getDependNode(0)
+        return self._register(obj), _batchParts(obj)
+
+    @backend.read
+    def listBatchData(self, prefix):
+        names = cmds.ls(prefix + '*', type='network') or []
+        if not names:
+            return []
+        selList = om2.MSelectionList()
+        for name in names:
+            selList.add(name)
+        result = []
+        for i, name in enumerate(names):
+            obj = selList.getDependNode(i)
+            if om2.MFnDependencyNode(obj).hasAttribute(backend.BATCHTAG) or name == prefix:
+                result.append((name, self._register(obj), _batchParts(obj)))
+        return result
+
+    @backend.write
+    def createControls(self, items, names, degree, sections, engine='api', shape=None, parents=None, parentCtrls=()):
+        if parents is None:
+            parents = [-1] * len(items)
+        if engine == 'api':
+            return self._createControlsApi(items, names, degree, sections, shape, parents, parentCtrls)
+        return self._createControlsCommands(items, names, degree, sections, shape, parents, parentCtrls)
+
+    def _createControlsApi(self, items, names, degree, sections, shape, parents, parentCtrls):
+        """
+        Every group, curve, history node, connection and attribute value is queued in one MDGModifier and one
+        MDagModifier, executed by one undoable easyCtrlsModifiers command, so creation is one step of Mayas undo.
+        Groups get their transformation straight from the items world matrix, so no temporary constraints are needed.
+        Groups under a parent control get the items world matrix relative to the parents item, which is where the
+        parent control sits. Without history, every curve gets the geometry of shape, made once, as its cached value.
+        """
+        dgMod = om2.MDGModifier()
+        dagMod = om2.MDagModifier()
+        created = []
+        worlds = []
+        if shape is not None:
+            # geometry is made once and copied into every curve
+            form = om2.MFnNurbsCurve.kPeriodic if shape.periodic else om2.MFnNurbsCurve.kOpen
+            geometry = om2.MFnNurbsCurveData().create()
+            om2.MFnNurbsCurve().create(om2.MPointArray([om2.MPoint(cv) for cv in shape.cvs]),
+                                       om2.MDoubleArray(shape.knots), shape.degree, form, False, False, geometry)
+        for item, (groupName, ctrlName), parent in zip(items, names, parents):
+            world = om2.MDagPath.getAPathTo(self._object(item)).inclusiveMatrix()
+            worlds.append(world)
+            parentCtrl = None
+            if parent >= len(parentCtrls):
+                # control made earlier in this loop, not in the scene before doIt()
+                parentCtrl = created[parent - len(parentCtrls)][0]
+                world = world * worlds[parent - len(parentCtrls)].inverse()
+            elif parent >= 0:
+                parentCtrl = self._object(parentCtrls[parent])
+                world = world * om2.MDagPath.getAPathTo(parentCtrl).inclusiveMatrix().inverse()
+            # decompose items world matrix into group translate, rotate and scale (what matchTransform does)
+            matrix = om2.MTransformationMatrix(world)
+            rotation = matrix.rotation()
+
+            ctrlGrp = dagMod.createNode('transform')
+            dagMod.renameNode(ctrlGrp, groupName)
+            if parentCtrl is not None:
+                dagMod.reparentNode(ctrlGrp, parentCtrl)
+            _setPlugValues(dagMod, ctrlGrp, 'translate', matrix.translation(om2.MSpace.kWorld))
+            _setPlugValues(dagMod, ctrlGrp, 'rotate', (rotation.x, rotation.y, rotation.z), angle=True)
+            _setPlugValues(dagMod, ctrlGrp, 'scale', matrix.scale(om2.MSpace.kWorld))
+
+            # names are free in the scene (see naming.NameReserver), so Maya keeps them as given
+            ctrl = dagMod.createNode('transform')
+            dagMod.renameNode(ctrl, ctrlName)
+            dagMod.reparentNode(ctrl, ctrlGrp)
+            ctrlFn = om2.MFnDependencyNode(ctrl)
+            dagMod.newPlugValueBool(ctrlFn.findPlug('overrideEnabled', False), True)
+            dagMod.newPlugValueBool(ctrlFn.findPlug('overrideRGBColors', False), True)
+            curve = dagMod.createNode('nurbsCurve', ctrl)
+            dagMod.renameNode(curve, ctrlName + "Shape")
+            if shape is not None:
+                dagMod.newPlugValue(om2.MFnDependencyNode(curve).findPlug('cached', False), geometry)
+                created.append([ctrl, curve, None, ctrlGrp])
+                continue
+
+            constructor = dgMod.createNode('makeNurbsCircle')
+            conFn = om2.MFnDependencyNode(constructor)
+            dgMod.newPlugValueDouble(conFn.findPlug('radius', False), 0.5)
+            dgMod.newPlugValueInt(conFn.findPlug('degree', False), degree)
+            dgMod.newPlugValueInt(conFn.findPlug('sections', False), sections)
+            _setPlugValues(dgMod, constructor, 'normal', (0, 0, 0))
+            dagMod.connect(conFn.findPlug('outputCurve', False),
+                           om2.MFnDependencyNode(curve).findPlug('create', False))
+            created.append([ctrl, curve, constructor, ctrlGrp])
+
+        # history nodes first, the curves connect to them
+        self._execute(dgMod, dagMod)
+
+        result = ([], [], [], [])
+        for nodes in created:
+            for handles, node in zip(result, nodes):
+                if node is not None:
+                    handles.append(self._register(node))
+        return result
+
+    def _createControlsCommands(self, items, names, degree, sections, shape, parents, parentCtrls):
+        """
+        Original creation path. Makes group, circle, temporary constraints and parenting one command at a time for
+        each item. Slower than the api engine, kept as reference and fallback. Without history the curve is made from
+        shape with one curve command.
+        """
+        result = ([], [], [], [])
+        for path, (groupName, ctrlName), parent in zip(self._paths(items), names, parents):
+            # create a group for controls
+            ctrlGrp = cmds.group(n=groupName, em=True)
+            if shape is None:
+                ctrl, constructor = cmds.circle(name=ctrlName, c=(0, 0, 0), nr=(0, 0, 0), sw=360, r=0.5,
+                                                d=degree, ut=0, tol=0.01, s=sections, ch=1)
+            else:
+                ctrl = cmds.curve(name=ctrlName, degree=shape.degree, point=shape.cvs, knot=shape.knots,
+                                  periodic=shape.periodic)
+                constructor = None
+            '''
+            This is for constructing 'boomerang':
+                ctrl, constructor = cmds.circle(name=(name + "_ctrl"), c=(0, 0, 0), nr=(0, 0, 0), sw=360, r=0.5,
+                                                d=3, ut=0, tol=0.01, s=8, ch=1)
+                cmds.move(0, 0.2, 0, ctrl + ".cv[1]", r=True)
+                cmds.move(0, 0.45, 0, ctrl + ".cv[4:6]", r=True)
+                cmds.move(0, 0.5, 0, ctrl + ".cv[5]", r=True)
+            '''
+            cmds.setAttr(ctrl + '.overrideEnabled', 1)
+            cmds.setAttr(ctrl + '.overrideRGBColors', 1)
+            cmds.matchTransform(ctrlGrp, path)
+            if parent >= 0:
+                # parent keeps the matched world transformation
+                parentCtrl = parentCtrls[parent] if parent < len(parentCtrls) else result[0][parent - len(parentCtrls)]
+                ctrlGrp = cmds.parent(ctrlGrp, self._path(parentCtrl))[0]
+            cmds.pointConstraint(ctrlGrp, ctrl)
+            cmds.orientConstraint(ctrlGrp, ctrl)
+            # delete constraints
+            cmds.delete(ctrl, cn=True)
+            ctrl = cmds.parent(ctrl, ctrlGrp)[0]
+            # somehow ctrl is not scaled exactly 1, 1, 1 when created. So must do this manually.
+            cmds.setAttr(ctrl + '.scale', 1, 1, 1)
+            curve = cmds.listRelatives(ctrl, shapes=True, fullPath=True)[0]
+            for handles, node in zip(result, (ctrl, curve, constructor, ctrlGrp)):
+                if node is None:
+                    continue
+                selList = om2.MSelectionList()
+                selList.add(node)
+                handles.append(self._register(selList.getDependNode(0)))
+        return result
+
+    @backend.write
+    def createColorDrivers(self, names):
+        drivers = []
+        for name in names:
+            node = cmds.createNode('network', name=name)
+            cmds.addAttr(node, longName='color', attributeType='float3', usedAsColor=True)
+            for axis in 'RGB':
+                cmds.addAttr(node, longName='color' + axis, attributeType='float', parent='color')
+            selList = om2.MSelectionList()
+            selList.add(node)
+            drivers.append(self._register(selList.getDependNode(0)))
+        return drivers
+
+    @backend.write
+    def setAttr(self, handles, attr, values):
+        for path, value in zip(self._paths(handles), values):
+            if isinstance(value, (list, tuple)):
+                cmds.setAttr('%s.%s' % (path, attr), *value)
+            else:
+                cmds.setAttr('%s.%s' % (path, attr), value)
+
+    @backend.write
+    def setAttrs(self, handles, attrs, values):
+        # every value is queued on one modifier, executed by the undoable command like setAttrArray()
+        modifier = om2.MDGModifier()
+        for handle, nodeValues in zip(handles, values):
+            node = om2.MFnDependencyNode(self._object(handle))
+            for attr, value in zip(attrs, nodeValues):
+                plug = node.findPlug(attr, False)
+                if plug.isCompound:
+                    for c, child in enumerate(value):
+                        modifier.newPlugValueDouble(plug.child(c), child)
+                else:
+                    modifier.newPlugValueDouble(plug, value)
+        self._execute(modifier)
+
+    @backend.write
+    def setAttrArray(self, handles, attrs, values):
+        # every value is queued on one modifier, executed by the undoable command like the api engine
+        modifier = om2.MDGModifier()
+        i = 0
+        for handle in handles:
+            node = om2.MFnDependencyNode(self._object(handle))
+            for attr in attrs:
+                plug = node.findPlug(attr, False)
+                for c in range(plug.numChildren()):
+                    child = plug.child(c)
+                    if child.attribute().apiType() == om2.MFn.kDoubleAngleAttribute:
+                        modifier.newPlugValueMAngle(child, om2.MAngle(values[i], om2.MAngle.kDegrees))
+                    else:
+                        modifier.newPlugValueDouble(child, values[i])
+                    i += 1
+        self._execute(modifier)
+
+    @backend.write
+    def setCvOffsets(self, shapes, cvCounts, offset):
+        # controls keep their history, so offsets are tweaks on controlPoints. All cvs and axes of a shape are
+        # written with one ranged setAttr.
+        offset = tuple(offset)
+        for path, count in zip(self._paths(shapes), cvCounts):
+            cmds.setAttr('%s.controlPoints[0:%d]' % (path, count - 1), *(offset * count))
+
+    @backend.write
+    def setCvPositions(self, shapes, cvs):
+        # shapes without history, so controlPoints are the cvs themselves. One ranged setAttr per shape.
+        values = [value for cv in cvs for value in cv]
+        for path in self._paths(shapes):
+            cmds.setAttr('%s.controlPoints[0:%d]' % (path, len(cvs) - 1), *values)
+
+    @backend.write
+    def setCvLists(self, shapes, cvLists):
+        # one ranged setAttr per shape, like setCvPositions()
+        for path, cvs in zip(self._paths(shapes), cvLists):
+            values = [value for cv in cvs for value in cv]
+            cmds.setAttr('%s.controlPoints[0:%d]' % (path, len(cvs) - 1), *values)
+
+    @backend.write
+    def connectAttrs(self, sources, targets, attr, targetAttr=None):
+        targetAttr = targetAttr or attr
+        for source, target in zip(self._paths(sources), self._paths(targets)):
+            cmds.connectAttr('%s.%s' % (source, attr), '%s.%s' % (target, targetAttr), force=True)
+
+    @backend.write
+    def disconnectAttrs(self, sources, targets, attr, targetAttr=None):
+        targetAttr = targetAttr or attr
+        for source, target in zip(self._paths(sources), self._paths(targets)):
+            sourcePlug = '%s.%s' % (source, attr)
+            targetPlug = '%s.%s' % (target, targetAttr)
+            if cmds.isConnected(sourcePlug, targetPlug):
+                cmds.disconnectAttr(sourcePlug, targetPlug)
+
+    @backend.write
+    def constrain(self, kind, drivers, targets, maintainOffsets):
+        command = getattr(cmds, kind + 'Constraint')
+        constraints = []
+        for driver, target, maintainOffset in zip(self._paths(drivers), self._paths(targets), maintainOffsets):
+            constraint = command(driver, target, maintainOffset=maintainOffset)[0]
+            selList = om2.MSelectionList()
+            selList.add(constraint)
+            constraints.append(self._register(selList.getDependNode(0)))
+        return constraints
+
+    @backend.write
+    def matrixConstrain(self, drivers, targets, maintainOffsets):
+        nodes = []
+        for driver, target, maintainOffset in zip(self._paths(drivers), self._paths(targets), maintainOffsets):
+            offset = om2.MMatrix()
+            if maintainOffset:
+                offset = (om2.MMatrix(cmds.getAttr(target + '.worldMatrix[0]')) *
+                          om2.MMatrix(cmds.getAttr(driver + '.worldInverseMatrix[0]')))
+            name = target.split('|')[-1]
+            mult = cmds.createNode('multMatrix', name=name + '_multMatrix')
+            cmds.connectAttr(driver + '.worldMatrix[0]', mult + '.matrixIn[1]')
+            cmds.connectAttr(target + '.parentInverseMatrix[0]', mult + '.matrixIn[2]')
+            if cmds.attributeQuery('offsetParentMatrix', node=target, exists=True):
+                # zero own values, what is left of local matrix (joint orient) is cancelled in the offset
+                cmds.setAttr(target + '.translate', 0, 0, 0)
+                cmds.setAttr(target + '.rotate', 0, 0, 0)
+                cmds.setAttr(target + '.scale', 1, 1, 1)
+                rest = om2.MMatrix(cmds.getAttr(target + '.matrix'))
+                cmds.setAttr(mult + '.matrixIn[0]', list(rest.inverse() * offset), type='matrix')
+                cmds.connectAttr(mult + '.matrixSum', target + '.offsetParentMatrix', force=True)
+                made = [mult]
+            else:
+                # before Maya 2020, joint orient is not compensated here
+                cmds.setAttr(mult + '.matrixIn[0]', list(offset), type='matrix')
+                decompose = cmds.createNode('decomposeMatrix', name=name + '_decomposeMatrix')
+                cmds.connectAttr(mult + '.matrixSum', decompose + '.inputMatrix')
+                for attr in ('translate', 'rotate', 'scale'):
+                    cmds.connectAttr('%s.output%s' % (decompose, attr.capitalize()), '%s.%s' % (target, attr),
+                                     force=True)
+                made = [mult, decompose]
+            for node in made:
+                selList = om2.MSelectionList()
+                selList.add(node)
+                nodes.append(self._register(selList.getDependNode(0)))
+        return nodes
+
+    @backend.write
+    def matrixRelease(self, targets, nodes):
+        self._delete(nodes)
+        for path in self._paths(targets):
+            if cmds.attributeQuery('offsetParentMatrix', node=path, exists=True):
+                cmds.setAttr(path + '.offsetParentMatrix', list(om2.MMatrix()), type='matrix')
+
+    @backend.write
+    def writeBatchData(self, node, name, parts):
+        if node is None:
+            path = cmds.createNode('network', name=name)
+            cmds.addAttr(path, longName=backend.BATCHTAG, attributeType='bool', defaultValue=True)
+        else:
+            path = self._path(node)
+        for part, data in parts.items():
+            attr = 'data_' + part
+            if not cmds.attributeQuery(attr, node=path, exists=True):
+                cmds.addAttr(path, longName=attr, dataType='string')
+            cmds.setAttr('%s.%s' % (path, attr), data, type='string')
+        if node is None:
+            selList = om2.MSelectionList()
+            selList.add(path)
+            node = self._register(selList.getDependNode(0))
+        return node
+
+    @backend.write
+    def delete(self, handles):
+        self._delete(handles)
+
+    def _delete(self, handles):
+        paths = []
+        for handle in handles:
+            try:
+                paths.append(self._path(handle))
+            except IndexError:
+                # already deleted
+                pass
+        if paths:
+            cmds.delete(paths)
+
+    @backend.write
+    def deleteHistory(self, handles):
+        if handles:
+            cmds.delete(self._paths(handles), constructionHistory=True)
+
+    @backend.write
+    def clearSelection(self):
+        cmds.select(clear=True)
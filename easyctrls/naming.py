@@ -0,0 +1,70 @@
+"""
+Names of made groups and controls. Names come from templates with tokens in str.format() syntax and are checked
+against a snapshot of the scene names taken once per batch, so every name handed to the backend is free and Maya never
+renames a node on creation. The same items in the same scene get the same names every run.
+"""
+import string
+
+# tokens a template can use. name: item short name without namespace, namespace: items namespace with its colon
+# ('' outside namespaces), side: 'L', 'M' or 'R', index: index of the control in its batch, shape: library shape name
+TOKENS = ('name', 'namespace', 'side', 'index', 'shape')
+DEFAULTGROUPTEMPLATE = '{namespace}{name}_ctrl_grp'
+DEFAULTCTRLTEMPLATE = '{namespace}{name}_ctrl'
+
+
+def templateTokens(template):
+    """
+    Returns set of TOKENS template uses. Raises ValueError for other fields and broken templates.
+    """
+    try:
+        fields = set(field for _, field, _, _ in string.Formatter().parse(template) if field is not None)
+    except ValueError as error:
+        raise ValueError('Broken name template %r: %s' % (template, error))
+    unknown = sorted(fields - set(TOKENS))
+    if unknown:
+        raise ValueError('Unknown tokens %s in name template %r, expected any of %s' % (
+            ', '.join(unknown), template, ', '.join(TOKENS)))
+    return fields
+
+
+def splitNamespace(name):
+    """
+    Returns tuple of namespace with its colon ('' if none) and short name of name.
+    """
+    namespace, _, short = name.rpartition(':')
+    return (namespace + ':' if namespace else ''), short
+
+
+class NameReserver(object):
+    """
+    Hands out group and control names no node of the scene has, and remembers them, so names given within one batch
+    don't clash with each other either. A taken pair gets the lowest number free for group, control and shape,
+    appended to each like Maya numbers clashing names (jnt_ctrl_grp1, jnt_ctrl1, jnt_ctrl1Shape).
+    ---
+    taken: Set of names in use.
+    """
+
+    def __init__(self, taken):
+        """
+        Args:
+            taken: Iterable of names in the scene, see backend.existingNames().
+        """
+        self.taken = set(taken)
+        # last number given per pair, so thousands of clashes don't rescan from 1
+        self.counters = {}
+
+    def reserve(self, group, ctrl):
+        """
+        Returns tuple of free group and control names for wanted names group and ctrl. The control shape gets the
+        control name with 'Shape' appended, which is reserved too.
+        """
+        taken = self.taken
+        names = (group, ctrl, ctrl + 'Shape')
+        if any(name in taken for name in names):
+            i = self.counters.get(names, 1)
+            while any('%s%d' % (name, i) in taken for name in names[:2]) or '%s%dShape' % (ctrl, i) in taken:
+                i += 1
+            self.counters[names] = i + 1
+            names = ('%s%d' % (group, i), '%s%d' % (ctrl, i), '%s%dShape' % (ctrl, i))
+        taken.update(names)
+        return names[:2]
@@ -0,0 +1,182 @@
+"""
+Control shape library. Shapes are kept as cv, knot and degree arrays in a small binary file, which is memory-mapped.
+Only the index is read on load, so the UI can list shapes without parsing them. Shapes are parsed on first use and
+cached.
+
+File layout, little-endian:
+    header: magic b'ECSL', version (uint16), shape count (uint16), index offset (uint32)
+    index: for each shape name (32 bytes utf-8, zero padded), degree (uint8), periodic (uint8), cv count (uint16),
+           knot count (uint16), data offset (uint32)
+    data: for each shape cv count * 3 float32 (x, y, z), then knot count float32
+
+Rebuild the default library from builtinShapes() with:
+
+python -m easyctrls.shapelib easyctrls/shapes.ecsl
+"""
+import argparse
+import collections
+import math
+import mmap
+import os
+import struct
+import sys
+
+from easyctrls import mathutils
+
+MAGIC = b'ECSL'
+VERSION = 1
+HEADER = struct.Struct('<4sHHI')
+ENTRY = struct.Struct('<32sBBHHI')
+DEFAULTPATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'shapes.ecsl')
+
+# cvs: tuple of (x, y, z) tuples, periodic curves repeat their first degree cvs at the end.
+Shape = collections.namedtuple('Shape', 'name degree periodic cvs knots')
+
+
+def openKnots(cvCount, degree):
+    # knot vector of an open curve, ends pinned to first and last cv
+    spans = cvCount - degree
+    return [0.0] * (degree - 1) + [float(i) for i in range(spans + 1)] + [float(spans)] * (degree - 1)
+
+
+def makeShape(name, points, degree=1, periodic=True):
+    """
+    Makes a Shape from points. For periodic shapes the first degree points are repeated at the end.
+    """
+    points = [tuple(float(v) for v in point) for point in points]
+    if periodic:
+        cvs = points + points[:degree]
+        knots = mathutils.periodicKnots(len(cvs), degree)
+    else:
+        cvs = points
+        knots = openKnots(len(cvs), degree)
+    return Shape(name, degree, periodic, tuple(cvs), tuple(knots))
+
+
+def _boomerang():
+    # circle with cvs moved, what the old commented out 'boomerang' did to a circle of radius 0.5
+    points = [list(cv) for cv in mathutils.circleCvs(3, 8)[:8]]
+    for index, move in ((1, 0.4), (4, 0.9), (5, 1.9), (6, 0.9)):
+        points[index][1] += move
+    return makeShape('boomerang', points, degree=3)
+
+
+def _polygon(name, sections):
+    return makeShape(name, mathutils.circleCvs(1, sections)[:sections])
+
+
+def builtinShapes():
+    """
+    Returns list of Shapes the default library is built from. All are about 1 unit in radius around the z axis.
+    """
+    half = 1 / 3.0
+    return [makeShape('circle', mathutils.circleCvs(3, 8)[:8], degree=3),
+            _polygon('square', 4),
+            _polygon('triangle', 3),
+            _polygon('hexagon', 6),
+            makeShape('diamond', [(1, 0, 0), (0, 1, 0), (-1, 0, 0), (0, -1, 0)]),
+            makeShape('cross', [(half, 1, 0), (-half, 1, 0), (-half, half, 0), (-1, half, 0), (-1, -half, 0),
+                                (-half, -half, 0), (-half, -1, 0), (half, -1, 0), (half, -half, 0), (1, -half, 0),
+                                (1, half, 0), (half, half, 0)]),
+            makeShape('arrow', [(0, 1, 0), (-0.6, 0.2, 0), (-0.25, 0.2, 0), (-0.25, -1, 0), (0.25, -1, 0),
+                                (0.25, 0.2, 0), (0.6, 0.2, 0)]),
+            makeShape('cube', [(-1, 1, 1), (1, 1, 1), (1, 1, -1), (-1, 1, -1), (-1, 1, 1), (-1, -1, 1),
+                               (1, -1, 1), (1, 1, 1), (1, -1, 1), (1, -1, -1), (1, 1, -1), (1, -1, -1),
+                               (-1, -1, -1), (-1, 1, -1), (-1, -1, -1), (-1, -1, 1)], periodic=False),
+            # line with a small loop on top
+            makeShape('pin', [(0, 0, 0), (0, 1, 0)] +
+                      [(0.2 * math.sin(i * math.pi / 4), 1.2 - 0.2 * math.cos(i * math.pi / 4), 0)
+                       for i in range(1, 9)], periodic=False),
+            _boomerang()]
+
+
+def writeLibrary(path, shapes):
+    """
+    Writes shapes into a library file at path.
+    """
+    offset = HEADER.size + ENTRY.size * len(shapes)
+    index = []
+    data = []
+    for shape in shapes:
+        name = shape.name.encode('utf-8')
+        if len(name) > 32:
+            raise ValueError('Shape name longer than 32 bytes: %s' % shape.name)
+        index.append(ENTRY.pack(name, shape.degree, int(shape.periodic), len(shape.cvs), len(shape.knots), offset))
+        values = [v for cv in shape.cvs for v in cv] + list(shape.knots)
+        data.append(struct.pack('<%df' % len(values), *values))
+        offset += len(data[-1])
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(shapes), HEADER.size))
+        f.write(b''.join(index))
+        f.write(b''.join(data))
+
+
+class ShapeLibrary(object):
+    """
+    Read access to a library file. The file is memory-mapped, names come from the index and each shape is unpacked
+    once, when first asked for.
+    """
+
+    def __init__(self, path=DEFAULTPATH):
+        self.path = path
+        self.entries = collections.OrderedDict()
+        self.cache = {}
+        with open(path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, indexOffset = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC:
+            raise ValueError('Not a control shape library: %s' % path)
+        if version > VERSION:
+            raise ValueError('Shape library %s is version %d, newest supported is %d' % (path, version, VERSION))
+        for i in range(count):
+            entry = ENTRY.unpack_from(self.data, indexOffset + i * ENTRY.size)
+            self.entries[entry[0].rstrip(b'\0').decode('utf-8')] = entry[1:]
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def names(self):
+        return list(self.entries)
+
+    def shape(self, name):
+        """
+        Returns Shape of given name, parsed and cached on first call.
+        """
+        shape = self.cache.get(name)
+        if shape is None:
+            degree, periodic, cvCount, knotCount, offset = self.entries[name]
+            values = struct.unpack_from('<%df' % (cvCount * 3 + knotCount), self.data, offset)
+            cvs = tuple(values[i:i + 3] for i in range(0, cvCount * 3, 3))
+            shape = Shape(name, degree, bool(periodic), cvs, values[cvCount * 3:])
+            self.cache[name] = shape
+        return shape
+
+    def close(self):
+        self.data.close()
+
+
+_LIBRARY = None
+
+
+def library():
+    """
+    Returns the default ShapeLibrary, opened on first call.
+    """
+    global _LIBRARY
+    if _LIBRARY is None:
+        _LIBRARY = ShapeLibrary()
+    return _LIBRARY
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Writes the shapes of builtinShapes() to a library file.')
+    parser.add_argument('output', help='Library file to write, %s is the default library.' % DEFAULTPATH)
+    args = parser.parse_args(args)
+    shapes = builtinShapes()
+    writeLibrary(args.output, shapes)
+    print('Wrote %d shapes to %s' % (len(shapes), args.output))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""
+Recording of UI actions, with time and scene reads and writes of each. Records export as Chrome trace-event JSON, which
+opens in chrome://tracing or Perfetto.
+"""
+import json
+import os
+import threading
+import time
+
+# record from the start, e.g. to catch a slow session from an artist
+ENABLEDBYDEFAULT = os.environ.get('EASYCTRLS_TRACE', '') not in ('', '0')
+
+
+class Tracer(object):
+    """
+    Keeps a list of complete ('X') trace events. Recording costs nothing but a flag check while enabled is False.
+    """
+
+    def __init__(self, enabled=ENABLEDBYDEFAULT):
+        self.enabled = enabled
+        self.events = []
+        self.origin = time.perf_counter()
+
+    def clear(self):
+        self.events = []
+
+    def begin(self, backend):
+        """
+        Returns snapshot of backend counters and time, to pass to end() when the action is done.
+        """
+        return time.perf_counter(), backend.calls.copy(), backend.reads, backend.writes
+
+    def end(self, name, snapshot, backend, size, params=()):
+        """
+        Adds one event for an action.
+        Args:
+            name: String. Action name.
+            snapshot: Tuple returned by begin().
+            backend: backend.SceneBackend the action used.
+            size: Integer. Amount of items the action worked on.
+            params: Arguments of the action, stored as strings.
+        """
+        end = time.perf_counter()
+        start, calls, reads, writes = snapshot
+        self.events.append({'name': name, 'cat': 'easyCtrls', 'ph': 'X', 'pid': os.getpid(),
+                            'tid': threading.get_ident(), 'ts': (start - self.origin) * 1e6,
+                            'dur': (end - start) * 1e6,
+                            'args': {'selection': size, 'params': [str(param) for param in params],
+                                     'calls': dict(backend.calls - calls), 'reads': backend.reads - reads,
+                                     'writes': backend.writes - writes}})
+
+    def stats(self):
+        """
+        Returns:
+            Dictionary. Action name: dictionary of count, total and max seconds, reads, writes and max selection.
+        """
+        stats = {}
+        for event in self.events:
+            stat = stats.setdefault(event['name'], {'count': 0, 'total': 0.0, 'max': 0.0, 'reads': 0, 'writes': 0,
+                                                    'selection': 0})
+            seconds = event['dur'] / 1e6
+            stat['count'] += 1
+            stat['total'] += seconds
+            stat['max'] = max(stat['max'], seconds)
+            stat['reads'] += event['args']['reads']
+            stat['writes'] += event['args']['writes']
+            stat['selection'] = max(stat['selection'], event['args']['selection'])
+        return stats
+
+    def export(self, path):
+        """
+        Writes recorded events into a Chrome trace-event JSON file.
+        """
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms'}, f)
+
+
+TRACER = Tracer()
@@ -0,0 +1,111 @@
+"""
+Transactions around bulk scene operations. Scene edits, write calls and time of every transaction are logged at debug
+level, enable with logging.getLogger('easyctrls').setLevel(logging.DEBUG) and a handler.
+"""
+import logging
+import time
+
+log = logging.getLogger(__name__)
+
+
+class Transaction(object):
+    """
+    Wraps one bulk operation into a single undo chunk of the backend, with refresh suspended. If an error is raised
+    inside, everything done so far is rolled back and the error re-raised.
+    Transactions opened inside another one join the outer one. Use as context manager or with open() and close().
+    A transaction that keeps refresh going, like one held open for a whole slider drag, still has refresh suspended
+    inside every transaction that joins it.
+    """
+
+    def __init__(self, backend, name, suspend=True):
+        """
+        Args:
+            backend: backend.SceneBackend to record edits on.
+            name: String. Undo chunk name, also used when logging.
+            suspend: Boolean. Suspend refresh while open.
+        """
+        self.backend = backend
+        self.name = name
+        self.suspend = suspend
+        # this transaction suspended refresh and resumes it on close
+        self.suspended = False
+        self.outer = None
+        self.writes = 0
+        self.edits = 0
+        self.start = 0
+        self.pending = []
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close(failed=excType is not None)
+        return False
+
+    def open(self):
+        if self.backend.transaction is not None:
+            self.outer = self.backend.transaction
+            for func in self.pending:
+                self.outer.atClose(func)
+            self.pending = []
+            self._suspendRefresh()
+            return
+        self.backend.transaction = self
+        self.writes = self.backend.writes
+        self.edits = self.backend.edits
+        self.start = time.perf_counter()
+        self.backend.openChunk(self.name)
+        self._suspendRefresh()
+
+    def _suspendRefresh(self):
+        if self.suspend and not self.backend.refreshSuspended:
+            self.backend.suspendRefresh(True)
+            self.backend.refreshSuspended = True
+            self.suspended = True
+
+    def _resumeRefresh(self):
+        if self.suspended:
+            self.backend.suspendRefresh(False)
+            self.backend.refreshSuspended = False
+            self.suspended = False
+
+    def atClose(self, func):
+        """
+        Runs func once, in the undo chunk just before the outermost transaction closes, unless it failed. For writes
+        that many nested operations would repeat, like storing state. Adding the same func again does nothing. Can be
+        called before open(), joining an outer transaction passes func on to it.
+        """
+        outermost = self.outer or self
+        if func not in outermost.pending:
+            outermost.pending.append(func)
+
+    def close(self, failed=False):
+        """
+        Closes undo chunk and resumes refresh. Rolls back if failed.
+        Args:
+            failed: Boolean. True when the operation raised an error.
+        """
+        if self.outer is not None:
+            self._resumeRefresh()
+            return
+        error = None
+        if not failed:
+            try:
+                for func in self.pending:
+                    func()
+            except Exception as e:
+                failed = True
+                error = e
+        self.pending = []
+        self.backend.transaction = None
+        self._resumeRefresh()
+        self.backend.closeChunk()
+        if failed:
+            self.backend.rollbackChunk()
+        writes = self.backend.writes - self.writes
+        if writes and log.isEnabledFor(logging.DEBUG):
+            log.debug('%s: %d scene edits in %d write calls in %.3f s%s', self.name, self.backend.edits - self.edits,
+                      writes, time.perf_counter() - self.start, ' (rolled back)' if failed else '')
+        if error is not None:
+            raise error
@@ -0,0 +1,850 @@
+"""
+Easy Ctrls window. Qt and Maya UI modules are imported here and nowhere else, and EasyCtrls_4 imports this module only
+when a window is first asked for, so scripts using the build logic never pay for them.
+"""
+import os
+from functools import partial, wraps
+
+from maya import cmds
+from maya import OpenMayaUI as omui
+from maya.api import OpenMaya as om2
+from PySide2 import QtWidgets, QtCore, QtGui
+from shiboken2 import wrapInstance, isValid
+
+from easyctrls import core, shapelib, trace
+from easyctrls.mayabackend import MayaBackend
+
+USERAPPDIR = cmds.internalVar(userAppDir=True)
+DIRECTORY = os.path.join(USERAPPDIR, '2023/prefs/icons')
+DEFAULTLCOL = core.DEFAULTLCOL
+DEFAULTMCOL = core.DEFAULTMCOL
+DEFAULTRCOL = core.DEFAULTRCOL
+# 'api' builds all controls in one OpenMaya modifier pass, 'commands' uses the original command per node path.
+DEFAULTENGINE = 'api'
+# drive colors of each side from one node, so recoloring is one write. Done bakes the colors and deletes the drivers.
+DEFAULTCOLORDRIVERS = False
+# keep makeNurbsCircle constructors until Done. Without history, shapes are edited directly and Done has nothing
+# to delete.
+DEFAULTHISTORY = True
+# dialog texts for connections that were not made, [what didn't match, what it should be]
+MISMATCHTEXTS = {'conT': ['Translations do not match', 'translate = 0, 0, 0'],
+                 'conR': ['Rotations do not match', 'rotation = 0, 0, 0'],
+                 'conS': ['Scale does not match', 'scale = 1, 1, 1']}
+# mismatches listed by name in one report, the rest are counted
+REPORTLINES = 20
+# selections bigger than this are created in slices with a progress dialog, see _ChunkRunner
+CHUNKTHRESHOLD = 500
+
+# shape button icons for the whole Maya session, shape name: QIcon, or None for shapes without an icon file
+_ICONS = {}
+# the one Easy Ctrls window, hidden between uses, see CtrlsUI()
+_WINDOW = None
+
+
+def _getMayaMainWindow():
+    # this is to set up parenting the UI to mayas main window
+    # get main window of maya (memory address)
+    win = omui.MQtUtil_mainWindow()
+    # pointer to wrapped instance
+    ptr = wrapInstance(int(win), QtWidgets.QMainWindow)
+    return ptr
+
+
+def _shapeIcon(name):
+    """
+    Returns QIcon of shape name, from an image named after it in DIRECTORY, or None if there is none. Each image is
+    read from disk once per session, windows built later use the cached icon.
+    """
+    if name not in _ICONS:
+        image = os.path.join(DIRECTORY, '%s.png' % name)
+        _ICONS[name] = QtGui.QIcon(QtGui.QPixmap(image)) if os.path.exists(image) else None
+    return _ICONS[name]
+
+
+def CtrlsUI(engine=DEFAULTENGINE, colorDrivers=DEFAULTCOLORDRIVERS, history=DEFAULTHISTORY):
+    """
+    Shows the Easy Ctrls window. It is built on the first call and only hidden when closed, so later calls show the
+    same window again, with a new batch. A window deleted from outside (deleteUI) is built again.
+    Args:
+        engine: String. 'api' or 'commands'. Which creation engine _createCtrls() uses. Default from DEFAULTENGINE.
+        colorDrivers: Boolean. Use color driver nodes. Default from DEFAULTCOLORDRIVERS.
+        history: Boolean. Make controls with construction history. Default from DEFAULTHISTORY.
+        Engine, colorDrivers and history of a re-attached batch are the ones it was made with.
+    Returns:
+        CtrlsWindow.
+    """
+    global _WINDOW
+    if _WINDOW is None or not isValid(_WINDOW):
+        _WINDOW = CtrlsWindow()
+    _WINDOW.open(engine, colorDrivers, history)
+    return _WINDOW
+
+
+def _traced(func):
+    """
+    Decorator for CtrlsWindow actions. Records time, scene reads and writes and item count of each call into
+    trace.TRACER. While tracing is off, costs one flag check.
+    """
+    name = func.__name__.lstrip('_')
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if not trace.TRACER.enabled:
+            return func(self, *args, **kwargs)
+        backend = self.batch.backend
+        size = len(self.batch.items)
+        snapshot = trace.TRACER.begin(backend)
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            trace.TRACER.end(name, snapshot, backend, max(size, len(self.batch.items)), args)
+    return wrapper
+
+
+class _UpdateScheduler(QtCore.QObject):
+    """
+    Coalesces bursts of UI value changes. Each change is stored under a key and only the latest one per key is applied,
+    when the timer runs out (at most once per frame) or when flush() is called.
+    Every flush is one transaction. Between beginChunk() and endChunk() all flushes share one (slider drag), which
+    keeps refresh going, so the viewport follows the drag. Refresh is only suspended while a flush writes.
+    """
+
+    def __init__(self, transaction, interval=16, parent=None):
+        """
+        Args:
+            transaction: Callable taking a name and suspend keyword and returning a transaction, e.g.
+                CtrlsBatch.transaction.
+            interval: Integer. Milliseconds to wait for more changes before applying them. 16 ms is about one frame.
+            parent: QObject owning the scheduler.
+        """
+        super(_UpdateScheduler, self).__init__(parent)
+        self.transaction = transaction
+        self.pending = {}
+        self.dragTransaction = None
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(self.flush)
+
+    def schedule(self, key, func, *args):
+        """
+        Stores func with args under key, replacing earlier change of same key, and starts the timer if not running.
+        """
+        self.pending[key] = (func, args)
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def flush(self):
+        # apply every pending change exactly once, inside one transaction.
+        self.timer.stop()
+        if not self.pending:
+            return
+        pending = self.pending
+        self.pending = {}
+        with self.transaction('easyCtrlsUpdate'):
+            for func, args in pending.values():
+                func(*args)
+
+    def beginChunk(self):
+        # open one transaction for everything until endChunk(), e.g. on slider press. A chunk left open by a missed
+        # release is closed first.
+        self.endChunk()
+        self.flush()
+        self.dragTransaction = self.transaction('easyCtrlsDrag', suspend=False)
+        self.dragTransaction.open()
+
+    def endChunk(self):
+        # apply the final value and close the transaction, e.g. on slider release.
+        if self.dragTransaction is None:
+            return
+        failed = True
+        try:
+            self.flush()
+            failed = False
+        finally:
+            self.dragTransaction.close(failed=failed)
+            self.dragTransaction = None
+
+
+class _ChunkRunner(QtCore.QObject):
+    """
+    Runs a core.ChunkedCreation one slice per event loop turn, so Maya stays responsive. Shows progress with an ETA in
+    a progress dialog, whose Cancel asks whether to keep the controls made so far.
+    """
+
+    def __init__(self, creation, done, parent=None):
+        """
+        Args:
+            creation: core.ChunkedCreation to run.
+            done: Callable taking the reports dictionary, called when the run finished or was cancelled.
+            parent: QWidget the progress dialog is shown over.
+        """
+        super(_ChunkRunner, self).__init__(parent)
+        self.creation = creation
+        self.done = done
+        self.progress = QtWidgets.QProgressDialog('Creating controls...', 'Cancel', 0, creation.total, parent)
+        self.progress.setWindowTitle('Easy Ctrls')
+        self.progress.setWindowModality(QtCore.Qt.WindowModal)
+        self.progress.setMinimumDuration(0)
+        self.progress.setAutoClose(False)
+        self.progress.setAutoReset(False)
+
+    def start(self):
+        self.progress.show()
+        QtCore.QTimer.singleShot(0, self.step)
+
+    def step(self):
+        # one slice, then give the event loop a turn before the next one.
+        creation = self.creation
+        if self.progress.wasCanceled():
+            answer = cmds.confirmDialog(title='Cancelled', message='Keep the %d controls made so far?' % creation.done,
+                                        button=['Keep', 'Remove'], defaultButton='Keep', cancelButton='Remove',
+                                        dismissString='Remove')
+            self._end(creation.cancel(keep=answer == 'Keep'))
+            return
+        try:
+            finished = creation.step()
+        except Exception:
+            # the failed slice was rolled back, earlier slices stay like after a cancel
+            self._end(creation.cancel(keep=True))
+            raise
+        eta = creation.eta()
+        self.progress.setValue(creation.done)
+        self.progress.setLabelText('%d of %d controls, about %d s left' % (creation.done, creation.total, eta + 0.5))
+        if finished:
+            self._end(creation.finish())
+        else:
+            QtCore.QTimer.singleShot(0, self.step)
+
+    def _end(self, reports):
+        self.progress.close()
+        self.done(reports)
+        self.deleteLater()
+
+
+class _StatsPanel(QtWidgets.QDialog):
+    """
+    Small window listing recorded actions per name: calls, total and max time, scene reads and writes and the largest
+    item count. Recording can be switched on and off here and the trace exported for chrome://tracing.
+    """
+    COLUMNS = ['Action', 'Calls', 'Total ms', 'Max ms', 'Reads', 'Writes', 'Items']
+
+    def __init__(self, parent=None):
+        super(_StatsPanel, self).__init__(parent=parent)
+        self.setWindowTitle("Easy Ctrls Stats")
+        self.resize(460, 260)
+        layout = QtWidgets.QGridLayout(self)
+
+        self.recordBox = QtWidgets.QCheckBox('Record')
+        self.recordBox.setChecked(trace.TRACER.enabled)
+        self.recordBox.toggled.connect(self._setRecording)
+        layout.addWidget(self.recordBox, 0, 0)
+
+        self.table = QtWidgets.QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.verticalHeader().hide()
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        layout.addWidget(self.table, 1, 0, 1, 4)
+
+        for column, (label, func) in enumerate((('Refresh', self.refresh), ('Clear', self._clear),
+                                                ('Export', self._export)), 1):
+            button = QtWidgets.QPushButton(label)
+            button.clicked.connect(lambda checked=False, func=func: func())
+            layout.addWidget(button, 0, column)
+
+    def _setRecording(self, on):
+        trace.TRACER.enabled = on
+
+    def refresh(self):
+        stats = trace.TRACER.stats()
+        self.table.setRowCount(len(stats))
+        # slowest first
+        for row, (name, stat) in enumerate(sorted(stats.items(), key=lambda item: -item[1]['total'])):
+            values = [name, stat['count'], '%.1f' % (stat['total'] * 1000), '%.1f' % (stat['max'] * 1000),
+                      stat['reads'], stat['writes'], stat['selection']]
+            for column, value in enumerate(values):
+                self.table.setItem(row, column, QtWidgets.QTableWidgetItem(str(value)))
+        self.table.resizeColumnsToContents()
+
+    def _clear(self):
+        trace.TRACER.clear()
+        self.refresh()
+
+    def _export(self):
+        path = QtWidgets.QFileDialog.getSaveFileName(self, 'Export trace', 'easyCtrlsTrace.json', 'JSON (*.json)')[0]
+        if path:
+            trace.TRACER.export(path)
+            print('Trace of %d actions written to %s' % (len(trace.TRACER.events), path))
+
+
+class CtrlsWindow(QtWidgets.QWidget):
+
+    def __init__(self):
+        """
+        Initialize class. Set up empty lists for later usage.
+        Delete previous window if there is one (left by an earlier import of this module).
+        Create parent QDialog and parent it to Mayas main window. Set size, name and layout.
+        Initialize QDialog.
+        Build the UI using _buildUI()
+        Nothing is shown and there is no batch until open().
+        """
+
+        # every scene edit goes through the active batch of self.batches, UI only keeps widgets in sync with it. Made
+        # by open(), dropped on close.
+        self.batches = None
+        self.batch = None
+        self.offsetSpins = []
+        self.normalSpins = []
+        # key: [label, has offset button], from core.CONNECTORS. Constraints get an offset button.
+        self.connectors = {key: [values[0], core.isConstraint(key)] for key, values in core.CONNECTORS.items()}
+        self.connectorButtons = {}
+        self.offsetButtons = {}
+        self.colorButtons = {}
+        self.scheduler = None
+        self.statsPanel = None
+        # engine, colorDrivers and history of open(), used again when a scene is opened while the window is shown
+        self.options = None
+        self.sceneCallbacks = []
+
+        try:
+            cmds.deleteUI('easyCtrls')
+        except RuntimeError:
+            print('No previous UI exists')
+
+        parent = QtWidgets.QDialog(parent=_getMayaMainWindow())
+        parent.setObjectName('easyCtrls')
+        parent.setWindowTitle("Easy Ctrls")
+        parent.setFixedSize(220, 520)
+        layout = QtWidgets.QVBoxLayout(parent)
+
+        super(CtrlsWindow, self).__init__(parent=parent)
+        self._buildUI()
+        self.parent().layout().addWidget(self)
+        # closing (Done, the title bar or Esc) only hides the dialog, it is kept for the next open()
+        parent.finished.connect(self._closed)
+
+    def open(self, engine=DEFAULTENGINE, colorDrivers=DEFAULTCOLORDRIVERS, history=DEFAULTHISTORY):
+        """
+        Re-attaches to the batches of an earlier session stored in the scene, or makes a new one, sets widgets to the
+        settings of the last one and shows the window. An open window is only raised.
+        Args:
+            engine, colorDrivers, history: See CtrlsUI().
+        """
+        if self.parent().isVisible():
+            self.parent().raise_()
+            return
+        self.options = (engine, colorDrivers, history)
+        self._attach()
+        self.addBox.setChecked(False)
+        # batches of a scene opened while the window is shown are picked up the same way
+        self.sceneCallbacks = [om2.MSceneMessage.addCallback(message, self._sceneOpened)
+                               for message in (om2.MSceneMessage.kAfterOpen, om2.MSceneMessage.kAfterNew)]
+        self.parent().show()
+
+    def _attach(self):
+        # load the batches stored in the scene, or make a new one, and set widgets to the active one
+        engine, colorDrivers, history = self.options
+        self.batches = core.BatchSet(MayaBackend(), engine=engine, colorDrivers=colorDrivers, history=history)
+        # one read of the batch nodes, no scene traversal
+        if self.batches.load():
+            print('Re-attached to %d batches of %d controls' % (
+                len(self.batches.batches), sum(len(batch.ctrls) for batch in self.batches.batches.values())))
+        self.batch = self.batches.current
+        # widgets still show the last session otherwise
+        self._syncBatchBox()
+        self._syncWidgets()
+
+    def _sceneOpened(self, clientData=None):
+        # batches of the previous scene are gone with it, changes still waiting were meant for them
+        self.scheduler.pending.clear()
+        self._attach()
+
+    def _closed(self, result=None):
+        """
+        Lets go of the batches when the window closes, so the hidden window keeps no scene nodes alive. The batch
+        nodes stay in the scene and the next open() re-attaches to them. Done finishes the batches first.
+        """
+        om2.MMessage.removeCallbacks(self.sceneCallbacks)
+        self.sceneCallbacks = []
+        if self.batches is None:
+            return
+        try:
+            self.scheduler.flush()
+        finally:
+            self.batches = None
+            self.batch = None
+            if self.statsPanel is not None:
+                self.statsPanel.hide()
+
+    def _done(self):
+        # finish every batch, then close
+        try:
+            self._finish()
+        finally:
+            self.parent().close()
+
+    def _transaction(self, name, suspend=True):
+        # the scheduler outlives batches, so it asks for a transaction of the current one
+        return self.batch.transaction(name, suspend=suspend)
+
+    def hideEvent(self, event):
+        # a drag whose release never came must not keep its undo chunk open, hiding comes before _closed()
+        if self.batch is not None:
+            self.scheduler.endChunk()
+        super(CtrlsWindow, self).hideEvent(event)
+
+    def _buildUI(self):
+        """
+        This function builds the UI inside the window. Updating this, you should set parent windows size accordingly,
+         or remove fixed size.
+        """
+        # Use grid layout.
+        layout = QtWidgets.QGridLayout(self)
+        # Slider and spin boxes send their values through the scheduler, so dragging doesn't update scene on every step.
+        self.scheduler = _UpdateScheduler(self._transaction, parent=self)
+
+        # Create a push-button for every shape in the shape library, in a scrolling row. Searches for icon named after
+        # the shape in DIRECTORY (=.../2023/prefs/icons), shapes without an icon get their name as text.
+        # Only the library index is read here, shapes are parsed when first created. Icons come from _shapeIcon().
+        shapeRow = QtWidgets.QWidget()
+        shapeLayout = QtWidgets.QHBoxLayout(shapeRow)
+        shapeLayout.setContentsMargins(0, 0, 0, 0)
+        for s in shapelib.library().names():
+            icon = _shapeIcon(s)
+            CtrlBtn = QtWidgets.QPushButton()
+            CtrlBtn.setToolTip(s)
+            if icon is not None:
+                CtrlBtn.setIcon(icon)
+                CtrlBtn.setIconSize(QtCore.QSize(32, 32))
+            else:
+                CtrlBtn.setText(s)
+            CtrlBtn.setFixedHeight(42)
+            CtrlBtn.clicked.connect(lambda checked=False, s=s: self._createCtrls(ctrltype=s))
+            shapeLayout.addWidget(CtrlBtn)
+        shapeScroll = QtWidgets.QScrollArea()
+        shapeScroll.setWidget(shapeRow)
+        shapeScroll.setFixedHeight(62)
+        shapeScroll.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
+        row = 0
+        column = 2
+        layout.addWidget(shapeScroll, row, 0, 1, 2)
+
+        # Delete button. Size fixed, click connected to self._deleteCtrls, 1st row, Cth column, depending on shape buttons.
+        deleteBtn = QtWidgets.QPushButton('DEL')
+        deleteBtn.setFixedSize(QtCore.QSize(54, 42))
+        deleteBtn.clicked.connect(lambda: self._deleteCtrls())
+        layout.addWidget(deleteBtn, row, column)
+        row += 1
+
+        # Drop down of batches, every widget below edits the one picked here. Push button for starting a new batch.
+        self.batchBox = QtWidgets.QComboBox()
+        self.batchBox.setToolTip('Batch of controls the settings below edit')
+        self.batchBox.activated.connect(self._switchBatch)
+        layout.addWidget(self.batchBox, row, 0, 1, 2)
+        self.newBatchBtn = QtWidgets.QPushButton('New')
+        self.newBatchBtn.setToolTip('Start a new batch, controls made next go in it')
+        self.newBatchBtn.clicked.connect(lambda: self._newBatch())
+        layout.addWidget(self.newBatchBtn, row, 2, 1, 1)
+        row += 1
+
+        # Slider and spin boxes below only schedule self._applyState, which reads what they all show and hands it to the
+        # batch as one update, however many of them changed.
+        schedule = partial(self.scheduler.schedule, 'state', self._applyState)
+
+        # Radius-slider. Sends out value divided by ten (so min = .1 and max = 10), see self._widgetState.
+        radius = QtWidgets.QSlider(QtCore.Qt.Horizontal)
+        radius.setMinimum(1)
+        radius.setMaximum(100)
+        radius.setValue(10)
+        radius.valueChanged.connect(lambda val: schedule())
+        # whole drag is one undo chunk
+        radius.sliderPressed.connect(self.scheduler.beginChunk)
+        radius.sliderReleased.connect(self.scheduler.endChunk)
+        self.radiusSlider = radius
+        layout.addWidget(radius, row, 0, 1, 3)
+        row += 1
+        column = 0
+
+        # Spin boxes for setting normals for control objects. X ,Y and Z.
+        while column < 3:
+            normal = QtWidgets.QSpinBox()
+            normal.setMinimum(-10)
+            normal.setMaximum(10)
+            normal.setValue(0)
+            layout.addWidget(normal, row, column, 1, 1)
+            self.normalSpins.append(normal)
+            column += 1
+        for spin in self.normalSpins:
+            spin.valueChanged.connect(lambda val: schedule())
+        row += 1
+        column = 0
+
+        # Double spin boxes for setting offsets for control objects. X ,Y and Z.
+        while column < 3:
+            offset = QtWidgets.QDoubleSpinBox()
+            offset.setMinimum(-10)
+            offset.setMaximum(10)
+            offset.setSingleStep(0.5)
+            offset.setValue(0)
+            layout.addWidget(offset, row, column, 1, 1)
+            self.offsetSpins.append(offset)
+            column += 1
+        for spin in self.offsetSpins:
+            spin.valueChanged.connect(lambda val: schedule())
+        row += 1
+        column = 0
+
+        # Push buttons for left, middle and right color. Button color set to represent control objects color with
+        # self._setButtonColor(). Connected to self._setColor.
+        for column, side in enumerate('LMR'):
+            self.colorButtons[side] = QtWidgets.QPushButton()
+            self._setButtonColor(side)
+            self.colorButtons[side].clicked.connect(lambda checked=False, side=side: self._setColor(side))
+            layout.addWidget(self.colorButtons[side], row, column, 1, 1)
+        row += 1
+
+        # Multiple checkboxes for making connections and constraints. Make boxes from self.connectors -dictionary, uses
+        # key for naming the button and the first value for setting the text. If second value is True, creates an offset
+        # button with matching name and row.
+        # self.connectors is a dictionary, where connector = key. Self.connectors[connector] gives values.
+        for connector in self.connectors:
+            self.connectorButtons[connector] = QtWidgets.QCheckBox(self.connectors[connector][0])
+            layout.addWidget(self.connectorButtons[connector], row, 0, 1, 3)
+            # partial binds the key, a lambda in a loop would see only the last one
+            self.connectorButtons[connector].toggled.connect(partial(self._toggleConnector, connector))
+            if self.connectors[connector][1]:
+                self.offsetButtons[connector] = QtWidgets.QCheckBox('Offset')
+                self.offsetButtons[connector].toggled.connect(partial(self._setMaintainOffset, connector))
+                layout.addWidget(self.offsetButtons[connector], row, 2, 1, 1)
+            row += 1
+
+        # Push buttons for copying shapes and colors of controls from one side to the other.
+        self.mirrorBtns = {}
+        for side, text, column, span in (('L', 'Mirror L > R', 0, 2), ('R', 'R > L', 2, 1)):
+            self.mirrorBtns[side] = QtWidgets.QPushButton(text)
+            self.mirrorBtns[side].clicked.connect(lambda checked=False, side=side: self._mirror(side))
+            layout.addWidget(self.mirrorBtns[side], row, column, 1, span)
+        row += 1
+
+        # Check box for FK chain mode, groups of new controls go under the control of their nearest selected ancestor.
+        self.chainBox = QtWidgets.QCheckBox('FK chain')
+        self.chainBox.setToolTip('Parent new controls under the control of their nearest selected ancestor')
+        self.chainBox.toggled.connect(self._setChain)
+        layout.addWidget(self.chainBox, row, 0, 1, 3)
+        row += 1
+
+        # Push button for resetting all elements in the UI, which also resets control objects to default positions.
+        # Connected to self._resetValues.
+        self.resetValBtn = QtWidgets.QPushButton('Reset Values')
+        self.resetValBtn.clicked.connect(lambda: self._resetValues())
+        layout.addWidget(self.resetValBtn, row, 0, 1, 2)
+
+        # Check box for adding controls of newly selected items to the current ones, instead of making a new batch.
+        self.addBox = QtWidgets.QCheckBox('Add')
+        self.addBox.setToolTip('Add controls for selected items that have none to the current controls')
+        layout.addWidget(self.addBox, row, 2, 1, 1)
+        row += 1
+
+        # Push button for finishing and deleting history.
+        self.doneBtn = QtWidgets.QPushButton('Done')
+        self.doneBtn.clicked.connect(lambda: self._done())
+        layout.addWidget(self.doneBtn, row, 0, 1, 2)
+
+        # Push button for the stats panel of recorded actions.
+        self.statsBtn = QtWidgets.QPushButton('Stats')
+        self.statsBtn.clicked.connect(self._showStats)
+        layout.addWidget(self.statsBtn, row, 2, 1, 1)
+        row +=1
+
+    def _syncBatchBox(self):
+        # list batches with their control counts, the active one picked
+        self.batchBox.blockSignals(True)
+        self.batchBox.clear()
+        for name, batch in self.batches.batches.items():
+            self.batchBox.addItem('%s (%d)' % (name, len(batch.ctrls)), name)
+        self.batchBox.setCurrentIndex(list(self.batches.batches).index(self.batches.active))
+        self.batchBox.blockSignals(False)
+
+    @_traced
+    def _switchBatch(self, index):
+        """
+        Makes the batch at index of the drop down the one widgets edit. Nothing in the scene is read or changed.
+        Args:
+            index: Integer. Index in self.batchBox.
+        """
+        self.scheduler.flush()
+        self.batch = self.batches.switch(self.batchBox.itemData(index))
+        self._syncWidgets()
+
+    def _newBatch(self):
+        """
+        Starts a new batch with the settings of the active one. Controls of the active batch stay in it, reachable from
+        the drop down.
+        """
+        self.scheduler.flush()
+        self.batch = self.batches.new()
+        self._syncBatchBox()
+        self._syncWidgets()
+
+    def _setMaintainOffset(self, connector, on):
+        # widgets are connected once, batches change with every open
+        self.batch.setMaintainOffset(connector, on)
+
+    def _setChain(self, on):
+        self.batch.setChain(on)
+
+    def _showStats(self):
+        if self.statsPanel is None:
+            self.statsPanel = _StatsPanel(parent=self.parent())
+        self.statsPanel.refresh()
+        self.statsPanel.show()
+        self.statsPanel.raise_()
+
+    def _setButtonColor(self, side, color=None):
+        """
+        Sets color for the color button of side.
+        Args:
+            side: String. 'L', 'M' or 'R'.
+            color: Tuple or list of three float values (0-1). If none given uses color of side from the batch.
+        """
+        if not color:
+            color = self.batch.colors[side]
+
+        assert len(color) == 3, "You must provide a list of three values"
+
+        r, g, b = [c * 255 for c in color]
+
+        self.colorButtons[side].setStyleSheet('background-color: rgba({0}, {1}, {2}, 1.0)'.format(r, g, b))
+
+    @_traced
+    def _setColor(self, side):
+        """
+        Opens color editor, then splits gotten rgba-floats and assigns them into color (=r, g, b).
+        Overrides color of controls on side with these values then calls _setButtonColor to set button color.
+        Args:
+            side: String. 'L', 'M' or 'R'.
+        """
+        color = cmds.colorEditor(rgbValue=self.batch.colors[side])
+        r, g, b, a = [float(c) for c in color.split()]
+        color = (r, g, b)
+        self.batch.setSideColor(side, color)
+        self._setButtonColor(side, color)
+
+    @_traced
+    def _toggleConnector(self, connector, connect=False):
+        """
+        Switches connector on or off in the batch, then updates check boxes to what the batch did, as switching one on
+        can switch others off or fail.
+        Args:
+            connector: String. Key of self.connectors.
+            connect: Boolean. Checked state of the button.
+        """
+        self.scheduler.flush()
+        if not connect:
+            self.batch.setConnector(connector, False)
+        else:
+            # whole batch is checked before anything is made, mismatches are resolved together
+            mismatches = self.batch.setConnector(connector, True, 'abort')
+            if mismatches:
+                resolve = self._askResolve(connector, mismatches)
+                if resolve != 'abort':
+                    self.batch.setConnector(connector, True, resolve)
+        self._syncConnectorButtons()
+
+    def _syncConnectorButtons(self):
+        # set check boxes to state of the batch without running the toggles
+        for connector, button in self.connectorButtons.items():
+            button.blockSignals(True)
+            button.setChecked(self.batch.connectors[connector])
+            button.blockSignals(False)
+        for connector, button in self.offsetButtons.items():
+            button.blockSignals(True)
+            button.setChecked(self.batch.maintainOffset[connector])
+            button.blockSignals(False)
+
+    def _syncWidgets(self):
+        # set every widget to the settings of the batch without scheduling updates
+        self.scheduler.pending.clear()
+        spins = [(self.radiusSlider, self.batch.radius * 10)]
+        spins += list(zip(self.normalSpins, self.batch.normal)) + list(zip(self.offsetSpins, self.batch.offset))
+        for widget, value in spins:
+            widget.blockSignals(True)
+            widget.setValue(value)
+            widget.blockSignals(False)
+        for side in self.colorButtons:
+            self._setButtonColor(side)
+        self.chainBox.blockSignals(True)
+        self.chainBox.setChecked(self.batch.chain)
+        self.chainBox.blockSignals(False)
+        self._syncConnectorButtons()
+
+    @_traced
+    def _resetValues(self):
+        """
+        Resets the values of UI elements, which resets the controls to original settings as well.
+        Severs all connections and deletes all constraints.
+        """
+        self.scheduler.flush()
+        self.batch.reset()
+        self._syncWidgets()
+
+    @_traced
+    def _createCtrls(self, ctrltype=None):
+        """
+        Creates control objects of given type for selected objects, if nothing selected notifies and errors out.
+        Control objects have groups which are matched to original objects position and rotation --> Zero transformations.
+        Current values in UI and checked connectors are applied to the new controls. Building is done by the batch,
+        with the engine given to open(). Controls go in a new batch if the active one has some, so earlier controls
+        stay editable in theirs. With Add checked, controls are added to the active batch only for items that don't
+        have one. With FK chain checked, groups go under the control of their nearest selected ancestor.
+        Selections over CHUNKTHRESHOLD are made in slices with progress, see _ChunkRunner.
+        Args:
+            ctrltype: String. Shape name from the shape library, set in _buildUI() -function.
+        """
+        # pending slider/spin box changes belong to previous controls
+        self.scheduler.flush()
+        sel = self.batch.backend.selection()
+
+        if len(sel) == 0:
+            cmds.confirmDialog(title="Error", message="Select something")
+            raise IOError('Nothing selected')
+
+        if self.batch.items and not self.addBox.isChecked():
+            self._newBatch()
+
+        if len(sel) > CHUNKTHRESHOLD:
+            creation = core.ChunkedCreation(self.batch, sel, ctrltype, add=self.addBox.isChecked())
+            if creation.total:
+                # widgets stay off until the run ends, the batch is half made meanwhile
+                self.setEnabled(False)
+                _ChunkRunner(creation, partial(self._chunksDone, creation.start), parent=self.parent()).start()
+                return
+
+        start = len(self.batch.items) if self.addBox.isChecked() else 0
+        try:
+            if self.addBox.isChecked():
+                reports = self.batch.add(sel, ctrltype)
+            else:
+                reports = self.batch.create(sel, ctrltype)
+        finally:
+            self._syncBatchBox()
+            self._syncConnectorButtons()
+        for connector, mismatches in reports.items():
+            self._notifyNoMatch(connector, mismatches, start)
+
+    def _chunksDone(self, start, reports):
+        # end of a sliced creation, finished or cancelled. start is the index of its first item.
+        self.setEnabled(True)
+        self._syncBatchBox()
+        self._syncConnectorButtons()
+        for connector, mismatches in reports.items():
+            self._notifyNoMatch(connector, mismatches, start)
+
+    def _widgetState(self):
+        """
+        Returns dictionary of the settings the slider and spin boxes show, keyword arguments of
+        core.CtrlsBatch.update().
+        """
+        return {'radius': self.radiusSlider.value() / 10, 'normal': [spin.value() for spin in self.normalSpins],
+                'offset': [spin.value() for spin in self.offsetSpins]}
+
+    @_traced
+    def _applyState(self):
+        """
+        Brings controls of the active batch to what the widgets show. The batch compares it with what it last wrote,
+        so settings that didn't change are skipped and the rest is written in one pass, see core.CtrlsBatch.update().
+        """
+        self.batch.update(**self._widgetState())
+
+    @_traced
+    def _deleteCtrls(self):
+        """
+        Severs connections, deletes constraints and control groups of the active batch, then forgets the controls, so
+        UI elements don't control values of non-existing controls. The emptied batch is dropped if there are others,
+        and the last of them becomes active.
+        """
+        if not self.batch.groups:
+            cmds.confirmDialog(title="Error", message="No ctrls constructed")
+            raise IOError('No control groups to delete')
+
+        self.scheduler.flush()
+        self.batch.delete()
+        if len(self.batches.batches) > 1:
+            self.batch = self.batches.remove()
+            self._syncWidgets()
+        self._syncBatchBox()
+        self._syncConnectorButtons()
+
+    def _mismatchReport(self, connector, mismatches, total=None):
+        """
+        Returns text listing mismatched items of connector, REPORTLINES of them by name.
+        Args:
+            connector: String. Key of self.connectors.
+            mismatches: List of core.Mismatch tuples.
+            total: Integer. Amount of items checked, None for every item of the batch.
+        """
+        problem, expected = MISMATCHTEXTS.get(connector, ["Some attributes do not match", "match their controls"])
+        lines = ["%s: %s off by %.4g" % (m.name, m.attr, m.difference) for m in mismatches[:REPORTLINES]]
+        if len(mismatches) > REPORTLINES:
+            lines.append("... and %d more" % (len(mismatches) - REPORTLINES))
+        return "%s on %d of %d items:\n%s\n\nMake sure selected items %s" % (
+            problem, len(mismatches), len(self.batch.items) if total is None else total, "\n".join(lines), expected)
+
+    def _askResolve(self, connector, mismatches):
+        """
+        Shows one report of all mismatched items of connector and asks what to do with them.
+        Returns:
+            String. 'skip', 'offset' or 'abort', see core.CtrlsBatch.setConnector().
+        """
+        buttons = ["Skip", "Offset", "Abort"] if self.connectors[connector][1] else ["Skip", "Abort"]
+        msg = self._mismatchReport(connector, mismatches)
+        msg += "\n\nSkip them, %sor abort?" % ("constrain them with offset, " if "Offset" in buttons else "")
+        answer = cmds.confirmDialog(title="Attributes don't match.", message=msg, button=buttons,
+                                    defaultButton="Abort", cancelButton="Abort", dismissString="Abort")
+        return answer.lower()
+
+    def _notifyNoMatch(self, connector, mismatches, start=0):
+        """
+        Shows one dialog for all new items of connector whose transforms didn't match their controls, with how many
+        of the new items were connected and how many skipped.
+        Args:
+            connector: String. Key of self.connectors.
+            mismatches: List of core.Mismatch tuples.
+            start: Integer. Index of the first new item, 0 when the whole batch was made.
+        """
+        made = len(self.batch.items) - start
+        msg = self._mismatchReport(connector, mismatches, made)
+        connected = sum(1 for i in self.batch.connected[connector] if i >= start)
+        if self.connectors[connector][1]:
+            msg += "\n\nConstrained all %d new items, these %d WITH offset" % (connected, len(mismatches))
+        else:
+            msg += "\n\nSkipped these %d, connected the other %d of %d new items" % (
+                len(mismatches), connected, made)
+        cmds.confirmDialog(title="Attributes don't match.", message=msg)
+
+    @_traced
+    def _mirror(self, source):
+        """
+        Copies shapes and colors of controls on side source to their twins on the other side, see
+        core.CtrlsBatch.mirror(). Controls left without a twin, or whose shape couldn't be copied, are listed in one
+        dialog.
+        Args:
+            source: String. 'L' or 'R'.
+        """
+        self.scheduler.flush()
+        report = self.batch.mirror(source)
+        lonely = report.unmatched + [target for _, target in report.skipped]
+        if not lonely:
+            return
+        names = self.batch.backend.nodeNames([self.batch.ctrls[i] for i in lonely[:REPORTLINES]])
+        lines = ["%s: no twin" % name for name in names[:len(report.unmatched)]]
+        lines += ["%s: different shape" % name for name in names[len(report.unmatched):]]
+        if len(lonely) > REPORTLINES:
+            lines.append("... and %d more" % (len(lonely) - REPORTLINES))
+        msg = "Mirrored %d controls. Not mirrored:\n%s" % (len(report.pairs) - len(report.skipped), "\n".join(lines))
+        cmds.confirmDialog(title="Mirror", message=msg)
+
+    @_traced
+    def _finish(self):
+        self.scheduler.flush()
+        self.batches.finish()
@@ -0,0 +1,57 @@
+"""
+Maya plugin with the easyCtrlsModifiers command, which puts OpenMaya modifiers on Mayas undo queue. Modifiers executed
+straight from a script are not undoable, so mayabackend.MayaBackend queues them in mayabackend.PENDINGMODIFIERS and
+calls the command, which executes them and keeps them for undo and redo. Loaded by MayaBackend, not meant to be
+imported.
+"""
+from maya.api import OpenMaya as om2
+
+COMMANDNAME = 'easyCtrlsModifiers'
+
+
+def maya_useNewAPI():
+    # the plugin uses OpenMaya 2.0
+    pass
+
+
+class ModifierCommand(om2.MPxCommand):
+    """
+    Executes the modifiers queued by the backend in order. Undo undoes them in reverse order.
+    """
+
+    def __init__(self):
+        super(ModifierCommand, self).__init__()
+        self.modifiers = []
+
+    def doIt(self, args):
+        from easyctrls import mayabackend
+        self.modifiers = list(mayabackend.PENDINGMODIFIERS)
+        del mayabackend.PENDINGMODIFIERS[:]
+        self.redoIt()
+
+    def redoIt(self):
+        done = []
+        try:
+            for modifier in self.modifiers:
+                modifier.doIt()
+                done.append(modifier)
+        except Exception:
+            # a failed command isn't put on the undo queue, so take back what was done before raising
+            for modifier in reversed(done):
+                modifier.undoIt()
+            raise
+
+    def undoIt(self):
+        for modifier in reversed(self.modifiers):
+            modifier.undoIt()
+
+    def isUndoable(self):
+        return True
+
+
+def initializePlugin(plugin):
+    om2.MFnPlugin(plugin, 'easyCtrls').registerCommand(COMMANDNAME, ModifierCommand)
+
+
+def uninitializePlugin(plugin):
+    om2.MFnPlugin(plugin).deregisterCommand(COMMANDNAME)
@@ -0,0 +1,39 @@
+"""
+Fixtures shared by the tests. Everything runs headless on FakeScene, from the repository root:
+
+python -m pytest tests
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from easyctrls import core
+from easyctrls.fakescene import FakeScene
+
+
+@pytest.fixture
+def scene():
+    return FakeScene()
+
+
+@pytest.fixture
+def joints(scene):
+    """
+    Returns function adding joints to scene, one per (name, x) pair, at x on the x axis. Returns their handles.
+    """
+    def make(*pairs, **kwargs):
+        return [scene.addTransform(name, translate=(x, 0, 0), nodeType='joint', **kwargs) for name, x in pairs]
+    return make
+
+
+@pytest.fixture
+def batch(scene, joints):
+    """
+    Batch with circles for three joints on the left, middle and right.
+    """
+    batch = core.CtrlsBatch(scene)
+    batch.create(joints(('L_arm_jnt', 2), ('M_spine_jnt', 0), ('R_arm_jnt', -2)), 'circle')
+    return batch
@@ -0,0 +1,51 @@
+"""
+add(): controls for new items only, with the settings and connectors of the batch.
+"""
+import pytest
+
+
+def test_add_makes_new_items_only(scene, joints, batch):
+    ctrls = list(batch.ctrls)
+    batch.update(radius=2)
+    new = joints(('L_leg_jnt', 1), ('R_leg_jnt', -1))
+    assert batch.add(batch.items[:1] + new, 'square') == {}
+    assert batch.ctrls[:3] == ctrls and len(batch.ctrls) == 5
+    assert batch.items[3:] == new
+    assert list(batch.sideIndex[3:]) == [1, -1]
+    assert batch.shapeTypes[3:] == ['square', 'square']
+    assert [tuple(color) for color in scene.getAttr(batch.ctrls[3:], 'overrideColorRGB')] == [batch.colors['L'],
+                                                                                                batch.colors['R']]
+    assert scene.getAttr(batch.constructors, 'radius') == [2] * len(batch.constructors)
+    scene.resetCounters()
+    assert batch.add(new) == {}
+    assert scene.writes == 0
+
+
+def test_added_items_join_connectors(scene, joints, batch):
+    batch.setConnector('point', True)
+    batch.setConnector('conR', True)
+    new = joints(('L_leg_jnt', 1), ('R_leg_jnt', -1))
+    scene.setAttr(new[1:], 'rotate', [(0, 0, 10)])
+    reports = batch.add(new)
+    # the turned item is left out of the connection, the point constraint keeps the offset of both moved items
+    assert [m.index for m in reports['conR']] == [4]
+    assert [m.index for m in reports['point']] == [3, 4]
+    assert batch.connected['conR'] == [0, 1, 2, 3]
+    assert batch.connected['point'] == [0, 1, 2, 3, 4]
+    assert len(batch.constraints['point']) == 5
+
+
+def test_failed_add_keeps_the_batch(scene, joints, batch, monkeypatch):
+    before = {attr: list(getattr(batch, attr)) for attr in ('items', 'ctrls', 'groups', 'constructors')}
+    nodes = set(scene.nodes)
+
+    def fail(*args):
+        raise RuntimeError('cvs failed')
+    monkeypatch.setattr(scene, 'setAttrs', fail)
+    with pytest.raises(RuntimeError):
+        batch.add(joints(('L_leg_jnt', 1)))
+    monkeypatch.undo()
+    for attr, handles in before.items():
+        assert getattr(batch, attr) == handles, attr
+    # only the new joint is left of the scene
+    assert len(set(scene.nodes) - nodes) == 1
@@ -0,0 +1,41 @@
+"""
+BatchSet: several batches stored on their own nodes and loaded back in one go.
+"""
+from easyctrls import core
+
+
+def test_load_several_batches(scene, joints):
+    batches = core.BatchSet(scene, colorDrivers=True)
+    arms = batches.new('arms')
+    arms.create(joints(('L_arm_jnt', 2), ('R_arm_jnt', -2)), 'circle')
+    legs = batches.new('legs')
+    legs.create(joints(('L_leg_jnt', 1), ('M_hip_jnt', 0), ('R_leg_jnt', -1)), 'square')
+    loaded = core.BatchSet(scene)
+    scene.resetCounters()
+    assert loaded.load() == 2
+    assert scene.calls['listBatchData'] == 1
+    assert list(loaded.batches) == ['arms', 'legs']
+    assert loaded.active == 'legs'
+    assert loaded.batches['arms'].ctrls == arms.ctrls
+    assert loaded.batches['legs'].ctrls == legs.ctrls
+    assert loaded.batches['legs'].sideIndex == legs.sideIndex
+
+
+def test_color_drivers_are_not_batches(scene, joints):
+    batches = core.BatchSet(scene, colorDrivers=True)
+    batches.new('batch').create(joints(('L_arm_jnt', 2), ('R_arm_jnt', -2)), 'circle')
+    # driver nodes of a batch named batch start with the batch node prefix too, only the tagged node is listed
+    assert any(node.name.startswith(core.BATCHNODE + '_') and node.name.endswith('driver')
+               for node in scene.nodes.values())
+    assert [name for name, node, parts in scene.listBatchData(core.BATCHNODE)] == [core.batchNodeName('batch')]
+
+
+def test_untagged_legacy_node_is_loaded(scene, batch):
+    name, node, parts = scene.listBatchData(core.BATCHNODE)[0]
+    scene.delete([node])
+    legacy = scene._createNode(core.BATCHNODE, 'network')
+    scene.writeBatchData(legacy, None, parts)
+    batches = core.BatchSet(scene)
+    assert batches.load() == 1
+    assert batches.active == core.LEGACYBATCHNAME
+    assert batches.current.ctrls == batch.ctrls
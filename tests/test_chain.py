@@ -0,0 +1,50 @@
+"""
+FK chain mode: groups go under the control of the nearest selected ancestor, parents are made first.
+"""
+from easyctrls import core
+
+
+def _arm(scene):
+    shoulder = scene.addTransform('L_shoulder_jnt', translate=(1, 0, 0), nodeType='joint')
+    elbow = scene.addTransform('L_elbow_jnt', shoulder, translate=(2, 0, 0), nodeType='joint')
+    # not selected, the wrist control goes under the elbow control anyway
+    twist = scene.addTransform('L_twist_jnt', elbow, translate=(1, 0, 0), nodeType='joint')
+    wrist = scene.addTransform('L_wrist_jnt', twist, translate=(1, 0, 0), nodeType='joint')
+    return shoulder, elbow, wrist
+
+
+def _parentCtrl(scene, batch, item):
+    # control the group of item is parented under, None in world
+    parent = scene.nodes[batch.groups[batch.itemIndex[item]]].parent
+    return parent if parent in batch.ctrls else None
+
+
+def test_parents_are_made_first(scene):
+    shoulder, elbow, wrist = _arm(scene)
+    batch = core.CtrlsBatch(scene)
+    batch.setChain(True)
+    batch.create([wrist, shoulder, elbow], 'circle')
+    assert batch.items == [shoulder, elbow, wrist]
+    assert _parentCtrl(scene, batch, shoulder) is None
+    assert _parentCtrl(scene, batch, elbow) == batch.ctrls[0]
+    assert _parentCtrl(scene, batch, wrist) == batch.ctrls[1]
+
+
+def test_added_items_go_under_batch_controls(scene):
+    shoulder, elbow, wrist = _arm(scene)
+    finger = scene.addTransform('L_finger_jnt', wrist, translate=(1, 0, 0), nodeType='joint')
+    batch = core.CtrlsBatch(scene)
+    batch.setChain(True)
+    batch.create([shoulder, wrist], 'circle')
+    batch.add([finger, elbow])
+    # both go under controls made before, so neither waits for the other
+    assert batch.items == [shoulder, wrist, finger, elbow]
+    assert _parentCtrl(scene, batch, elbow) == batch.ctrls[0]
+    assert _parentCtrl(scene, batch, finger) == batch.ctrls[1]
+
+
+def test_chain_off_keeps_groups_in_world(scene):
+    items = _arm(scene)
+    batch = core.CtrlsBatch(scene)
+    batch.create(list(items), 'circle')
+    assert [_parentCtrl(scene, batch, item) for item in items] == [None] * 3
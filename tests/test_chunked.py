@@ -0,0 +1,86 @@
+"""
+ChunkedCreation: big selections made in slices, cancelled or rolled back part way.
+"""
+import pytest
+
+from easyctrls import core
+
+
+def _legs(joints, count=5):
+    return joints(*[('L_leg%d_jnt' % i, i + 1) for i in range(count)])
+
+
+def _run(creation):
+    steps = 1
+    while not creation.step():
+        steps += 1
+    return steps
+
+
+def test_slices_make_the_whole_selection(scene, joints):
+    items = _legs(joints)
+    batch = core.CtrlsBatch(scene)
+    batch.setConnector('point', True)
+    creation = core.ChunkedCreation(batch, items, 'circle', chunkSize=2)
+    assert _run(creation) == 3
+    # connectors wait for the last slice
+    assert not batch.connectors['point']
+    creation.finish()
+    assert batch.items == items
+    assert batch.connected['point'] == list(range(5))
+    assert len(set(scene.nodeNames(batch.ctrls))) == 5
+
+
+def test_cancel_removes_what_was_made(scene, joints):
+    items = _legs(joints)
+    nodes = set(scene.nodes)
+    batch = core.CtrlsBatch(scene)
+    batch.setConnector('point', True)
+    creation = core.ChunkedCreation(batch, items, 'circle', chunkSize=2)
+    creation.step()
+    creation.step()
+    assert creation.cancel(keep=False) == {}
+    assert set(scene.nodes) == nodes
+    assert batch.items == [] and batch.connectors['point']
+
+
+def test_cancel_after_add_keeps_old_controls(scene, joints, batch):
+    ctrls = list(batch.ctrls)
+    nodes = set(scene.nodes)
+    creation = core.ChunkedCreation(batch, _legs(joints), 'circle', add=True, chunkSize=2)
+    creation.step()
+    creation.cancel(keep=False)
+    assert batch.ctrls == ctrls
+    # only the new joints are left
+    assert [scene.nodes[handle].type for handle in set(scene.nodes) - nodes] == ['joint'] * 5
+
+
+def test_cancel_keeps_and_connects_made_controls(scene, joints):
+    items = _legs(joints)
+    batch = core.CtrlsBatch(scene)
+    batch.setConnector('point', True)
+    creation = core.ChunkedCreation(batch, items, 'circle', chunkSize=2)
+    creation.step()
+    creation.cancel(keep=True)
+    assert batch.items == items[:2]
+    assert batch.connected['point'] == [0, 1]
+
+
+def test_failed_slice_is_rolled_back(scene, joints, monkeypatch):
+    items = _legs(joints)
+    batch = core.CtrlsBatch(scene)
+    creation = core.ChunkedCreation(batch, items, 'circle', chunkSize=2)
+    creation.step()
+    nodes = set(scene.nodes)
+    createControls = scene.createControls
+
+    def failLate(*args, **kwargs):
+        # the slice is made, then fails
+        createControls(*args, **kwargs)
+        raise RuntimeError('slice failed')
+    monkeypatch.setattr(scene, 'createControls', failLate)
+    with pytest.raises(RuntimeError):
+        creation.step()
+    monkeypatch.undo()
+    assert set(scene.nodes) == nodes
+    assert batch.items == items[:2] and creation.done == 2
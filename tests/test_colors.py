@@ -0,0 +1,32 @@
+"""
+Side colors and color drivers.
+"""
+from easyctrls import core
+
+
+def _driverNames(scene):
+    return sorted(node.name for node in scene.nodes.values() if node.name.endswith('Color_driver'))
+
+
+def test_recreate_bakes_old_drivers(scene, joints):
+    batches = core.BatchSet(scene, colorDrivers=True)
+    batch = batches.new()
+    first = joints(('L_arm_jnt', 2), ('R_arm_jnt', -2))
+    batch.create(first, 'circle')
+    oldCtrls = list(batch.ctrls)
+    batch.create(joints(('L_leg_jnt', 1), ('R_leg_jnt', -1)), 'circle')
+    # one driver per side, under the batch names, the forgotten controls keep their colors without them
+    assert _driverNames(scene) == ['easyCtrls_batch1_%sColor_driver' % side for side in 'LMR']
+    assert not any(target[0] in oldCtrls for target in scene.connections)
+    assert [tuple(c) for c in scene.getAttr(oldCtrls, 'overrideColorRGB')] == [batch.colors['L'], batch.colors['R']]
+    batches.finish()
+    assert _driverNames(scene) == []
+
+
+def test_driven_colors_are_one_write(scene, joints):
+    batch = core.CtrlsBatch(scene, colorDrivers=True)
+    batch.create(joints(('L_arm_jnt', 2), ('R_arm_jnt', -2)), 'circle')
+    scene.resetCounters()
+    batch.setSideColor('L', (0, 0, 1))
+    assert scene.calls['setAttr'] == 1
+    assert tuple(scene.getAttr([batch.drivers['L']], 'color')[0]) == (0, 0, 1)
@@ -0,0 +1,71 @@
+"""
+Connectors: switching, validation before connecting and rollback.
+"""
+import pytest
+
+
+def test_maintain_offset_needs_constraint(batch):
+    with pytest.raises(ValueError):
+        batch.setMaintainOffset('conT', True)
+    with pytest.raises(ValueError):
+        batch.setMaintainOffset('conP', True)
+    batch.setMaintainOffset('parent', True)
+    assert batch.maintainOffset['parent']
+
+
+def _constraintTypes(scene):
+    return sorted(node.type for node in scene.nodes.values() if node.type.endswith('Constraint'))
+
+
+def test_failed_switch_keeps_bookkeeping(scene, batch, monkeypatch):
+    batch.setConnector('point', True)
+    constraints = list(batch.constraints['point'])
+    constrain = scene.constrain
+
+    def failParent(kind, *args):
+        if kind == 'parent':
+            raise RuntimeError('parent constraint failed')
+        return constrain(kind, *args)
+    monkeypatch.setattr(scene, 'constrain', failParent)
+
+    with pytest.raises(RuntimeError):
+        batch.setConnector('parent', True)
+    # the scene is back to the point constraints, and so is the batch
+    assert _constraintTypes(scene) == ['pointConstraint'] * 3
+    assert batch.connectors['point'] and not batch.connectors['parent']
+    assert batch.constraints['point'] == constraints
+    assert batch.connected['point'] == [0, 1, 2]
+    assert batch.connected['parent'] == []
+
+
+def _turn(scene, batch, indices, z):
+    scene.setAttr([batch.items[i] for i in indices], 'rotate', [(0, 0, z)] * len(indices))
+
+
+def test_validate_tolerance(scene, batch):
+    _turn(scene, batch, [0], 0.00005)
+    assert batch.validate('conR') == []
+    _turn(scene, batch, [0], 0.5)
+    scene.resetCounters()
+    mismatches = batch.validate('conR')
+    # items and controls in one bulk read, names of the mismatched ones in another
+    assert dict(scene.calls) == {'getAttrArray': 1, 'nodeNames': 1}
+    assert [(m.index, m.name, m.attr) for m in mismatches] == [(0, 'L_arm_jnt', 'rotate')]
+    assert mismatches[0].difference == pytest.approx(0.5)
+    assert batch.validate('conR', tolerance=1) == []
+
+
+def test_mismatches_are_reported_together(scene, batch):
+    _turn(scene, batch, [0, 2], 10)
+    scene.resetCounters()
+    # connections abort by default, with every mismatch in one report and nothing written
+    assert [m.index for m in batch.setConnector('conR', True)] == [0, 2]
+    assert scene.writes == 0 and not batch.connectors['conR']
+    assert [m.index for m in batch.setConnector('conR', True, 'skip')] == [0, 2]
+    assert batch.connected['conR'] == [1]
+    batch.setConnector('conR', False)
+    # constraints keep the offset of mismatched items, all in one backend call
+    scene.resetCounters()
+    assert len(batch.setConnector('orient', True)) == 2
+    assert scene.calls['constrain'] == 1
+    assert batch.connected['orient'] == [0, 1, 2]
@@ -0,0 +1,50 @@
+"""
+Mirroring shapes and colors between twin controls of the two sides.
+"""
+from easyctrls import core
+
+
+def test_pair_positions_nearest_free_target():
+    sources = [(1, 0, 0), (2, 0, 0), (5, 0, 0)]
+    targets = [(2.005, 0, 0), (1.001, 0, 0), (0.9995, 0, 0)]
+    # the nearest target wins, each target is taken once, a source without any in tolerance gets -1
+    assert core.pairPositions(sources, targets, 0.01) == [2, 0, -1]
+
+
+def test_mirror_name_swaps_side_tokens():
+    assert core.mirrorName('rig:L_eye_jnt') == 'rig:R_eye_jnt'
+    assert core.mirrorName('arm_Right_jnt') == 'arm_Left_jnt'
+    # side letters inside a token don't count
+    assert core.mirrorName('Leg_jnt') is None
+
+
+def test_mirror_pairs_by_position_then_name(scene, joints):
+    items = joints(('L_arm_jnt', 2), ('R_arm_jnt', -2), ('L_eye_jnt', 1), ('R_eye_jnt', -1.5), ('L_ear_jnt', 3),
+                   ('M_spine_jnt', 0))
+    batch = core.CtrlsBatch(scene)
+    batch.create(items, 'circle')
+    report = batch.mirror('L')
+    # arms by position, eyes by name as the right eye sits off its mirrored place, the ear has no twin
+    assert sorted(report.pairs) == [(0, 1), (2, 3)]
+    assert report.unmatched == [4]
+    assert report.skipped == []
+
+
+def test_mirror_copies_offset_across_the_plane(scene, batch):
+    batch.setOffset(0.5, 0.25, 0)
+    left, right = batch.shapes[0], batch.shapes[2]
+    scene.setCvOffsets([left], scene.cvCounts([left]), (1, 0.25, 0))
+    batch.mirror('L')
+    # tweaks of history shapes are offsets, so x flips and the rest carries over
+    assert set(scene.getCvs([right])[0]) == {(-1, 0.25, 0)}
+
+
+def test_mirror_colors(scene, batch):
+    left, right = batch.ctrls[0], batch.ctrls[2]
+    batch.mirror('L')
+    # side colored controls keep the color of their side
+    assert tuple(scene.getAttr([right], 'overrideColorRGB')[0]) == tuple(batch.colors['R'])
+    scene.setAttr([left], 'overrideColorRGB', [(0.2, 0.4, 0.6)])
+    batch.mirror('L')
+    # colored by hand, the twin gets the same color
+    assert tuple(scene.getAttr([right], 'overrideColorRGB')[0]) == (0.2, 0.4, 0.6)
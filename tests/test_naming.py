@@ -0,0 +1,41 @@
+"""
+Names of made groups and controls: templates and NameReserver collisions.
+"""
+import pytest
+
+from easyctrls import core, naming
+
+
+def test_free_names_are_kept():
+    reserver = naming.NameReserver(['arm_jnt'])
+    assert reserver.reserve('arm_ctrl_grp', 'arm_ctrl') == ('arm_ctrl_grp', 'arm_ctrl')
+    assert {'arm_ctrl_grp', 'arm_ctrl', 'arm_ctrlShape'} <= reserver.taken
+
+
+def test_clashes_get_one_number_for_the_pair():
+    # group free, control shape taken: all three get the lowest number none of them has
+    reserver = naming.NameReserver(['arm_ctrlShape', 'arm_ctrl_grp1'])
+    assert reserver.reserve('arm_ctrl_grp', 'arm_ctrl') == ('arm_ctrl_grp2', 'arm_ctrl2')
+    assert 'arm_ctrl2Shape' in reserver.taken
+
+
+def test_names_given_clash_with_each_other():
+    reserver = naming.NameReserver([])
+    names = [reserver.reserve('arm_ctrl_grp', 'arm_ctrl') for _ in range(3)]
+    assert names == [('arm_ctrl_grp', 'arm_ctrl'), ('arm_ctrl_grp1', 'arm_ctrl1'), ('arm_ctrl_grp2', 'arm_ctrl2')]
+
+
+def test_batch_names_avoid_scene_and_namespaces(scene, joints):
+    items = joints(('L_arm_jnt', 2), ('rig:L_arm_jnt', 3))
+    scene.addTransform('L_arm_jnt_ctrl')
+    batch = core.CtrlsBatch(scene)
+    names = batch.controlNames(items, 'circle')
+    assert names[items[0]] == ('L_arm_jnt_ctrl_grp1', 'L_arm_jnt_ctrl1')
+    assert names[items[1]] == ('rig:L_arm_jnt_ctrl_grp', 'rig:L_arm_jnt_ctrl')
+    batch.setNameTemplates('{side}_{index}_grp', '{side}_{shape}_{index}')
+    assert batch.controlNames(items, 'circle')[items[1]] == ('L_1_grp', 'L_circle_1')
+
+
+def test_unknown_template_token():
+    with pytest.raises(ValueError):
+        naming.templateTokens('{name}_{nope}')
@@ -0,0 +1,71 @@
+"""
+Batches stored on their scene node and re-attached to in a later session.
+"""
+import json
+
+import pytest
+
+from easyctrls import core
+
+
+def _reattach(scene):
+    batch = core.CtrlsBatch(scene)
+    assert batch.load()
+    return batch
+
+
+def test_nothing_stored(scene):
+    assert not core.CtrlsBatch(scene).load()
+
+
+def test_reattached_batch_has_the_same_state(scene, batch):
+    batch.setSideColor('L', (0, 0, 1))
+    batch.update(radius=2, offset=(0, 1, 0))
+    batch.setConnector('point', True)
+    scene.resetCounters()
+    loaded = _reattach(scene)
+    assert scene.reads == 1
+    for attr in ('items', 'ctrls', 'shapes', 'constructors', 'groups', 'cvCounts', 'shapeTypes', 'sideIndex',
+                 'origTransforms', 'constraints', 'connected', 'connectors', 'radius', 'offset', 'colors'):
+        assert getattr(loaded, attr) == getattr(batch, attr), attr
+    # what was written is known, so the same settings write nothing
+    scene.resetCounters()
+    loaded.update(radius=2, offset=(0, 1, 0))
+    assert scene.writes == 0
+
+
+def test_reattached_batch_stores_changed_parts(scene, batch, monkeypatch):
+    loaded = _reattach(scene)
+    written = []
+    writeBatchData = scene.writeBatchData
+
+    def recordParts(node, name, parts):
+        written.append(sorted(parts))
+        return writeBatchData(node, name, parts)
+    monkeypatch.setattr(scene, 'writeBatchData', recordParts)
+
+    loaded.update(radius=3)
+    loaded.setConnector('point', True)
+    assert written == [['settings'], ['connectors']]
+    assert _reattach(scene).radius == 3
+
+
+def test_reattached_batch_releases_and_deletes(scene, batch):
+    items = list(batch.items)
+    origTranslates = scene.getAttr(items, 'translate')
+    batch.setConnector('parent', True)
+    loaded = _reattach(scene)
+    loaded.setConnector('parent', False)
+    assert scene.getAttr(items, 'translate') == origTranslates
+    loaded.delete()
+    assert not any(node.type == 'parentConstraint' for node in scene.nodes.values())
+    assert not core.CtrlsBatch(scene).load()
+
+
+def test_newer_version_is_refused(scene, batch):
+    name, node, parts = scene.listBatchData(core.BATCHNODE)[0]
+    data = json.loads(parts['members'])
+    data['version'] = core.DATAVERSION + 1
+    scene.writeBatchData(node, name, {'members': json.dumps(data)})
+    with pytest.raises(ValueError):
+        core.CtrlsBatch(scene).load()
@@ -0,0 +1,49 @@
+"""
+Control shape library: binary file round trip and shapes made from it.
+"""
+import pytest
+
+from easyctrls import core, shapelib
+
+
+def _close(a, b):
+    # values go through float32 in the file
+    return all(abs(x - y) < 1e-6 for x, y in zip(a, b))
+
+
+def test_write_read_round_trip(tmp_path):
+    shapes = shapelib.builtinShapes()
+    path = str(tmp_path / 'shapes.ecsl')
+    shapelib.writeLibrary(path, shapes)
+    library = shapelib.ShapeLibrary(path)
+    try:
+        assert library.names() == [shape.name for shape in shapes]
+        for shape in shapes:
+            read = library.shape(shape.name)
+            assert (read.degree, read.periodic) == (shape.degree, shape.periodic)
+            assert len(read.cvs) == len(shape.cvs)
+            assert all(_close(a, b) for a, b in zip(read.cvs, shape.cvs))
+            assert _close(read.knots, shape.knots)
+            # parsed once, then cached
+            assert library.shape(shape.name) is read
+    finally:
+        library.close()
+
+
+def test_default_library_matches_builtin_shapes():
+    assert shapelib.library().names() == [shape.name for shape in shapelib.builtinShapes()]
+
+
+def test_bad_files_are_refused(tmp_path):
+    path = tmp_path / 'bad.ecsl'
+    path.write_bytes(b'NOPE' + bytes(8))
+    with pytest.raises(ValueError):
+        shapelib.ShapeLibrary(str(path))
+    with pytest.raises(ValueError):
+        shapelib.writeLibrary(str(tmp_path / 'long.ecsl'), [shapelib.makeShape('x' * 33, [(0, 0, 0), (1, 0, 0)])])
+
+
+def test_library_shapes_are_made_with_their_cvs(scene, joints):
+    batch = core.CtrlsBatch(scene)
+    batch.create(joints(('L_arm_jnt', 2)), 'cross')
+    assert batch.cvCounts == [len(shapelib.library().shape('cross').cvs)]
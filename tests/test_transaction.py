@@ -0,0 +1,21 @@
+"""
+Transactions: scene edits are counted per node and logged at debug level only.
+"""
+import logging
+
+
+def test_edits_count_nodes(scene, batch):
+    scene.resetCounters()
+    batch.update(radius=2)
+    # one setAttrs call on three constructors, one batch data node
+    assert scene.writes == 2
+    assert scene.edits == 4
+
+
+def test_transactions_log_at_debug_only(caplog, batch):
+    with caplog.at_level(logging.INFO, logger='easyctrls'):
+        batch.update(radius=2)
+    assert not caplog.records
+    with caplog.at_level(logging.DEBUG, logger='easyctrls'):
+        batch.update(radius=3)
+    assert [record.getMessage().split(' in ')[0] for record in caplog.records] == ['easyCtrlsUpdate: 4 scene edits']
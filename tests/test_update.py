@@ -0,0 +1,69 @@
+"""
+update(): settings are diffed against what was last written, and only what changed is written.
+"""
+import pytest
+
+
+def test_same_settings_write_nothing(scene, batch):
+    scene.resetCounters()
+    assert batch.update(radius=batch.radius, normal=batch.normal, offset=batch.offset, colors=batch.colors) == set()
+    assert scene.writes == 0
+
+
+def test_only_changed_settings_are_written(scene, batch):
+    scene.resetCounters()
+    assert batch.update(radius=2, offset=(0, 1, 0)) == {'radius', 'offset'}
+    # radius on the constructors, offset tweaks on the shapes, the settings stored, nothing else
+    assert dict(scene.calls) == {'setAttrs': 1, 'setCvOffsets': 1, 'writeBatchData': 1}
+    assert scene.getAttr(batch.constructors, 'radius') == [2] * 3
+    scene.resetCounters()
+    batch.setNormal(y=1)
+    assert dict(scene.calls) == {'setAttrs': 1, 'writeBatchData': 1}
+
+
+def test_color_recolors_its_side_only(scene, batch):
+    scene.resetCounters()
+    batch.setSideColor('R', (0, 1, 0))
+    assert scene.calls['setAttr'] == 1
+    colors = scene.getAttr(batch.ctrls, 'overrideColorRGB')
+    assert [tuple(color) for color in colors] == [tuple(batch.colors['L']), tuple(batch.colors['M']), (0, 1, 0)]
+
+
+def test_color_after_mirror_keeps_shapes(scene, batch):
+    batch.setOffset(1, 0, 0)
+    batch.mirror('L')
+    right = [batch.shapes[2]]
+    mirrored = scene.getCvs(right)
+    scene.resetCounters()
+    batch.setSideColor('R', (0, 1, 0))
+    assert scene.calls['setAttr'] == 1
+    assert not scene.calls['setCvOffsets'] and not scene.calls['setAttrs']
+    assert scene.getCvs(right) == mirrored
+    # giving the offset again writes it over the mirrored shapes
+    assert batch.update(offset=(1, 0, 0)) == {'offset'}
+    assert scene.getCvs(right) != mirrored
+
+
+def test_failed_update_keeps_settings(scene, batch, monkeypatch):
+    def fail(*args):
+        raise RuntimeError('write failed')
+    monkeypatch.setattr(scene, 'setAttrs', fail)
+    with pytest.raises(RuntimeError):
+        batch.setRadius(3)
+    assert batch.radius == 1.0 and batch.applied['radius'] == 1.0
+    assert scene.getAttr(batch.constructors, 'radius') == [1.0] * 3
+    monkeypatch.undo()
+    # the next update still knows what the controls have
+    assert batch.update(radius=3) == {'radius'}
+
+
+def test_failed_mirror_keeps_applied(scene, batch, monkeypatch):
+    batch.setOffset(1, 0, 0)
+
+    def fail(*args):
+        raise RuntimeError('write failed')
+    monkeypatch.setattr(scene, 'setCvLists', fail)
+    with pytest.raises(RuntimeError):
+        batch.mirror('L')
+    assert batch.applied['offset'] == (1, 0, 0)
+    assert batch.applied['colors'] == batch.colors